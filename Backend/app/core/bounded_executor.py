@@ -0,0 +1,43 @@
+"""
+Thread pool for blocking CPU work (e.g. bcrypt) that must not run on the event loop.
+
+Work is capped at `max_pending` calls (running + queued). Past that the caller gets a
+503 with Retry-After right away instead of queueing behind seconds of hashing, so a
+burst cannot build an unbounded backlog.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+from fastapi import HTTPException, status
+from app.core.logger import logger
+
+T = TypeVar("T")
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rejected = 0
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None # Threads start on first use
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"{self.name}: {self._pending} calls pending, rejecting")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name.replace(" ", "-"))
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.max_workers, "pending": self._pending, "max_pending": self.max_pending, "rejected": self.rejected}
@@ -9,6 +9,55 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 20
     DATABASE_URL: str = ""
+
+    # Database Engine Profile
+    # "serverless": NullPool + no prepared statement cache (Vercel / PgBouncer transaction pooling)
+    # "pooled": persistent connection pool + statement caching (long-running uvicorn on a VM, direct Postgres)
+    DB_ENGINE_PROFILE: str = "serverless"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30 # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800 # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100 # Prepared statements cached per connection (pooled only)
+    DB_N_PLUS_ONE_THRESHOLD: int = 5 # Warn when one statement shape runs more often than this per request
+    DB_FAST_START: bool = True # Skip startup DDL when the stored schema version matches the entities
+
+    # Document Numbering
+    ID_RESET_PERIOD: str = "daily" # "daily" (INV-20240130-001) or "fiscal_year" (INV-FY2425-0001)
+    ID_FISCAL_YEAR_START_MONTH: int = 4 # April, Indian financial year
+    ID_BLOCK_SIZE: int = 1 # Numbers reserved per round trip per process; >1 means fewer writes but numbers may skip
+
+    # Read Replica (optional) - list/report reads go here, writes always hit DATABASE_URL
+    DATABASE_REPLICA_URL: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0 # Fall back to primary above this replay lag
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 10.0 # Seconds between lag probes
+
+    # Dashboard snapshot cache (per process): served as-is, refreshed in the background after the TTL
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30.0
+
+    # Auth token caches (per process)
+    TOKEN_CACHE_SIZE: int = 4096 # Verified tokens kept; 0 verifies the signature on every request
+    TOKEN_REISSUE_WINDOW_SECONDS: float = 60.0 # A session's refreshed token is reused for this long
+    USER_CACHE_TTL_SECONDS: float = 30.0 # get_current_active_user; local writes invalidate immediately
+    USER_CACHE_SIZE: int = 1024
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0 # How often each process reloads revocations made elsewhere
+    TOKEN_REVOCATION_RETENTION_HOURS: float = 24 # Longest token lifetime issued (Telegram chat links)
+
+    # bcrypt runs on a thread pool, off the event loop
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32 # Running + queued; beyond this logins get 503 + Retry-After
+
+    # Token-bucket rate limits (per process) on POST RATE_LIMIT_ROUTES, checked before the DB and bcrypt
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_ROUTES: List[str] = ["/api/auth/login", "/api/users/change-password"]
+    RATE_LIMIT_IP_BURST: int = 20 # Per client IP and route; offices share one IP behind NAT
+    RATE_LIMIT_IP_PER_MINUTE: float = 20
+    RATE_LIMIT_USERNAME_BURST: int = 5 # Per username and route, known or not
+    RATE_LIMIT_USERNAME_PER_MINUTE: float = 5
+    RATE_LIMIT_ROUTE_BURST: int = 60 # Whole route, all clients together
+    RATE_LIMIT_ROUTE_PER_MINUTE: float = 600
+    RATE_LIMIT_MAX_KEYS: int = 10000 # IPs / usernames tracked; least recently seen are dropped
     MAX_LOGIN_ATTEMPTS: int = 3
     LOGIN_LOCKOUT_MINUTES: int = 15
     DEFAULT_PASSWORD: str = "ChangeMe@123"
@@ -40,7 +89,7 @@ class Settings(BaseSettings):
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: List[str] = ["*"]
     CORS_ALLOW_HEADERS: List[str] = ["*"]
-    CORS_EXPOSE_HEADERS: List[str] = ["Authorization"]
+    CORS_EXPOSE_HEADERS: List[str] = ["Authorization", "Server-Timing", "X-DB-Queries", "Retry-After"]
     
     PUBLIC_ROUTES: list[str] = [
         "/docs", 
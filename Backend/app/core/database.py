@@ -1,40 +1,365 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+import asyncio
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.orm import DeclarativeBase, Session
 from app.core.config import settings
+from app.core.logger import logger
 
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    poolclass=NullPool,
-    connect_args={
-        "prepared_statement_cache_size": 0,
-        "statement_cache_size": 0,
-    }
-)
+ENGINE_PROFILES = ("serverless", "pooled")
+
+def _engine_options(database_url: str, profile: str) -> dict:
+    """
+    Build engine keyword arguments for a deployment profile.
+    - serverless: no pooling and no prepared statements, safe behind PgBouncer / Neon pooler.
+    - pooled: a real connection pool with pre-ping, recycling and statement caching.
+    """
+    url = make_url(database_url)
+    is_asyncpg = url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg"
+
+    if profile == "pooled":
+        options = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+        if is_asyncpg:
+            options["connect_args"] = {
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            }
+        return options
+
+    if profile != "serverless":
+        raise ValueError(f"Unknown DB_ENGINE_PROFILE '{profile}'. Expected one of {ENGINE_PROFILES}")
+
+    options = {"poolclass": NullPool}
+    if is_asyncpg:
+        # PgBouncer in transaction mode cannot keep prepared statements between transactions
+        options["connect_args"] = {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+        }
+    return options
+
+def create_engine_for_profile(profile: str = None, database_url: str = None) -> AsyncEngine:
+    """Create the async engine for the given (or configured) profile."""
+    profile = (profile or settings.DB_ENGINE_PROFILE).lower()
+    database_url = database_url or settings.DATABASE_URL
+    return create_async_engine(database_url, **_engine_options(database_url, profile))
+
+engine = create_engine_for_profile()
+replica_engine = create_engine_for_profile(database_url=settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+
+class UnitOfWorkSession(AsyncSession):
+    """
+    AsyncSession that defers commit/rollback to an enclosing unit of work.
+    Repositories keep calling commit() as usual; inside a unit of work it only flushes,
+    and the single real commit happens when the unit of work exits.
+    """
+    async def commit(self) -> None:
+        if self.info.get("unit_of_work"):
+            await self.flush()
+            return
+        await super().commit()
+        for callback in self.info.pop("after_commit", ()):
+            await callback()
+
+    async def rollback(self) -> None:
+        if self.info.get("unit_of_work"):
+            # The unit of work decides; make sure it never commits partial work
+            self.info["rollback_only"] = True
+            return
+        self.info.pop("after_commit", None)
+        await super().rollback()
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]):
+    """
+    Run `callback` once `session`'s transaction has really committed: when the enclosing
+    unit of work exits, or at the session's own commit() outside one. Dropped on rollback.
+    The write is already durable by then, so the callback must handle its own errors.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
 
 SessionLocal = async_sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=UnitOfWorkSession,
     expire_on_commit=False,
 )
 
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+) if replica_engine else None
+
+# --- Read Replica Routing ---
+
+# 0 on a primary or a caught-up standby, otherwise seconds since the last replayed transaction
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+class ReplicaLagMonitor:
+    """
+    Caches the replica's replay lag so routing costs at most one probe per interval.
+    An unreachable or lagging replica sends reads back to the primary.
+    """
+    def __init__(self, replica: AsyncEngine, max_lag_seconds: float, check_interval: float):
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _is_due(self) -> bool:
+        return self.checked_at is None or time.monotonic() - self.checked_at >= self.check_interval
+
+    async def is_healthy(self) -> bool:
+        if self._is_due():
+            async with self._lock:
+                if self._is_due():
+                    await self._probe()
+        return self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+
+    async def _probe(self):
+        try:
+            async with self.replica.connect() as conn:
+                result = await conn.execute(text(REPLICA_LAG_SQL))
+                self.lag_seconds = float(result.scalar() or 0.0)
+            if self.lag_seconds > self.max_lag_seconds:
+                logger.warning(f"Replica lag {self.lag_seconds:.1f}s exceeds {self.max_lag_seconds}s, reading from primary")
+        except Exception as e:
+            logger.warning(f"Replica lag probe failed, reading from primary: {e}")
+            self.lag_seconds = None
+        self.checked_at = time.monotonic()
+
+replica_monitor = ReplicaLagMonitor(
+    replica_engine,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+) if replica_engine else None
+
+# Read-your-writes: once this request/task has committed on the primary, its reads stay there
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+def _pin_to_primary(session: AsyncSession):
+    if session.info.pop("committed", False):
+        _pinned_to_primary.set(True)
+
+async def _use_replica() -> bool:
+    if replica_monitor is None or _pinned_to_primary.get():
+        return False
+    return await replica_monitor.is_healthy()
+
+# --- Unit of Work ---
+
+class RollbackOnlyError(RuntimeError):
+    """A call inside a unit of work rolled back, so the whole unit was discarded instead of committed."""
+
+class _UnitOfWork:
+    __slots__ = ("session", "owner", "closed")
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        # A session must never be used by two tasks at once, so only the task that
+        # opened the unit of work joins it. Background tasks / gather() children get their own.
+        self.owner = asyncio.current_task()
+        self.closed = False
+
+_current_uow: ContextVar[Optional[_UnitOfWork]] = ContextVar("current_unit_of_work", default=None)
+
+def _active_uow() -> Optional[_UnitOfWork]:
+    uow = _current_uow.get()
+    if uow is None or uow.closed or uow.owner is not asyncio.current_task():
+        return None
+    return uow
+
+@asynccontextmanager
+async def get_session(read_only: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Session for a single repository call.
+    Joins the active unit of work if there is one, otherwise opens a short-lived session.
+    `read_only` calls go to the replica when one is configured, healthy, and this
+    request has not written yet.
+    """
+    uow = _active_uow()
+    if uow is not None:
+        yield uow.session
+        return
+    if read_only and await _use_replica():
+        async with ReplicaSessionLocal() as session:
+            yield session
+        return
+    async with SessionLocal() as session:
+        try:
+            yield session
+        finally:
+            _pin_to_primary(session)
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    """
+    Run every repository call inside the block on one session and one transaction,
+    committed once on exit (rolled back on error). Nested blocks join the outer one.
+    If a call inside rolled back and the block still exits normally (its error was
+    swallowed), the unit is rolled back and RollbackOnlyError raised: the caller must
+    not go on as if the writes had happened.
+    """
+    uow = _active_uow()
+    if uow is not None:
+        yield uow.session
+        return
+
+    async with SessionLocal() as session:
+        session.info["unit_of_work"] = True
+        uow = _UnitOfWork(session)
+        token = _current_uow.set(uow)
+        try:
+            yield session
+            session.info["unit_of_work"] = False
+            if session.info.pop("rollback_only", False):
+                # Rolled back below, like any other error
+                raise RollbackOnlyError("Unit of work was marked rollback-only; its changes were discarded")
+            await session.commit()
+            _pin_to_primary(session)
+        except BaseException:
+            session.info["unit_of_work"] = False
+            await session.rollback()
+            raise
+        finally:
+            uow.closed = True
+            _current_uow.reset(token)
+
+# --- Per-scope Statistics ---
+
+class DatabaseStats:
+    """Database work done inside a `track_database_stats()` scope (e.g. one request)."""
+    __slots__ = ("connections", "commits", "statements", "db_time_ms", "shapes")
+
+    def __init__(self):
+        self.connections = 0 # Transactions begun, i.e. connections checked out
+        self.commits = 0
+        self.statements = 0
+        self.db_time_ms = 0.0
+        # SQL text with bound parameters left as placeholders, so the same query
+        # with different ids counts as one shape
+        self.shapes: Counter = Counter()
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times (likely N+1 loops)."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+_current_stats: ContextVar[Optional[DatabaseStats]] = ContextVar("database_stats", default=None)
+
+@contextmanager
+def track_database_stats() -> Iterator[DatabaseStats]:
+    stats = DatabaseStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+def current_database_stats() -> Optional[DatabaseStats]:
+    return _current_stats.get()
+
+@event.listens_for(Session, "after_begin")
+def _count_connection(session, transaction, connection):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.connections += 1
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    timers = conn.info.get("statement_started")
+    if stats is None or not timers:
+        return
+    stats.db_time_ms += (time.perf_counter() - timers.pop()) * 1000
+    stats.statements += 1
+    stats.shapes[statement] += 1
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    session.info["committed"] = True
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.commits += 1
+
 class Base(DeclarativeBase):
     pass
 
+async def _stored_schema_version(key: str) -> Optional[str]:
+    from app.core.schema import get_schema_meta
+    try:
+        async with engine.connect() as conn:
+            return await conn.run_sync(get_schema_meta, key)
+    except Exception:
+        # Fresh database: schema_meta does not exist yet
+        return None
+
 async def init_db():
+    # Import all entities here so they are registered with Base.metadata
+    from app.features.users.user_entity import User
+    from app.features.auth.auth_entity import TokenRevocation
+    from app.features.parties.party_entity import Party
+    from app.features.transactions.transaction_entity import Transaction
+    from app.features.inventory.inventory_entity import Item, CustomerItemRate
+    from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem
+    from app.features.fleet.fleet_entity import Vehicle, Driver
+    from app.features.trips.trip_entity import Trip, TripExpense
+    from app.features.notifications.notification_entity import Notification
+    from app.features.dashboard.dashboard_entity import DailySalesRollup, DailyTripRollup
+    from app.features.dashboard.dashboard_rollup_repository import ROLLUP_VERSION, ensure_rollups
+    from app.core.id_generator import DocumentCounter
+    from app.core.schema import SCHEMA_VERSION_KEY, apply_index_packs, schema_fingerprint, set_schema_meta
+
+    # Fast start: one primary-key lookup instead of create_all's catalog queries per table
+    fingerprint = schema_fingerprint(f"rollups:{ROLLUP_VERSION}")
+    if settings.DB_FAST_START and await _stored_schema_version(SCHEMA_VERSION_KEY) == fingerprint:
+        logger.info(f"Schema version {fingerprint} is current, skipping DDL")
+        return
+
     async with engine.begin() as conn:
-        # Import all entities here so they are registered with Base.metadata
-        from app.features.users.user_entity import User
-        from app.features.parties.party_entity import Party
-        from app.features.transactions.transaction_entity import Transaction
-        from app.features.inventory.inventory_entity import Item, CustomerItemRate
-        from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem
-        from app.features.fleet.fleet_entity import Vehicle, Driver
-        from app.features.trips.trip_entity import Trip, TripExpense
-        from app.features.notifications.notification_entity import Notification
         await conn.run_sync(Base.metadata.create_all)
 
+    # Separate transaction: a failing index (e.g. duplicate rows under a new unique
+    # index) or rollup backfill must not undo table creation or stop the app from serving
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(apply_index_packs)
+            await conn.run_sync(ensure_rollups)
+            await conn.run_sync(set_schema_meta, SCHEMA_VERSION_KEY, fingerprint)
+    except Exception as e:
+        logger.error(f"Index pack or rollup backfill not applied, will retry on next start: {e}")
+
+async def close_db():
+    """Release pooled connections (no-op for the serverless profile)."""
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
 async def get_db():
     async with SessionLocal() as session:
         try:
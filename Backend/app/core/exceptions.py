@@ -28,7 +28,8 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             "success": False,
             "message": exc.detail,
             "data": None
-        }
+        },
+        headers=getattr(exc, "headers", None) # e.g. Retry-After on 503
     )
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,141 @@
+"""
+Keyset (cursor) pagination.
+
+List endpoints page by their sort keys instead of OFFSET: the cursor is an opaque token
+holding the sort-key values of the last row served, and the next page starts strictly
+after them. Every page costs the same however deep it is, and rows inserted meanwhile
+cannot shift a page. The last sort key must be unique (the primary key) so ties on the
+leading keys are broken deterministically.
+
+`estimated_total` comes from the planner's row estimate (PostgreSQL only), not count(*).
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+from fastapi import HTTPException, status
+from sqlalchemy import Date, DateTime, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select
+from sqlalchemy.sql.elements import ColumnElement
+
+T = TypeVar("T")
+
+class Page(Generic[T]):
+    """One page of rows plus the cursor for the next one (None on the last page)."""
+    __slots__ = ("items", "next_cursor", "estimated_total")
+
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None, estimated_total: Optional[int] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.estimated_total = estimated_total
+
+    def envelope(self, limit: int) -> dict:
+        """The `pagination` block of a list response."""
+        return {
+            "limit": limit,
+            "count": len(self.items),
+            "next_cursor": self.next_cursor,
+            "estimated_total": self.estimated_total,
+        }
+
+# --- Cursor Tokens ---
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _from_json(value: Any, column: ColumnElement) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keys: Sequence[ColumnElement]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+        return [_from_json(v, key) for v, key in zip(values, keys)]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+# --- Queries ---
+
+def _after(keys: Sequence[ColumnElement], values: Sequence[Any], descending: bool):
+    """(k1, k2, ...) strictly after (v1, v2, ...) in sort order, spelled out so any index on k1 applies."""
+    clauses = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        beyond = key < value if descending else key > value
+        clauses.append(and_(*[k == v for k, v in zip(keys[:i], values[:i])], beyond))
+    return or_(*clauses)
+
+def keyset_query(query: Select, keys: Sequence[ColumnElement], cursor: Optional[str], limit: int, descending: bool = True) -> Select:
+    """Order `query` by `keys` and restrict it to the page after `cursor`. Fetches one extra row to detect a next page."""
+    if cursor:
+        query = query.where(_after(keys, decode_cursor(cursor, keys), descending))
+    order = [k.desc() if descending else k.asc() for k in keys]
+    return query.order_by(*order).limit(limit + 1)
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[ColumnElement],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = True,
+    with_total: bool = False,
+    mappings: bool = False,
+) -> Page:
+    """
+    Run `query` as a keyset page. By default it selects one entity and the page holds
+    entities; with `mappings` it selects columns and the page holds plain dicts keyed by
+    column label (the sort keys must be among them, under their own names).
+    """
+    result = await db.execute(keyset_query(query, keys, cursor, limit, descending))
+    if mappings:
+        rows = [dict(row) for row in result.mappings()]
+    else:
+        rows = list(result.scalars().all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[key.key] if mappings else getattr(last, key.key) for key in keys])
+    estimated_total = await estimated_count(db, query) if with_total else None
+    return Page(rows, next_cursor, estimated_total)
+
+# --- Estimated Counts ---
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+async def estimated_count(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    The planner's row estimate for `query` (filters included), from table statistics.
+    None on databases without a JSON EXPLAIN; it is an estimate, never exact.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return None
+    result = await db.execute(_Explain(query.order_by(None).limit(None).offset(None)))
+    raw = result.scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    return int(plan["Plan Rows"])
@@ -0,0 +1,205 @@
+"""
+Column-only projections for list endpoints.
+
+A list page does not need entities: selecting just the columns a response exposes
+skips the identity map, relationship loading and per-row model validation, and the
+rows go straight into the response as dicts. A Fieldset lets the client narrow that
+further with `?fields=`, opt into nested collections with `?include=` and embed
+summaries of referenced records with `?expand=`. Each include or expansion costs one
+query for the whole page, however many rows it has.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+def schema_columns(entity: type, schema: Type[BaseModel], exclude: Iterable[str] = ()) -> List[ColumnElement]:
+    """The columns of `entity` that `schema` exposes, in the schema's field order."""
+    columns = inspect(entity).columns
+    excluded = set(exclude)
+    return [columns[name] for name in schema.model_fields if name in columns and name not in excluded]
+
+# --- Sparse Fieldsets ---
+
+def _split(param: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(name.strip() for name in (param or "").split(",") if name.strip()))
+
+def _reject(kind: str, unknown: List[str], available: Iterable[str]):
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Unknown {kind}: {', '.join(unknown)}. Available: {', '.join(available)}",
+    )
+
+class Summary:
+    """The compact form of a record that other resources embed with `?expand=`."""
+    def __init__(self, key: ColumnElement, *columns: ColumnElement):
+        self.key = key
+        self.columns = [key, *columns]
+
+    async def load(self, db: AsyncSession, ids: set) -> Dict[Any, dict]:
+        if not ids:
+            return {}
+        result = await db.execute(select(*self.columns).where(self.key.in_(ids)))
+        return {target[self.key.key]: dict(target) for target in result.mappings()}
+
+class Expand:
+    """A reference (foreign key) that `?expand=<name>` replaces with the referenced record's Summary."""
+    def __init__(self, foreign_key: ColumnElement, summary: Summary):
+        self.foreign_key = foreign_key # Column of the row holding the reference
+        self.summary = summary
+
+class Include:
+    """A child collection that `?include=<name>` loads into every row, in one query for the whole page."""
+    def __init__(
+        self,
+        parent_key: ColumnElement,
+        columns: Sequence[ColumnElement],
+        order_by: Sequence[ColumnElement] = (),
+        expands: Optional[Dict[str, Expand]] = None,
+    ):
+        self.parent_key = parent_key # Child column holding the parent's id
+        self.columns = list(columns)
+        self.order_by = list(order_by)
+        self.expands = expands or {} # Expandable as `?expand=<include>.<name>`
+
+    async def load(self, db: AsyncSession, rows: List[dict], name: str):
+        children: Dict[Any, List[dict]] = {row["id"]: [] for row in rows}
+        if children:
+            query = (
+                select(self.parent_key.label("_parent"), *self.columns)
+                .where(self.parent_key.in_(list(children)))
+                .order_by(self.parent_key, *self.order_by)
+            )
+            for child in (await db.execute(query)).mappings():
+                child = dict(child)
+                children[child.pop("_parent")].append(child)
+        for row in rows:
+            row[name] = children[row["id"]]
+
+class Selection:
+    """What one request selects from a Fieldset: the columns to query, the collections to include and the references to expand."""
+    __slots__ = ("fieldset", "names", "columns", "includes", "expands", "hidden")
+
+    def __init__(
+        self,
+        fieldset: "Fieldset",
+        names: List[str],
+        includes: List[str],
+        expands: List[Tuple[Optional[str], str]],
+        hidden: List[str],
+    ):
+        self.fieldset = fieldset
+        self.names = names
+        self.includes = includes
+        self.expands = expands # (include, name); include is None for the row's own references
+        self.hidden = hidden # Selected only for paging, includes or expansions; removed from the output
+        self.columns = [fieldset.fields[name] for name in [*names, *hidden]]
+
+    def uses(self, name: str) -> bool:
+        return name in self.names
+
+    async def finish(self, db: AsyncSession, rows: List[dict]) -> List[dict]:
+        """Load the included collections and expanded references into `rows` and drop the helper columns."""
+        for name in self.includes:
+            await self.fieldset.includes[name].load(db, rows, name)
+        if self.expands:
+            await self._expand(db, rows)
+        for row in rows:
+            for name in self.hidden:
+                del row[name]
+        return rows
+
+    async def _expand(self, db: AsyncSession, rows: List[dict]):
+        # One IN query per Summary, however many expansions share it (e.g. supplier and customer party)
+        targets = []
+        for include, name in self.expands:
+            if include is None:
+                targets.append((self.fieldset.expands[name], rows, name))
+            else:
+                children = [child for row in rows for child in row[include]]
+                targets.append((self.fieldset.includes[include].expands[name], children, name))
+        ids: Dict[Summary, set] = {}
+        for expand, target_rows, _ in targets:
+            key = expand.foreign_key.key
+            ids.setdefault(expand.summary, set()).update(row[key] for row in target_rows if row[key] is not None)
+        loaded = {summary: await summary.load(db, summary_ids) for summary, summary_ids in ids.items()}
+        for expand, target_rows, name in targets:
+            summaries, key = loaded[expand.summary], expand.foreign_key.key
+            for row in target_rows:
+                row[name] = summaries.get(row[key])
+
+class Fieldset:
+    """
+    The fields one resource can return (columns or labelled SQL expressions, keyed by
+    name), the collections it can include and the references it can expand.
+    `?fields=a,b` narrows the select to those columns; `?include=children` adds nested
+    collections and `?expand=ref,children.ref` embeds referenced records, neither of
+    which is loaded otherwise.
+    """
+    def __init__(
+        self,
+        columns: Sequence[ColumnElement],
+        includes: Optional[Dict[str, Include]] = None,
+        expands: Optional[Dict[str, Expand]] = None,
+    ):
+        self.fields: Dict[str, ColumnElement] = {column.key: column for column in columns}
+        self.includes = includes or {}
+        self.expands = expands or {}
+
+    def select(
+        self,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+        required: Sequence[ColumnElement] = (),
+    ) -> Selection:
+        """
+        Parse `?fields=` / `?include=` / `?expand=` (comma-separated; no fields means all of them).
+        Expanding `children.ref` includes `children` too.
+        `required` are columns the query needs in every row, e.g. the keyset sort keys;
+        they are selected but only returned if asked for.
+        """
+        names = _split(fields) or list(self.fields)
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            _reject("field(s)", unknown, self.fields)
+        includes = _split(include)
+        unknown = [name for name in includes if name not in self.includes]
+        if unknown:
+            _reject("include(s)", unknown, self.includes)
+
+        expands, unknown = [], []
+        for name in _split(expand):
+            parent, _, child = name.rpartition(".")
+            if name in self.expands:
+                expands.append((None, name))
+            elif parent in self.includes and child in self.includes[parent].expands:
+                expands.append((parent, child))
+                if parent not in includes:
+                    includes.append(parent)
+            else:
+                unknown.append(name)
+        if unknown:
+            _reject("expansion(s)", unknown, self._expandable())
+
+        needed = [column.key for column in required] + (["id"] if includes else [])
+        needed += [self.expands[name].foreign_key.key for parent, name in expands if parent is None]
+        hidden = [name for name in dict.fromkeys(needed) if name not in names]
+        return Selection(self, names, includes, expands, hidden)
+
+    async def expand(self, db: AsyncSession, rows: List[dict], expand: Optional[str]) -> List[dict]:
+        """
+        Embed the `?expand=` summaries into rows loaded elsewhere, e.g. a full detail
+        response dumped to a dict. The rows must already hold the referencing columns
+        and every included collection that an expansion reaches into.
+        """
+        selection = self.select(include=",".join(self.includes), expand=expand)
+        if selection.expands:
+            await selection._expand(db, rows)
+        return rows
+
+    def _expandable(self) -> List[str]:
+        nested = [f"{parent}.{name}" for parent, include in self.includes.items() for name in include.expands]
+        return [*self.expands, *nested]
@@ -0,0 +1,15 @@
+"""
+Response class for the `{"success", "message", "data", ...}` envelope.
+
+Pydantic models (and lists of them) go into `content` as-is: pydantic-core writes the
+whole envelope straight to JSON bytes in one pass, instead of model_dump() building
+dicts for stdlib json to walk again.
+"""
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+class APIResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        # NaN/Infinity are not JSON; write null rather than emit a body clients can't parse
+        return to_json(content, inf_nan_mode="null")
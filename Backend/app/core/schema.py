@@ -0,0 +1,107 @@
+"""
+Versioned index packs.
+
+`Base.metadata.create_all` only builds the indexes of tables it creates, so an index
+added to an entity later never reaches an existing database. Every pack lists the
+indexes it introduced (by name, as declared on the entities); `apply_index_packs`
+creates the ones the database has not seen yet and records the pack version in
+the `schema_meta` table.
+
+To add indexes: declare them on the entity, then add a new pack version below.
+
+`schema_fingerprint` hashes the declared tables, columns and indexes. Once a database
+has been brought up to date its fingerprint is stored too, so later starts can skip
+DDL entirely when nothing changed (see DB_FAST_START).
+"""
+import hashlib
+from typing import Dict, Optional, Tuple
+from sqlalchemy import Column, Index, String, Table, select, update, insert
+from sqlalchemy.engine import Connection
+from app.core.database import Base
+from app.core.logger import logger
+
+schema_meta = Table(
+    "schema_meta",
+    Base.metadata,
+    Column("key", String(50), primary_key=True),
+    Column("value", String(100), nullable=False),
+)
+
+INDEX_PACK_KEY = "index_pack_version"
+SCHEMA_VERSION_KEY = "schema_version"
+
+INDEX_PACKS: Dict[int, Tuple[str, ...]] = {
+    1: (
+        # Trips: driver tracking, dashboard date ranges, per-vehicle history
+        "ix_trips_driver_status",
+        "ix_trips_in_transit_driver",
+        "ix_trips_start_date",
+        "ix_trips_vehicle_start_date",
+        "ix_trip_expenses_trip_id",
+        # Vouchers: dashboard sums, list ordering, party lookups, item loading
+        "ix_trade_vouchers_type_status_date",
+        "ix_trade_vouchers_issued_type_date",
+        "ix_trade_vouchers_type_created_at",
+        "ix_trade_vouchers_created_at",
+        "ix_trade_vouchers_party_id",
+        "ix_voucher_items_voucher_id",
+        # Notifications feed
+        "ix_notifications_user_created_at",
+        "ix_notifications_unread_user_created_at",
+        # Pricing overrides
+        "uq_customer_item_rates_item_party_location",
+        # Ledger history
+        "ix_transactions_party_date",
+        "ix_transactions_transaction_date",
+        # Receivable / payable summaries
+        "ix_parties_current_balance",
+        # Telegram webhook lookups
+        "ix_drivers_phone",
+        "ix_drivers_telegram_chat_id",
+    ),
+}
+
+INDEX_PACK_VERSION = max(INDEX_PACKS)
+
+def schema_fingerprint(*extra: str) -> str:
+    """
+    Short hash of every declared table, column and index. Changes whenever an entity does.
+    `extra` adds other versioned startup work (e.g. derived tables) to the hash.
+    """
+    parts = [f"index_packs:{INDEX_PACK_VERSION}", *extra]
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table:{table.name}")
+        parts.extend(f"column:{c.name}:{c.type!r}:{c.nullable}:{c.primary_key}" for c in table.columns)
+        parts.extend(sorted(f"index:{i.name}:{i.unique}:{','.join(c.name for c in i.columns)}" for i in table.indexes))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+def _declared_indexes() -> Dict[str, Index]:
+    return {index.name: index for table in Base.metadata.tables.values() for index in table.indexes}
+
+def get_schema_meta(conn: Connection, key: str) -> Optional[str]:
+    return conn.execute(select(schema_meta.c.value).where(schema_meta.c.key == key)).scalar_one_or_none()
+
+def set_schema_meta(conn: Connection, key: str, value: str):
+    result = conn.execute(update(schema_meta).where(schema_meta.c.key == key).values(value=value))
+    if result.rowcount == 0:
+        conn.execute(insert(schema_meta).values(key=key, value=value))
+
+def apply_index_packs(conn: Connection) -> int:
+    """
+    Create the indexes of every pack newer than the recorded version.
+    Synchronous, run it with `await conn.run_sync(apply_index_packs)`. Returns the applied version.
+    """
+    schema_meta.create(conn, checkfirst=True)
+    current = int(get_schema_meta(conn, INDEX_PACK_KEY) or 0)
+    if current >= INDEX_PACK_VERSION:
+        return current
+
+    declared = _declared_indexes()
+    for version in sorted(v for v in INDEX_PACKS if v > current):
+        for name in INDEX_PACKS[version]:
+            if name not in declared:
+                raise ValueError(f"Index pack {version} lists '{name}', which no entity declares")
+            declared[name].create(conn, checkfirst=True)
+        set_schema_meta(conn, INDEX_PACK_KEY, str(version))
+        logger.info(f"Index pack {version} applied ({len(INDEX_PACKS[version])} indexes)")
+    return INDEX_PACK_VERSION
@@ -0,0 +1,70 @@
+"""
+In-process caches that keep JWT signing and verification off the hot path.
+
+- VerifiedTokenCache: claims of tokens whose signature already checked out, keyed by
+  a digest of the token (the token itself is never kept). Bounded LRU; an entry is
+  dropped once the token's `exp` passes, so an expired token is never served.
+- ReissuedTokenCache: the token last issued for each user by the sliding-session
+  refresh. Requests within `reuse_seconds` get the same token back instead of each
+  one signing a new JWT.
+
+Both are per process and only touched from the event loop, so they need no locking.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+def _digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict]:
+        """A copy of the cached claims, or None if the token is unknown or has expired."""
+        key = _digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, token: str, claims: dict):
+        # Only tokens that expire are cached; anything else is verified every time
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+        key = _digest(token)
+        self._entries[key] = (dict(claims), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+class ReissuedTokenCache:
+    def __init__(self, reuse_seconds: float):
+        self.reuse_seconds = reuse_seconds
+        self._entries: Dict[Hashable, Tuple[dict, str, float]] = {} # user -> (claims without exp, token, issued at)
+
+    def get_or_issue(self, user: Hashable, claims: dict, issue: Callable[[dict], str]) -> str:
+        """The token issued for `user` within the reuse window if its claims are the same, else a new one from `issue`."""
+        now = time.monotonic()
+        entry = self._entries.get(user)
+        if entry is not None and entry[0] == claims and now - entry[2] < self.reuse_seconds:
+            return entry[1]
+        token = issue(claims)
+        self._prune(now)
+        self._entries[user] = (claims, token, now)
+        return token
+
+    def _prune(self, now: float):
+        # Entries past the window are never reused; drop them so idle users don't accumulate
+        expired = [user for user, (_, _, issued_at) in self._entries.items() if now - issued_at >= self.reuse_seconds]
+        for user in expired:
+            del self._entries[user]
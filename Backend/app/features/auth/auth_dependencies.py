@@ -1,5 +1,18 @@
 from fastapi import Request, HTTPException, status
 from typing import Optional
+from sqlalchemy import inspect
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+# User column values by ID for get_current_active_user, never the entity itself: each
+# request gets its own copy, so a handler changing current_user can't leak into others.
+# UserService drops an entry when the user is activated/deactivated or changes password;
+# the TTL bounds other processes.
+active_user_cache = TTLCache("current_user", settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_SIZE)
+
+def _columns(user) -> tuple:
+    mapper = inspect(user).mapper
+    return mapper.class_, tuple((attr.key, getattr(user, attr.key)) for attr in mapper.column_attrs)
 
 async def get_current_user(request: Request) -> dict:
     """
@@ -28,16 +41,22 @@ async def get_admin_user(request: Request) -> dict:
 
 async def get_current_active_user(request: Request):
     """
-    Get full User entity from DB based on ID in token.
+    Get full User entity based on ID in token, from active_user_cache or the DB.
+    A cache hit returns a new transient User built from the cached column values.
     """
     user_payload = await get_current_user(request)
     user_id = user_payload.get("id")
     
-    from app.features.users.user_repository import UserRepository
-    user = await UserRepository.get_by_id(user_id)
-    
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    cached = active_user_cache.get(user_id)
+    if cached is None:
+        from app.features.users.user_repository import UserRepository
+        user = await UserRepository.get_by_id(user_id)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        active_user_cache.put(user_id, _columns(user))
+    else:
+        entity, columns = cached
+        user = entity(**dict(columns))
         
     if not user.active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -0,0 +1,11 @@
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class TokenRevocation(Base):
+    """Tokens of `user_id` issued before `revoked_at` (UTC) are no longer accepted."""
+    __tablename__ = "token_revocations"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy import select
+from app.core.database import get_session
+from app.core.id_generator import dialect_insert
+from app.core.logger import logger
+from app.features.auth.auth_entity import TokenRevocation
+
+class TokenRevocationRepository:
+    @staticmethod
+    async def revoke(user_id: int, revoked_at: datetime) -> None:
+        """Revoke every token of the user issued before `revoked_at` (naive UTC)."""
+        async with get_session() as db:
+            try:
+                insert = dialect_insert(db.get_bind().dialect.name)
+                stmt = insert(TokenRevocation).values(user_id=user_id, revoked_at=revoked_at)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[TokenRevocation.user_id],
+                    set_={"revoked_at": revoked_at},
+                )
+                await db.execute(stmt)
+                await db.commit()
+                logger.info(f"Tokens of user ID {user_id} issued before {revoked_at} revoked")
+            except Exception as e:
+                logger.error(f"Error revoking tokens of user {user_id}: {str(e)}")
+                await db.rollback()
+                raise
+
+    @staticmethod
+    async def get_since(since: datetime) -> List[Tuple[int, datetime]]:
+        """(user_id, revoked_at) of revocations after `since`. Read from the primary: a lagging replica would miss new ones."""
+        async with get_session() as db:
+            result = await db.execute(
+                select(TokenRevocation.user_id, TokenRevocation.revoked_at)
+                .where(TokenRevocation.revoked_at > since)
+            )
+            return [(row.user_id, row.revoked_at) for row in result]
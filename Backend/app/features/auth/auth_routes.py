@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from app.features.auth.auth_service import AuthService
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -25,7 +25,7 @@ async def login(request: Request):
     if result.get("password_change_required"):
         message = "Password change required"
     
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": message,
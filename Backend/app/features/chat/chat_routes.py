@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from app.features.chat.chat_schema import ChatRequest, ChatResponse
-from app.features.chat.chat_service import ChatService
 from app.features.auth.auth_dependencies import get_current_user
 
 router = APIRouter(prefix="/chat", tags=["Enterprise Chat"])
@@ -12,6 +11,8 @@ _chat_service = None
 def get_chat_service():
     global _chat_service
     if _chat_service is None:
+        # Deferred so the Gemini SDK only loads on the first chat request
+        from app.features.chat.chat_service import ChatService
         _chat_service = ChatService()
     return _chat_service
 
@@ -1,11 +1,8 @@
 import os
 import json
 from typing import List, Dict, Any
-from google import genai
-from google.genai import types
-from datetime import datetime, timedelta
 
-from app.features.dashboard.dashboard_repository import DashboardRepository
+from app.features.dashboard.dashboard_service import DashboardService
 from app.features.parties.party_repository import PartyRepository
 from app.features.vouchers.voucher_repository import VoucherRepository
 from app.features.trips.trip_repository import TripRepository
@@ -17,7 +14,10 @@ class ChatService:
         api_key = settings.GOOGLE_API_KEY
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment")
-            
+
+        # Imported here, not at module level: the SDK takes ~1s to import and would
+        # otherwise be paid on every serverless cold start, chat request or not
+        from google import genai
         self.client = genai.Client(api_key=api_key)
         
         # Define available tools/functions
@@ -56,65 +56,43 @@ RULES:
 3. If no arguments are needed, use: CALL_FUNCTION: function_name({})
 4. Be professional, concise, and helpful."""
 
+    @staticmethod
+    async def _analytics():
+        # Month-to-date snapshot shared with the dashboard cache: one computation serves every tool call
+        return (await DashboardService.get_snapshot("month_to_date")).value
+
     async def _get_monthly_sales(self) -> str:
         """Gets the sales summary for the current month."""
-        start_date = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        end_date = datetime.now()
-        stats = await DashboardRepository.get_sales_stats(start_date, end_date)
-        return f"Total Sales Value for this month: ₹{stats['total_sales_amount']:,.2f}"
+        return (await self._analytics()).sales_text()
 
     async def _get_monthly_expenses(self) -> str:
         """Gets the trip operating expenses for the current month."""
-        start_date = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        end_date = datetime.now()
-        stats = await DashboardRepository.get_trip_stats(start_date, end_date)
-        total_exp = stats['total_diesel_cost'] + stats['total_toll_cost'] + stats['total_driver_cost']
-        return (
-            f"Trip Expenses for this month:\n"
-            f"- Diesel: ₹{stats['total_diesel_cost']:,.2f}\n"
-            f"- Toll: ₹{stats['total_toll_cost']:,.2f}\n"
-            f"- Driver Allowance: ₹{stats['total_driver_cost']:,.2f}\n"
-            f"Total Operating Expense: ₹{total_exp:,.2f}"
-        )
+        return (await self._analytics()).expenses_text()
 
     async def _get_inventory_status(self) -> str:
         """Gets items that are low on stock."""
-        alerts = await DashboardRepository.get_inventory_alerts()
-        if not alerts:
-            return "All inventory levels are healthy."
-        
-        report = "Low Stock Alerts:\n"
-        for item in alerts:
-            report += f"- {item['name']}: Current {item['current_stock']} {item['unit']} (Min: {item['min_level']})\n"
-        return report
+        return (await self._analytics()).inventory_text()
 
     async def _get_outstanding_balances(self) -> str:
         """Gets the total receivable and payable balances."""
-        balances = await DashboardRepository.get_outstanding_balance()
-        return f"Total Receivable: ₹{balances['total_receivable']:,.2f}\nTotal Payable: ₹{balances['total_payable']:,.2f}"
+        return (await self._analytics()).balances_text()
 
     async def _get_fleet_status(self) -> str:
         """Gets the current status of the fleet."""
-        fleet = await DashboardRepository.get_fleet_overview()
-        v_stats = ", ".join([f"{k}: {v}" for k, v in fleet['vehicles'].items()]) if fleet['vehicles'] else "No vehicles"
-        d_stats = ", ".join([f"{k}: {v}" for k, v in fleet['drivers'].items()]) if fleet['drivers'] else "No drivers"
-        return f"Vehicles: {v_stats}\nDrivers: {d_stats}"
+        return (await self._analytics()).fleet_text()
 
     async def _get_top_partners(self) -> str:
         """Gets the top customers and suppliers."""
-        partners = await DashboardRepository.get_top_parties()
-        cust = ", ".join([f"{p['name']} (₹{p['balance']:,.2f})" for p in partners['top_customers']]) if partners['top_customers'] else "None"
-        supp = ", ".join([f"{p['name']} (₹{p['balance']:,.2f})" for p in partners['top_suppliers']]) if partners['top_suppliers'] else "None"
-        return f"Top Customers: {cust}\nTop Suppliers: {supp}"
+        return (await self._analytics()).top_partners_text()
 
     async def _search_parties(self, query: str) -> str:
         """Searches for parties (customers/suppliers)."""
-        parties = await PartyRepository.get_all(search=query, limit=5)
+        parties = (await PartyRepository.get_all(search=query, limit=5, fields="id,name,code,party_type")).items
         if not parties:
             return f"No customers or suppliers found matching '{query}'."
         res = "Search Results:\n"
         for p in parties:
-            res += f"- {p.name} (ID: {p.id}, Code: {p.code}, Type: {p.party_type})\n"
+            res += f"- {p['name']} (ID: {p['id']}, Code: {p['code']}, Type: {p['party_type']})\n"
         return res
 
     async def _get_party_details(self, party_id: int) -> str:
@@ -141,28 +119,30 @@ RULES:
                 v_type = VoucherType(voucher_type.lower())
             except: pass
             
-        vouchers = await VoucherRepository.get_all(limit=limit, voucher_type=v_type)
+        vouchers = (await VoucherRepository.get_all(limit=limit, voucher_type=v_type)).items
         if not vouchers:
             return "No recent vouchers found."
         
         res = f"Recent {voucher_type or 'Voucher'}s:\n"
         for v in vouchers:
-            res += f"- #{v.voucher_number} | {v.voucher_date} | {v.grand_total:,.2f} | Status: {v.status}\n"
+            res += f"- #{v['voucher_number']} | {v['voucher_date']} | {v['grand_total']:,.2f} | Status: {v['status']}\n"
         return res
 
     async def _get_recent_trips(self, limit: int = 5) -> str:
         """Gets recent transport trips."""
-        trips = await TripRepository.get_all(limit=limit)
+        trips = (await TripRepository.get_all(limit=limit)).items
         if not trips:
             return "No recent trips found."
         
         res = "Recent Trips:\n"
         for t in trips:
-            res += f"- Trip ID: {t.id} | Vehicle: {t.vehicle_number or 'N/A'} | Start: {t.start_date.date()} | Revenue: ₹{t.freight_income:,.2f} | Status: {t.status}\n"
+            # Summary rows carry vehicle_id; trips never had a vehicle_number attribute
+            res += f"- Trip ID: {t['id']} | Vehicle ID: {t['vehicle_id']} | Start: {t['start_date'].date()} | Revenue: ₹{t['freight_income']:,.2f} | Status: {t['status']}\n"
         return res
 
     async def get_response(self, message: str, history: List[Dict[str, str]] = []) -> str:
         """Get response from the AI assistant."""
+        from google.genai import types
         try:
             # Build conversation history
             contents = []
@@ -0,0 +1,169 @@
+"""
+Incremental maintenance of the daily dashboard rollups.
+
+Writers snapshot a voucher/trip before changing it and pass the before/after snapshots to
+`apply_voucher` / `apply_trip` with their session. The old bucket is decremented and the
+new one incremented once that session's transaction commits, in a short transaction of
+their own (like IDGenerator._reserve): every write to one day and status bumps the same
+rollup row, so holding its lock for a writer's whole unit of work would queue them all.
+If the writer rolls back, nothing is applied.
+
+A rollup update that fails after its writer committed leaves the rollups behind the raw
+rows; `rebuild_rollups` is the repair. It recomputes both tables from the raw rows, runs
+automatically when ROLLUP_VERSION changes, and `scripts/rebuild_rollups.py` runs it on
+demand (after such a failure, backfills, or bulk edits that bypassed the repositories).
+"""
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import SessionLocal, after_commit
+from app.core.id_generator import dialect_insert
+from app.core.logger import logger
+from app.core.schema import get_schema_meta, set_schema_meta
+from app.features.dashboard.dashboard_entity import DailySalesRollup, DailyTripRollup
+from app.features.vouchers.voucher_entity import TradeVoucher, VoucherType, VoucherStatus
+from app.features.trips.trip_entity import Trip, TripStatus
+
+ROLLUP_VERSION_KEY = "rollup_version"
+ROLLUP_VERSION = 1 # Bump when the rollup definition changes; the next start rebuilds
+
+class VoucherSnapshot(NamedTuple):
+    day: date
+    voucher_type: VoucherType
+    status: VoucherStatus
+    grand_total: float
+
+class TripSnapshot(NamedTuple):
+    day: date
+    status: TripStatus
+    freight_income: float
+    diesel_expense: float
+    toll_expense: float
+    driver_allowance: float
+
+async def _bump(db: AsyncSession, model, key: Dict, deltas: Dict[str, float]):
+    """Add `deltas` to the rollup row `key`, creating it if missing (one upsert)."""
+    insert_stmt = dialect_insert(db.get_bind().dialect.name)
+    stmt = insert_stmt(model).values(**key, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={name: getattr(model, name) + stmt.excluded[name] for name in deltas},
+    )
+    await db.execute(stmt)
+
+Bump = Tuple[type, Dict, Dict[str, float]] # (rollup model, row key, deltas)
+
+async def _apply(bumps: List[Bump]):
+    # Fixed row order, so two moves between the same buckets can't deadlock
+    bumps = sorted(bumps, key=lambda bump: tuple(str(value) for value in bump[1].values()))
+    try:
+        async with SessionLocal() as db:
+            for model, key, deltas in bumps:
+                await _bump(db, model, key, deltas)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Dashboard rollup update failed, run scripts/rebuild_rollups.py to repair: {e}")
+
+def _apply_after_commit(db: AsyncSession, bumps: List[Bump]):
+    if bumps:
+        after_commit(db, lambda: _apply(bumps))
+
+class DailyRollupRepository:
+    @staticmethod
+    def voucher_snapshot(voucher: TradeVoucher) -> VoucherSnapshot:
+        return VoucherSnapshot(voucher.voucher_date, voucher.voucher_type, voucher.status, voucher.grand_total or 0.0)
+
+    @staticmethod
+    def trip_snapshot(trip: Trip) -> Optional[TripSnapshot]:
+        # start_date can still be an unflushed SQL default (func.now()); the caller snapshots after loading
+        if not isinstance(trip.start_date, datetime):
+            return None
+        return TripSnapshot(
+            trip.start_date.date(),
+            trip.status,
+            trip.freight_income or 0.0,
+            trip.diesel_expense or 0.0,
+            trip.toll_expense or 0.0,
+            trip.driver_allowance or 0.0,
+        )
+
+    @staticmethod
+    async def apply_voucher(db: AsyncSession, before: Optional[VoucherSnapshot], after: Optional[VoucherSnapshot]):
+        """Move a voucher's contribution from its old bucket to its new one (None = absent) once `db` commits."""
+        if before == after:
+            return
+        bumps: List[Bump] = []
+        if before is not None:
+            key = {"day": before.day, "voucher_type": before.voucher_type, "status": before.status}
+            bumps.append((DailySalesRollup, key, {"voucher_count": -1, "grand_total": -before.grand_total}))
+        if after is not None:
+            key = {"day": after.day, "voucher_type": after.voucher_type, "status": after.status}
+            bumps.append((DailySalesRollup, key, {"voucher_count": 1, "grand_total": after.grand_total}))
+        _apply_after_commit(db, bumps)
+
+    @staticmethod
+    async def apply_trip(db: AsyncSession, before: Optional[TripSnapshot], after: Optional[TripSnapshot]):
+        """Move a trip's contribution from its old bucket to its new one (None = absent) once `db` commits."""
+        if before == after:
+            return
+        bumps: List[Bump] = []
+        if before is not None:
+            bumps.append((DailyTripRollup, {"day": before.day, "status": before.status}, {
+                "trip_count": -1,
+                "freight_income": -before.freight_income,
+                "diesel_expense": -before.diesel_expense,
+                "toll_expense": -before.toll_expense,
+                "driver_allowance": -before.driver_allowance,
+            }))
+        if after is not None:
+            bumps.append((DailyTripRollup, {"day": after.day, "status": after.status}, {
+                "trip_count": 1,
+                "freight_income": after.freight_income,
+                "diesel_expense": after.diesel_expense,
+                "toll_expense": after.toll_expense,
+                "driver_allowance": after.driver_allowance,
+            }))
+        _apply_after_commit(db, bumps)
+
+def rebuild_rollups(conn: Connection):
+    """
+    Recompute both rollup tables from trade_vouchers and trips.
+    Synchronous, run it with `await conn.run_sync(rebuild_rollups)` inside one transaction.
+    """
+    conn.execute(delete(DailySalesRollup))
+    conn.execute(insert(DailySalesRollup).from_select(
+        ["day", "voucher_type", "status", "voucher_count", "grand_total"],
+        select(
+            TradeVoucher.voucher_date,
+            TradeVoucher.voucher_type,
+            TradeVoucher.status,
+            func.count(TradeVoucher.id),
+            func.coalesce(func.sum(TradeVoucher.grand_total), 0.0),
+        ).group_by(TradeVoucher.voucher_date, TradeVoucher.voucher_type, TradeVoucher.status)
+    ))
+
+    trip_day = func.date(Trip.start_date)
+    conn.execute(delete(DailyTripRollup))
+    conn.execute(insert(DailyTripRollup).from_select(
+        ["day", "status", "trip_count", "freight_income", "diesel_expense", "toll_expense", "driver_allowance"],
+        select(
+            trip_day,
+            Trip.status,
+            func.count(Trip.id),
+            func.coalesce(func.sum(Trip.freight_income), 0.0),
+            func.coalesce(func.sum(Trip.diesel_expense), 0.0),
+            func.coalesce(func.sum(Trip.toll_expense), 0.0),
+            func.coalesce(func.sum(Trip.driver_allowance), 0.0),
+        ).where(Trip.start_date.is_not(None)).group_by(trip_day, Trip.status)
+    ))
+    logger.info("Dashboard rollups rebuilt")
+
+def ensure_rollups(conn: Connection) -> bool:
+    """Rebuild the rollups if this database has not been built at ROLLUP_VERSION yet. Returns True if it rebuilt."""
+    if get_schema_meta(conn, ROLLUP_VERSION_KEY) == str(ROLLUP_VERSION):
+        return False
+    rebuild_rollups(conn)
+    set_schema_meta(conn, ROLLUP_VERSION_KEY, str(ROLLUP_VERSION))
+    return True
@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import Dict, Tuple
+from app.features.dashboard.dashboard_schema import DashboardChart, ChartDataPoint
+from app.features.dashboard.dashboard_repository import DashboardRepository
+
+PERIODS = ("today", "week", "month", "month_to_date")
+
+def period_range(period: str, now: datetime) -> Tuple[datetime, int]:
+    """Start of the period and the number of days its revenue trend covers."""
+    if period == "today":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0), 1
+    if period == "week":
+        return now - timedelta(days=7), 7
+    if period == "month_to_date":
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), now.day
+    return now - timedelta(days=30), 30 # month
+
+class AnalyticsSnapshot:
+    """
+    Every dashboard metric for one period as of one instant, each queried once.
+    The overview JSON, the chart DTOs and the chat tool answers are all views of the same data.
+    Immutable once computed, so the views are built on first use and kept.
+    """
+    def __init__(self, period: str, as_of: datetime, financials: dict, trip_stats: dict, inventory_alerts: list,
+                 fleet_overview: dict, top_parties: dict, revenue_trends: list):
+        self.period = period
+        self.as_of = as_of
+        self.financials = financials
+        self.trip_stats = trip_stats
+        self.inventory_alerts = inventory_alerts
+        self.fleet_overview = fleet_overview
+        self.top_parties = top_parties
+        self.revenue_trends = revenue_trends
+
+    @classmethod
+    async def compute(cls, period: str, as_of: datetime) -> "AnalyticsSnapshot":
+        start_date, trend_days = period_range(period, as_of)
+        # One statement per group (financials, trips, ...), run concurrently on separate
+        # connections: latency is the slowest group, not the sum of the round trips
+        results = await asyncio.gather(
+            DashboardRepository.get_financial_summary(start_date, as_of),
+            DashboardRepository.get_trip_stats(start_date, as_of),
+            DashboardRepository.get_inventory_alerts(),
+            DashboardRepository.get_fleet_overview(),
+            DashboardRepository.get_top_parties(),
+            DashboardRepository.get_revenue_trends(trend_days),
+        )
+        return cls(period, as_of, *results)
+
+    @property
+    def total_trip_expense(self) -> float:
+        return (
+            self.trip_stats["total_diesel_cost"] +
+            self.trip_stats["total_toll_cost"] +
+            self.trip_stats["total_driver_cost"]
+        )
+
+    @cached_property
+    def overview(self) -> dict:
+        financials = self.financials
+        trip_data = self.trip_stats
+        total_trip_expense = self.total_trip_expense
+
+        gross_trading_revenue = financials["total_sales_amount"]
+        gross_purchases = financials["total_purchase_amount"]
+        trip_revenue = trip_data["total_freight_revenue"]
+
+        # Consolidated Business Net Income
+        # (Trading Sales + Transport Rev) - (Operating Costs + Stock Purchase Costs)
+        business_net_income = (gross_trading_revenue + trip_revenue) - (total_trip_expense + gross_purchases)
+
+        return {
+            "period": self.period,
+            "financial_summary": {
+                "sales_revenue": gross_trading_revenue,
+                "purchase_costs": gross_purchases,
+                "total_receivable": financials["total_receivable"],
+                "total_payable": financials["total_payable"],
+                "estimated_cash_flow": financials["total_receivable"] - financials["total_payable"],
+                "business_net_income": business_net_income,
+                "sales_count": financials["sales_count"],
+                "avg_sale_value": financials["average_sales_value"]
+            },
+            "logistics_performance": {
+                "total_trips": trip_data["trip_count"],
+                "status_breakdown": trip_data["status_distribution"],
+                "freight_revenue": trip_revenue,
+                "operating_expenses": {
+                    "fuel": trip_data["total_diesel_cost"],
+                    "toll": trip_data["total_toll_cost"],
+                    "driver_allowance": trip_data["total_driver_cost"],
+                    "total": total_trip_expense
+                }
+            },
+            "fleet_status": self.fleet_overview,
+            "inventory_health": {
+                "low_stock_count": len(self.inventory_alerts),
+                "alerts": self.inventory_alerts
+            },
+            "top_partners": self.top_parties,
+            "charts": {
+                "revenue_trend": self.revenue_trends
+            }
+        }
+
+    @cached_property
+    def charts(self) -> Dict[str, DashboardChart]:
+        trip_stats = self.trip_stats
+        charts = {}
+
+        # 1. Revenue Trend Chart (Area/Line)
+        charts["revenue_trend"] = DashboardChart(
+            chart_type="area",
+            title="Revenue Trend",
+            data=[ChartDataPoint(label=item["date"], value=item["amount"]) for item in self.revenue_trends]
+        )
+
+        # 2. Trip Status Distribution (Doughnut)
+        charts["trip_status"] = DashboardChart(
+            chart_type="doughnut",
+            title="Trip Status Breakdown",
+            data=[ChartDataPoint(label=status, value=count) for status, count in trip_stats["status_distribution"].items()]
+        )
+
+        # 3. Expense Breakdown (Pie)
+        charts["expense_breakdown"] = DashboardChart(
+            chart_type="pie",
+            title="Trip Expense Distribution",
+            data=[
+                ChartDataPoint(label="Fuel (Diesel)", value=trip_stats["total_diesel_cost"]),
+                ChartDataPoint(label="Toll", value=trip_stats["total_toll_cost"]),
+                ChartDataPoint(label="Driver Allowance", value=trip_stats["total_driver_cost"]),
+            ]
+        )
+
+        # 4. Top Customers (Bar)
+        charts["top_customers"] = DashboardChart(
+            chart_type="bar",
+            title="Top Customers by Balance",
+            data=[ChartDataPoint(label=item["name"], value=item["balance"]) for item in self.top_parties["top_customers"]]
+        )
+
+        # 5. Vehicle Availability (Pie)
+        charts["fleet_availability"] = DashboardChart(
+            chart_type="pie",
+            title="Fleet Status Overview",
+            data=[ChartDataPoint(label=status, value=count) for status, count in self.fleet_overview["vehicles"].items()]
+        )
+
+        return charts
+
+    # --- Chat tool answers ---
+
+    def sales_text(self) -> str:
+        return f"Total Sales Value for this month: ₹{self.financials['total_sales_amount']:,.2f}"
+
+    def expenses_text(self) -> str:
+        stats = self.trip_stats
+        return (
+            f"Trip Expenses for this month:\n"
+            f"- Diesel: ₹{stats['total_diesel_cost']:,.2f}\n"
+            f"- Toll: ₹{stats['total_toll_cost']:,.2f}\n"
+            f"- Driver Allowance: ₹{stats['total_driver_cost']:,.2f}\n"
+            f"Total Operating Expense: ₹{self.total_trip_expense:,.2f}"
+        )
+
+    def inventory_text(self) -> str:
+        if not self.inventory_alerts:
+            return "All inventory levels are healthy."
+
+        report = "Low Stock Alerts:\n"
+        for item in self.inventory_alerts:
+            report += f"- {item['name']}: Current {item['current_stock']} {item['unit']} (Min: {item['min_level']})\n"
+        return report
+
+    def balances_text(self) -> str:
+        return f"Total Receivable: ₹{self.financials['total_receivable']:,.2f}\nTotal Payable: ₹{self.financials['total_payable']:,.2f}"
+
+    def fleet_text(self) -> str:
+        fleet = self.fleet_overview
+        v_stats = ", ".join([f"{k}: {v}" for k, v in fleet['vehicles'].items()]) if fleet['vehicles'] else "No vehicles"
+        d_stats = ", ".join([f"{k}: {v}" for k, v in fleet['drivers'].items()]) if fleet['drivers'] else "No drivers"
+        return f"Vehicles: {v_stats}\nDrivers: {d_stats}"
+
+    def top_partners_text(self) -> str:
+        partners = self.top_parties
+        cust = ", ".join([f"{p['name']} (₹{p['balance']:,.2f})" for p in partners['top_customers']]) if partners['top_customers'] else "None"
+        supp = ", ".join([f"{p['name']} (₹{p['balance']:,.2f})" for p in partners['top_suppliers']]) if partners['top_suppliers'] else "None"
+        return f"Top Customers: {cust}\nTop Suppliers: {supp}"
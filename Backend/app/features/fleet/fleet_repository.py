@@ -1,15 +1,25 @@
-from typing import Optional, Sequence, List
+from typing import Optional, List
 from sqlalchemy import select
-from app.core.database import SessionLocal
+from app.core.database import get_session
+from app.core.projection import Fieldset, Summary, schema_columns
 from app.features.fleet.fleet_entity import Vehicle, Driver
-from app.features.fleet.fleet_schema import VehicleCreate, VehicleUpdate, DriverCreate, DriverUpdate
+from app.features.fleet.fleet_schema import (
+    VehicleCreate, VehicleUpdate, VehicleResponse,
+    DriverCreate, DriverUpdate, DriverResponse
+)
 from app.core.logger import logger
 
+VEHICLE_FIELDS = Fieldset(schema_columns(Vehicle, VehicleResponse))
+DRIVER_FIELDS = Fieldset(schema_columns(Driver, DriverResponse))
+# What `?expand=` embeds in records that reference a vehicle / driver
+VEHICLE_SUMMARY = Summary(Vehicle.id, Vehicle.vehicle_number, Vehicle.vehicle_type)
+DRIVER_SUMMARY = Summary(Driver.id, Driver.name, Driver.phone)
+
 class FleetRepository:
     # --- Vehicle ---
     @staticmethod
     async def create_vehicle(vehicle_in: VehicleCreate) -> Vehicle:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_veh = Vehicle(**vehicle_in.model_dump())
                 db.add(db_veh)
@@ -22,21 +32,23 @@ class FleetRepository:
                 raise
 
     @staticmethod
-    async def get_all_vehicles(skip: int = 0, limit: int = 100) -> Sequence[Vehicle]:
-        async with SessionLocal() as db:
-            result = await db.execute(select(Vehicle).offset(skip).limit(limit))
-            return result.scalars().all()
+    async def get_all_vehicles(skip: int = 0, limit: int = 100, fields: Optional[str] = None) -> List[dict]:
+        """Vehicles as dicts with the requested VEHICLE_FIELDS (all by default)."""
+        selection = VEHICLE_FIELDS.select(fields)
+        async with get_session(read_only=True) as db:
+            result = await db.execute(select(*selection.columns).offset(skip).limit(limit))
+            return [dict(row) for row in result.mappings()]
     
     @staticmethod
     async def get_vehicle_by_number(number: str) -> Optional[Vehicle]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Vehicle).where(Vehicle.vehicle_number == number))
             return result.scalar_one_or_none()
 
     # --- Driver ---
     @staticmethod
     async def create_driver(driver_in: DriverCreate) -> Driver:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_drv = Driver(**driver_in.model_dump())
                 db.add(db_drv)
@@ -49,32 +61,34 @@ class FleetRepository:
                 raise
     
     @staticmethod
-    async def get_all_drivers(skip: int = 0, limit: int = 100) -> Sequence[Driver]:
-        async with SessionLocal() as db:
-            result = await db.execute(select(Driver).offset(skip).limit(limit))
-            return result.scalars().all()
+    async def get_all_drivers(skip: int = 0, limit: int = 100, fields: Optional[str] = None) -> List[dict]:
+        """Drivers as dicts with the requested DRIVER_FIELDS (all by default)."""
+        selection = DRIVER_FIELDS.select(fields)
+        async with get_session(read_only=True) as db:
+            result = await db.execute(select(*selection.columns).offset(skip).limit(limit))
+            return [dict(row) for row in result.mappings()]
 
     @staticmethod
     async def get_driver_by_id(driver_id: int) -> Optional[Driver]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Driver).where(Driver.id == driver_id))
             return result.scalar_one_or_none()
 
     @staticmethod
     async def get_driver_by_phone(phone: str) -> Optional[Driver]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Driver).where(Driver.phone == phone))
             return result.scalar_one_or_none()
 
     @staticmethod
     async def get_driver_by_telegram_id(chat_id: str) -> Optional[Driver]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Driver).where(Driver.telegram_chat_id == chat_id))
             return result.scalar_one_or_none()
             
     @staticmethod
     async def update_driver_telegram_id(driver_id: int, chat_id: str) -> bool:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(Driver).where(Driver.id == driver_id))
                 driver = result.scalar_one_or_none()
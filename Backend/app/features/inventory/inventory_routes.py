@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status, Query
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from typing import Optional
 from app.features.inventory.inventory_schema import ItemCreate, ItemUpdate, PriceOverrideCreate, ItemType
 from app.features.inventory.inventory_service import InventoryService
@@ -12,12 +12,12 @@ router = APIRouter(prefix="/inventory", tags=["Inventory (Items & Pricing)"])
 async def create_item(item_in: ItemCreate):
     """Create a new Product or Service (Item)."""
     item = await InventoryService.create_item(item_in)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "success": True, 
             "message": "Item created successfully", 
-            "data": item.model_dump(mode='json')
+            "data": item
         }
     )
 
@@ -26,31 +26,35 @@ async def get_items(
     skip: int = 0, 
     limit: int = 100, 
     type: Optional[ItemType] = None, 
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    """List all items with filters."""
-    items = await InventoryService.get_all_items(skip, limit, type, search)
-    return JSONResponse(
+    """List all items with filters. `fields=id,name,current_stock` returns only those fields."""
+    items = await InventoryService.get_all_items(skip, limit, type, search, fields)
+    return APIResponse(
         content={
             "success": True,
             "message": f"Retrieved {len(items)} items",
-            "data": [i.model_dump(mode='json') for i in items],
+            "data": items,
             "pagination": {"skip": skip, "limit": limit, "count": len(items)}
         }
     )
 
 @router.get("/items/{item_id}")
-async def get_item_detail(item_id: int):
-    item = await InventoryService.get_item(item_id)
-    return JSONResponse(
-        content={"success": True, "message": "Item retrieved", "data": item.model_dump(mode='json')}
+async def get_item_detail(item_id: int, fields: Optional[str] = None):
+    if fields:
+        item = await InventoryService.get_item_fields(item_id, fields)
+    else:
+        item = await InventoryService.get_item(item_id)
+    return APIResponse(
+        content={"success": True, "message": "Item retrieved", "data": item}
     )
 
 @router.patch("/items/{item_id}")
 async def update_item(item_id: int, item_in: ItemUpdate):
     item = await InventoryService.update_item(item_id, item_in)
-    return JSONResponse(
-        content={"success": True, "message": "Item updated", "data": item.model_dump(mode='json')}
+    return APIResponse(
+        content={"success": True, "message": "Item updated", "data": item}
     )
 
 # --- Pricing ---
@@ -62,11 +66,11 @@ async def set_specific_price(price_in: PriceOverrideCreate):
     Location can be used for 'Route' specific pricing (e.g. Mumbai-Pune).
     """
     rate = await InventoryService.set_price_override(price_in)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True, 
             "message": "Price override set successfully", 
-            "data": rate.model_dump(mode='json')
+            "data": rate
         }
     )
 
@@ -77,7 +81,7 @@ async def get_effective_price(item_id: int, party_id: int, location: str = "defa
     Checks Override Table -> Falls back to Item Base Price.
     """
     price = await InventoryService.get_item_price_for_party(item_id, party_id, location)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": "Price calculated",
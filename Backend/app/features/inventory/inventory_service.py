@@ -23,9 +23,8 @@ class InventoryService:
         return ItemResponse.model_validate(item)
 
     @staticmethod
-    async def get_all_items(skip: int, limit: int, type: Optional[ItemType], search: Optional[str]):
-        items = await InventoryRepository.get_all_items(skip, limit, type, search)
-        return [ItemResponse.model_validate(i) for i in items]
+    async def get_all_items(skip: int, limit: int, type: Optional[ItemType], search: Optional[str], fields: Optional[str] = None) -> List[dict]:
+        return await InventoryRepository.get_all_items(skip, limit, type, search, fields)
 
     @staticmethod
     async def get_item(item_id: int) -> ItemResponse:
@@ -34,6 +33,13 @@ class InventoryService:
             raise HTTPException(status_code=404, detail="Item not found")
         return ItemResponse.model_validate(item)
 
+    @staticmethod
+    async def get_item_fields(item_id: int, fields: str) -> dict:
+        item = await InventoryRepository.get_item_fields(item_id, fields)
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return item
+
     @staticmethod
     async def update_item(item_id: int, item_in: ItemUpdate) -> ItemResponse:
         item = await InventoryRepository.update_item(item_id, item_in)
@@ -0,0 +1,47 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.database import track_database_stats
+from app.core.logger import logger
+
+class DBMetricsMiddleware:
+    """
+    Counts the database work of each request and reports it in the response headers:
+    - X-DB-Queries: number of SQL statements executed
+    - Server-Timing: database time and total time, visible in the browser's network panel
+    Logs a warning when one statement shape repeats more than DB_N_PLUS_ONE_THRESHOLD times.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_database_stats() as stats:
+            async def send_with_metrics(message: Message):
+                if message["type"] == "http.response.start":
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.statements))
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_time_ms:.1f};desc="{stats.statements} queries", app;dur={total_ms:.1f}'
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_metrics)
+            finally:
+                self._report_repeated_statements(scope, stats)
+
+    def _report_repeated_statements(self, scope: Scope, stats):
+        for shape, count in stats.repeated_shapes(settings.DB_N_PLUS_ONE_THRESHOLD):
+            statement = " ".join(shape.split())
+            logger.warning(
+                f"Possible N+1 on {scope['method']} {scope['path']}: "
+                f"statement ran {count} times: {statement[:300]}"
+            )
@@ -0,0 +1,145 @@
+import json
+import math
+import time
+from http import HTTPStatus
+from typing import Dict, List, Optional
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.rate_limiter import TokenBucketLimiter
+
+_LIMITED_ROUTES = frozenset(settings.RATE_LIMIT_ROUTES)
+# Login and change-password bodies are a few hundred bytes; no more than this is read for the username
+_MAX_BODY_BYTES = 4096
+
+# Keys are (route, client IP), (route, username) and the route itself
+ip_limiter = TokenBucketLimiter("ip", settings.RATE_LIMIT_IP_BURST, settings.RATE_LIMIT_IP_PER_MINUTE, settings.RATE_LIMIT_MAX_KEYS)
+username_limiter = TokenBucketLimiter("username", settings.RATE_LIMIT_USERNAME_BURST, settings.RATE_LIMIT_USERNAME_PER_MINUTE, settings.RATE_LIMIT_MAX_KEYS)
+route_limiter = TokenBucketLimiter("route", settings.RATE_LIMIT_ROUTE_BURST, settings.RATE_LIMIT_ROUTE_PER_MINUTE, len(_LIMITED_ROUTES))
+
+def rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    return {limiter.name: limiter.stats() for limiter in (ip_limiter, username_limiter, route_limiter)}
+
+class RateLimitMiddleware:
+    """
+    Token-bucket throttling of the POST routes in RATE_LIMIT_ROUTES (login, change-password),
+    per client IP, per username and per route. Runs before authentication, the database and
+    bcrypt, so a rejected attempt costs a dict lookup; it gets 429 with Retry-After.
+
+    The route and IP buckets are checked before the body is read. The username comes from
+    the JSON body, which is read here (at most _MAX_BODY_BYTES, else 413) and replayed to
+    the route. The client IP is the ASGI client address (run uvicorn with --proxy-headers
+    behind a proxy).
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in _LIMITED_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+        buckets = [(route_limiter, path), (ip_limiter, (path, client_ip))]
+        if await self._reject_if_limited(buckets, path, client_ip, None, scope, receive, send):
+            return
+
+        messages = await self._read_request(scope, receive)
+        if messages is None:
+            # Still counts against the route and IP, so oversized bodies aren't free to send
+            now = time.monotonic()
+            for limiter, key in buckets:
+                limiter.spend(key, now)
+            logger.warning(f"Request body over {_MAX_BODY_BYTES} bytes on {path} (ip={client_ip})")
+            await self._too_large()(scope, receive, send)
+            return
+
+        username = self._username(messages)
+        if username:
+            buckets.append((username_limiter, (path, username)))
+            if await self._reject_if_limited(buckets[-1:], path, client_ip, username, scope, receive, send):
+                return
+
+        # Spend only if every bucket has a token, so a rejected attempt doesn't drain the others
+        now = time.monotonic()
+        for limiter, key in buckets:
+            limiter.spend(key, now)
+
+        await self.app(scope, self._replay(messages, receive), send)
+
+    async def _reject_if_limited(self, buckets, path: str, client_ip: str, username: Optional[str], scope: Scope, receive: Receive, send: Send) -> bool:
+        """Send 429 and return True if any of `buckets` is out of tokens."""
+        now = time.monotonic()
+        for limiter, key in buckets:
+            wait = limiter.wait_time(key, now)
+            if wait:
+                limiter.limited += 1
+                logger.warning(f"Rate limited {path} by {limiter.name} (ip={client_ip}, username={username})")
+                await self._too_many_requests(wait)(scope, receive, send)
+                return True
+        return False
+
+    @staticmethod
+    async def _read_request(scope: Scope, receive: Receive) -> Optional[List[Message]]:
+        """The request's messages, or None as soon as the body exceeds _MAX_BODY_BYTES (the rest is left unread)."""
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length":
+                if not value.isdigit() or int(value) > _MAX_BODY_BYTES:
+                    return None
+                break
+        messages, size = [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            size += len(message.get("body", b""))
+            if size > _MAX_BODY_BYTES:
+                return None
+            if message["type"] != "http.request" or not message.get("more_body"):
+                return messages
+
+    @staticmethod
+    def _replay(messages: List[Message], receive: Receive) -> Receive:
+        pending = list(messages)
+
+        async def replay() -> Message:
+            return pending.pop(0) if pending else await receive()
+        return replay
+
+    @staticmethod
+    def _username(messages: List[Message]) -> Optional[str]:
+        body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.request")
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+        username = data.get("username") if isinstance(data, dict) else None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return username.strip().lower()[:100]
+
+    @staticmethod
+    def _too_large():
+        return JSONResponse(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, # Starlette renamed the constant; this works with either
+            content={
+                "success": False,
+                "message": f"Request body too large (limit {_MAX_BODY_BYTES} bytes)",
+                "data": None
+            }
+        )
+
+    @staticmethod
+    def _too_many_requests(wait_seconds: float):
+        retry_after = math.ceil(min(wait_seconds, 24 * 3600))
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "success": False,
+                "message": f"Too many attempts. Try again in {retry_after} seconds.",
+                "data": None
+            },
+            headers={"Retry-After": str(retry_after)}
+        )
@@ -1,20 +1,31 @@
 from fastapi import APIRouter, Depends, status
-from typing import List
+from app.core.responses import APIResponse
+from typing import Optional
 from app.features.users.user_entity import User
 from app.features.notifications.notification_service import NotificationService
-from app.features.notifications.notification_schema import NotificationResponse, NotificationCreate
+from app.features.notifications.notification_schema import NotificationCreate
 from app.features.auth.auth_dependencies import get_current_active_user
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-@router.get("/", response_model=List[NotificationResponse])
+@router.get("/")
 async def get_my_notifications(
-    skip: int = 0, 
+    cursor: Optional[str] = None, 
     limit: int = 50, 
     unread_only: bool = False,
+    with_total: bool = False,
     current_user: User = Depends(get_current_active_user)
 ):
-    return await NotificationService.get_user_notifications(current_user.id, skip, limit, unread_only)
+    """Newest first. Pass `pagination.next_cursor` back as `cursor` for the next page."""
+    page = await NotificationService.get_user_notifications(current_user.id, cursor, limit, unread_only, with_total)
+    return APIResponse(
+        content={
+            "success": True,
+            "message": f"Retrieved {len(page.items)} notifications",
+            "data": page.items,
+            "pagination": page.envelope(limit)
+        }
+    )
 
 @router.post("/{noti_id}/read", status_code=status.HTTP_204_NO_CONTENT)
 async def mark_notification_read(
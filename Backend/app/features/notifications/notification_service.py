@@ -1,4 +1,5 @@
-from typing import List
+from typing import Optional
+from app.core.pagination import Page
 from app.features.notifications.notification_repository import NotificationRepository
 from app.features.notifications.notification_schema import NotificationCreate, NotificationResponse
 
@@ -9,9 +10,10 @@ class NotificationService:
         return NotificationResponse.model_validate(created)
 
     @staticmethod
-    async def get_user_notifications(user_id: int, skip: int = 0, limit: int = 50, unread_only: bool = False) -> List[NotificationResponse]:
-        notis = await NotificationRepository.get_for_user(user_id, skip, limit, unread_only)
-        return [NotificationResponse.model_validate(n) for n in notis]
+    async def get_user_notifications(user_id: int, cursor: Optional[str] = None, limit: int = 50, unread_only: bool = False, with_total: bool = False) -> Page[NotificationResponse]:
+        page = await NotificationRepository.get_for_user(user_id, cursor, limit, unread_only, with_total)
+        page.items = [NotificationResponse.model_validate(n) for n in page.items]
+        return page
 
     @staticmethod
     async def mark_read(noti_id: int):
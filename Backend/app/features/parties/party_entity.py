@@ -41,7 +41,7 @@ class Party(Base):
     
     credit_limit: Mapped[float] = mapped_column(Float, default=0.0)
     payment_terms_days: Mapped[int] = mapped_column(default=0)
-    current_balance: Mapped[float] = mapped_column(Float, default=0.0)
+    current_balance: Mapped[float] = mapped_column(Float, default=0.0, index=True)
     
     status: Mapped[PartyStatus] = mapped_column(Enum(PartyStatus), default=PartyStatus.ACTIVE)
     notes: Mapped[Optional[str]] = mapped_column(String(500))
@@ -1,14 +1,20 @@
-from typing import Optional, List, Sequence
+from typing import Optional, List
 from sqlalchemy import select, update, delete, or_
-from app.core.database import SessionLocal
+from app.core.database import get_session
+from app.core.pagination import Page, fetch_page
+from app.core.projection import Fieldset, Summary, schema_columns
 from app.features.parties.party_entity import Party, PartyType
-from app.features.parties.party_schema import PartyCreate, PartyUpdate
+from app.features.parties.party_schema import PartyCreate, PartyUpdate, PartyResponse
 from app.core.logger import logger
 
+PARTY_FIELDS = Fieldset(schema_columns(Party, PartyResponse))
+# What `?expand=` embeds in records that reference a party
+PARTY_SUMMARY = Summary(Party.id, Party.code, Party.name, Party.party_type)
+
 class PartyRepository:
     @staticmethod
     async def create(party_in: PartyCreate) -> Party:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_party = Party(**party_in.model_dump())
                 db.add(db_party)
@@ -23,20 +29,30 @@ class PartyRepository:
 
     @staticmethod
     async def get_by_id(party_id: int) -> Optional[Party]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Party).where(Party.id == party_id))
             return result.scalar_one_or_none()
 
     @staticmethod
     async def get_by_code(code: str) -> Optional[Party]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Party).where(Party.code == code))
             return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_all(skip: int = 0, limit: int = 100, party_type: Optional[PartyType] = None, search: Optional[str] = None) -> Sequence[Party]:
-        async with SessionLocal() as db:
-            query = select(Party)
+    async def get_all(
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        party_type: Optional[PartyType] = None,
+        search: Optional[str] = None,
+        with_total: bool = False,
+        fields: Optional[str] = None,
+    ) -> Page[dict]:
+        """One page of parties by name, as dicts with the requested PARTY_FIELDS (all by default)."""
+        keys = (Party.name, Party.id)
+        selection = PARTY_FIELDS.select(fields, required=keys)
+        async with get_session(read_only=True) as db:
+            query = select(*selection.columns)
             
             if party_type:
                 # If asking for 'both', do we return only 'both' type? Or customers+suppliers? 
@@ -55,13 +71,21 @@ class PartyRepository:
                     )
                 )
             
-            query = query.offset(skip).limit(limit).order_by(Party.name)
-            result = await db.execute(query)
-            return result.scalars().all()
+            page = await fetch_page(db, query, keys, cursor, limit, descending=False, with_total=with_total, mappings=True)
+            await selection.finish(db, page.items)
+            return page
+
+    @staticmethod
+    async def get_fields(party_id: int, fields: Optional[str] = None) -> Optional[dict]:
+        """One party as a dict with the requested PARTY_FIELDS."""
+        selection = PARTY_FIELDS.select(fields)
+        async with get_session(read_only=True) as db:
+            row = (await db.execute(select(*selection.columns).where(Party.id == party_id))).mappings().one_or_none()
+            return dict(row) if row is not None else None
 
     @staticmethod
     async def update(party_id: int, party_in: PartyUpdate) -> Optional[Party]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(Party).where(Party.id == party_id))
                 db_party = result.scalar_one_or_none()
@@ -83,7 +107,7 @@ class PartyRepository:
 
     @staticmethod
     async def delete(party_id: int) -> bool:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(delete(Party).where(Party.id == party_id))
                 await db.commit()
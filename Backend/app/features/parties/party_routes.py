@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status, Query
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from typing import Optional
 from app.features.parties.party_schema import PartyCreate, PartyUpdate, PartyResponse, PartyType
 from app.features.parties.party_service import PartyService
@@ -10,63 +10,70 @@ router = APIRouter(prefix="/parties", tags=["Parties (Customers/Suppliers)"])
 async def create_party(party_in: PartyCreate):
     """Create a new Customer, Supplier, or Carrier."""
     party = await PartyService.create_party(party_in)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "success": True, 
             "message": f"{party.party_type.value.capitalize()} created successfully", 
-            "data": party.model_dump(mode='json')
+            "data": party
         }
     )
 
 @router.get("/")
 async def get_parties(
-    skip: int = 0, 
+    cursor: Optional[str] = None, 
     limit: int = 100, 
     type: Optional[PartyType] = None, 
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    with_total: bool = False,
+    fields: Optional[str] = None
 ):
     """
-    Get list of parties. 
+    Get list of parties, by name. 
     Filter by 'type' (customer, supplier, carrier).
     Search by name, code, phone.
+    Pass `pagination.next_cursor` back as `cursor` for the next page.
+    `fields=id,name,current_balance` returns only those fields.
     """
-    parties = await PartyService.get_all_parties(skip=skip, limit=limit, type=type, search=search)
-    return JSONResponse(
+    page = await PartyService.get_all_parties(cursor=cursor, limit=limit, type=type, search=search, with_total=with_total, fields=fields)
+    return APIResponse(
         content={
             "success": True,
-            "message": f"Retrieved {len(parties)} records",
-            "data": [p.model_dump(mode='json') for p in parties],
-            "pagination": {"skip": skip, "limit": limit, "count": len(parties)}
+            "message": f"Retrieved {len(page.items)} records",
+            "data": page.items,
+            "pagination": page.envelope(limit)
         }
     )
 
 @router.get("/{party_id}")
-async def get_party(party_id: int):
-    party = await PartyService.get_party(party_id)
-    return JSONResponse(
+async def get_party(party_id: int, fields: Optional[str] = None):
+    if fields:
+        party = await PartyService.get_party_fields(party_id, fields)
+    else:
+        party = await PartyService.get_party(party_id)
+    return APIResponse(
         content={
             "success": True,
             "message": "Record retrieved",
-            "data": party.model_dump(mode='json')
+            "data": party
         }
     )
 
 @router.patch("/{party_id}")
 async def update_party(party_id: int, party_in: PartyUpdate):
     party = await PartyService.update_party(party_id, party_in)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": "Record updated successfully",
-            "data": party.model_dump(mode='json')
+            "data": party
         }
     )
 
 @router.delete("/{party_id}")
 async def delete_party(party_id: int):
     await PartyService.delete_party(party_id)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": "Record deleted successfully",
@@ -1,15 +1,20 @@
-from typing import Optional, Sequence
+from typing import Optional
 from sqlalchemy import select
-from app.core.database import SessionLocal
+from sqlalchemy.sql import Select
+from app.core.database import get_session
+from app.core.export import date_range_conditions
+from app.core.pagination import Page, fetch_page
 from app.features.transactions.transaction_entity import Transaction, TransactionType
+from app.features.parties.party_entity import Party
+from app.features.vouchers.voucher_entity import TradeVoucher
 from app.features.transactions.transaction_schema import TransactionCreate
 from app.core.logger import logger
-from datetime import datetime
+from datetime import datetime, date
 
 class TransactionRepository:
     @staticmethod
     async def create(transaction_in: TransactionCreate, created_by: Optional[int] = None) -> Transaction:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_txn = Transaction(
                     **transaction_in.model_dump(),
@@ -29,24 +34,44 @@ class TransactionRepository:
                 raise
 
     @staticmethod
-    async def get_by_party(party_id: int, skip: int = 0, limit: int = 100) -> Sequence[Transaction]:
-        async with SessionLocal() as db:
-            result = await db.execute(
-                select(Transaction)
-                .where(Transaction.party_id == party_id)
-                .order_by(Transaction.transaction_date.desc())
-                .offset(skip).limit(limit)
-            )
-            return result.scalars().all()
+    async def get_by_party(party_id: int, cursor: Optional[str] = None, limit: int = 100, with_total: bool = False) -> Page[Transaction]:
+        async with get_session(read_only=True) as db:
+            query = select(Transaction).where(Transaction.party_id == party_id)
+            return await fetch_page(db, query, (Transaction.transaction_date, Transaction.id), cursor, limit, with_total=with_total)
 
     @staticmethod
-    async def get_all(skip: int = 0, limit: int = 100) -> Sequence[Transaction]:
-        async with SessionLocal() as db:
-            result = await db.execute(select(Transaction).order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit))
-            return result.scalars().all()
+    async def get_all(cursor: Optional[str] = None, limit: int = 100, with_total: bool = False) -> Page[Transaction]:
+        async with get_session(read_only=True) as db:
+            return await fetch_page(db, select(Transaction), (Transaction.transaction_date, Transaction.id), cursor, limit, with_total=with_total)
 
     @staticmethod
     async def get_by_id(txn_id: int) -> Optional[Transaction]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Transaction).where(Transaction.id == txn_id))
             return result.scalar_one_or_none()
+
+    @staticmethod
+    def export_query(start_date: Optional[date] = None, end_date: Optional[date] = None, party_id: Optional[int] = None) -> Select:
+        """Ledger rows with party and voucher references, for streaming exports."""
+        query = (
+            select(
+                Transaction.id,
+                Transaction.transaction_date,
+                Transaction.transaction_type,
+                Transaction.payment_mode,
+                Transaction.status,
+                Transaction.amount,
+                Party.code.label("party_code"),
+                Party.name.label("party_name"),
+                TradeVoucher.voucher_number,
+                Transaction.reference_number,
+                Transaction.description,
+            )
+            .outerjoin(Party, Party.id == Transaction.party_id)
+            .outerjoin(TradeVoucher, TradeVoucher.id == Transaction.voucher_id)
+            .where(*date_range_conditions(Transaction.transaction_date, start_date, end_date))
+            .order_by(Transaction.transaction_date, Transaction.id)
+        )
+        if party_id:
+            query = query.where(Transaction.party_id == party_id)
+        return query
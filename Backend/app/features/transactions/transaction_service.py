@@ -8,34 +8,41 @@ from app.features.parties.party_repository import PartyRepository
 from app.features.parties.party_entity import Party
 from app.features.parties.party_schema import PartyUpdate
 from app.features.vouchers.voucher_repository import VoucherRepository
+from app.core.database import unit_of_work
+from app.features.dashboard.dashboard_service import DashboardService
+from app.core.pagination import Page
 from app.core.logger import logger
 
 class TransactionService:
     @staticmethod
     async def create_transaction(txn_in: TransactionCreate, user_id: Optional[int] = None) -> TransactionResponse:
-        # 1. Validate Party if provided
-        if txn_in.party_id:
-            party = await PartyRepository.get_by_id(txn_in.party_id)
-            if not party:
-                raise HTTPException(status_code=404, detail="Party not found")
-        
-        # 2. Validate Voucher if provided
-        if txn_in.voucher_id:
-            voucher = await VoucherRepository.get_by_id(txn_in.voucher_id)
-            if not voucher:
-                raise HTTPException(status_code=404, detail="Voucher not found")
-        
-        # 3. Create the Transaction Record
-        # We assume status is COMPLETED for now to affect balance immediately
-        new_txn = await TransactionRepository.create(txn_in, created_by=user_id)
-        
-        # 3. Update Party Balance (Ledger Logic)
-        # Assuming: Positive Balance = Receivable (Asset), Negative = Payable (Liability)
-        # This is a simplification. Usually separate Debit/Credit columns are used.
-        # But for 'Current Balance':
-        
-        if txn_in.party_id and new_txn.status == TransactionStatus.COMPLETED:
-            await TransactionService._update_party_balance(txn_in.party_id, txn_in.transaction_type, txn_in.amount)
+        # Joins the caller's unit of work (e.g. voucher issue) or opens its own
+        async with unit_of_work():
+            # 1. Validate Party if provided
+            if txn_in.party_id:
+                party = await PartyRepository.get_by_id(txn_in.party_id)
+                if not party:
+                    raise HTTPException(status_code=404, detail="Party not found")
+            
+            # 2. Validate Voucher if provided
+            if txn_in.voucher_id:
+                voucher = await VoucherRepository.get_by_id(txn_in.voucher_id)
+                if not voucher:
+                    raise HTTPException(status_code=404, detail="Voucher not found")
+            
+            # 3. Create the Transaction Record
+            # We assume status is COMPLETED for now to affect balance immediately
+            new_txn = await TransactionRepository.create(txn_in, created_by=user_id)
+            
+            # 3. Update Party Balance (Ledger Logic)
+            # Assuming: Positive Balance = Receivable (Asset), Negative = Payable (Liability)
+            # This is a simplification. Usually separate Debit/Credit columns are used.
+            # But for 'Current Balance':
+            
+            if txn_in.party_id and new_txn.status == TransactionStatus.COMPLETED:
+                await TransactionService._update_party_balance(txn_in.party_id, txn_in.transaction_type, txn_in.amount)
+        # When joined to an outer unit of work (voucher issue) that caller invalidates again after its commit
+        DashboardService.invalidate_cache()
         
         return TransactionResponse.model_validate(new_txn)
 
@@ -68,11 +75,13 @@ class TransactionService:
         logger.info(f"Updated Party {party.name} balance to {current_bal}")
 
     @staticmethod
-    async def get_all_transactions(skip: int = 0, limit: int = 100):
-        txns = await TransactionRepository.get_all(skip, limit)
-        return [TransactionResponse.model_validate(t) for t in txns]
+    async def get_all_transactions(cursor: Optional[str] = None, limit: int = 100, with_total: bool = False) -> Page[TransactionResponse]:
+        page = await TransactionRepository.get_all(cursor, limit, with_total)
+        page.items = [TransactionResponse.model_validate(t) for t in page.items]
+        return page
     
     @staticmethod
-    async def get_transactions_by_party(party_id: int, skip: int = 0, limit: int = 100):
-        txns = await TransactionRepository.get_by_party(party_id, skip, limit)
-        return [TransactionResponse.model_validate(t) for t in txns]
+    async def get_transactions_by_party(party_id: int, cursor: Optional[str] = None, limit: int = 100, with_total: bool = False) -> Page[TransactionResponse]:
+        page = await TransactionRepository.get_by_party(party_id, cursor, limit, with_total)
+        page.items = [TransactionResponse.model_validate(t) for t in page.items]
+        return page
@@ -1,15 +1,50 @@
+from datetime import date
 from typing import Optional, Sequence, List
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
-from app.core.database import SessionLocal
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.sql import Select
+from app.core.database import get_session
+from app.core.export import date_range_conditions
+from app.core.pagination import Page, fetch_page
+from app.core.projection import Expand, Fieldset, Include, schema_columns
+from app.features.dashboard.dashboard_rollup_repository import DailyRollupRepository
 from app.features.trips.trip_entity import Trip, TripExpense, TripStatus
-from app.features.trips.trip_schema import TripCreate, TripUpdate, TripExpenseCreate
+from app.features.fleet.fleet_entity import Vehicle, Driver
+from app.features.parties.party_entity import Party
+from app.features.fleet.fleet_repository import VEHICLE_SUMMARY, DRIVER_SUMMARY
+from app.features.parties.party_repository import PARTY_SUMMARY
+from app.features.trips.trip_schema import TripCreate, TripUpdate, TripExpenseCreate, TripResponse, TripExpenseResponse
 from app.core.logger import logger
 
+def _trip_columns() -> list:
+    """TripResponse fields as columns, with total_expense/net_profit computed in SQL and expense_count in place of the expenses."""
+    total_expense = Trip.diesel_expense + Trip.toll_expense + Trip.other_expense + Trip.market_truck_cost + Trip.driver_allowance
+    expense_count = (
+        select(func.count(TripExpense.id))
+        .where(TripExpense.trip_id == Trip.id)
+        .correlate(Trip)
+        .scalar_subquery()
+    )
+    return [
+        *schema_columns(Trip, TripResponse),
+        total_expense.label("total_expense"),
+        (Trip.freight_income - total_expense).label("net_profit"),
+        expense_count.label("expense_count"),
+    ]
+
+TRIP_FIELDS = Fieldset(_trip_columns(), includes={
+    "expenses": Include(TripExpense.trip_id, schema_columns(TripExpense, TripExpenseResponse), order_by=(TripExpense.id,)),
+}, expands={
+    "vehicle": Expand(Trip.vehicle_id, VEHICLE_SUMMARY),
+    "driver": Expand(Trip.driver_id, DRIVER_SUMMARY),
+    "supplier_party": Expand(Trip.supplier_party_id, PARTY_SUMMARY),
+    "customer_party": Expand(Trip.customer_party_id, PARTY_SUMMARY),
+})
+
 class TripRepository:
     @staticmethod
     async def create(trip_in: TripCreate) -> Trip:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_trip = Trip(**trip_in.model_dump())
                 if not db_trip.start_date:
@@ -22,31 +57,72 @@ class TripRepository:
                     select(Trip)
                     .options(selectinload(Trip.expenses))
                     .where(Trip.id == db_trip.id)
+                    .execution_options(populate_existing=True)
                 )
-                return result.scalar_one()
+                trip = result.scalar_one()
+                # After the re-fetch: start_date may have been the database's now()
+                await DailyRollupRepository.apply_trip(db, None, DailyRollupRepository.trip_snapshot(trip))
+                await db.commit()
+                return trip
             except Exception as e:
                 logger.error(f"Error creating trip: {e}")
                 await db.rollback()
                 raise
 
     @staticmethod
-    async def get_all(skip: int = 0, limit: int = 100, vehicle_id: Optional[int] = None) -> Sequence[Trip]:
-        async with SessionLocal() as db:
-            query = select(Trip).options(selectinload(Trip.expenses)).order_by(Trip.start_date.desc()).offset(skip).limit(limit)
+    async def get_all(
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        vehicle_id: Optional[int] = None,
+        with_total: bool = False,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Page[dict]:
+        """
+        One page of trips as dicts with the requested TRIP_FIELDS (all by default).
+        Expenses are only loaded with include="expenses", vehicle/driver/party summaries with expand.
+        """
+        keys = (Trip.start_date, Trip.id)
+        selection = TRIP_FIELDS.select(fields, include, expand, required=keys)
+        async with get_session(read_only=True) as db:
+            query = select(*selection.columns)
             if vehicle_id:
                 query = query.where(Trip.vehicle_id == vehicle_id)
-            result = await db.execute(query)
-            return result.scalars().all()
+            page = await fetch_page(db, query, keys, cursor, limit, with_total=with_total, mappings=True)
+            await selection.finish(db, page.items)
+            return page
+
+    @staticmethod
+    async def get_fields(
+        trip_id: int,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Optional[dict]:
+        """One trip as a dict with the requested TRIP_FIELDS, includes and expansions."""
+        selection = TRIP_FIELDS.select(fields, include, expand, required=(Trip.id,))
+        async with get_session(read_only=True) as db:
+            row = (await db.execute(select(*selection.columns).where(Trip.id == trip_id))).mappings().one_or_none()
+            if row is None:
+                return None
+            return (await selection.finish(db, [dict(row)]))[0]
+
+    @staticmethod
+    async def expand(trip: dict, expand: str) -> dict:
+        """Embed the `expand` summaries (TRIP_FIELDS expansions) into a full trip dict."""
+        async with get_session(read_only=True) as db:
+            return (await TRIP_FIELDS.expand(db, [trip], expand))[0]
 
     @staticmethod
     async def get_by_id(trip_id: int) -> Optional[Trip]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Trip).options(selectinload(Trip.expenses)).where(Trip.id == trip_id))
             return result.scalar_one_or_none()
     
     @staticmethod
     async def update(trip_id: int, trip_in: TripUpdate) -> Optional[Trip]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(
                 select(Trip)
                 .options(selectinload(Trip.expenses))
@@ -56,10 +132,12 @@ class TripRepository:
             if not db_trip:
                 return None
             
+            before = DailyRollupRepository.trip_snapshot(db_trip)
             update_data = trip_in.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(db_trip, key, value)
             
+            await DailyRollupRepository.apply_trip(db, before, DailyRollupRepository.trip_snapshot(db_trip))
             await db.commit()
             
             # Re-fetch with selectinload to ensure everything is loaded for the response
@@ -67,13 +145,14 @@ class TripRepository:
                 select(Trip)
                 .options(selectinload(Trip.expenses))
                 .where(Trip.id == db_trip.id)
+                .execution_options(populate_existing=True)
             )
             return result.scalar_one()
     
     # --- Expenses ---
     @staticmethod
     async def add_expense(trip_id: int, expense_in: TripExpenseCreate) -> TripExpense:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 # 1. Add Expense Record
                 db_exp = TripExpense(trip_id=trip_id, **expense_in.model_dump())
@@ -82,6 +161,7 @@ class TripRepository:
                 # 2. Update Aggregates on Trip Table for fast reporting
                 result = await db.execute(select(Trip).where(Trip.id == trip_id))
                 db_trip = result.scalar_one()
+                before = DailyRollupRepository.trip_snapshot(db_trip)
                 
                 exp_type = expense_in.expense_type.lower()
                 amount = expense_in.amount
@@ -93,6 +173,7 @@ class TripRepository:
                 else:
                     db_trip.other_expense += amount
                 
+                await DailyRollupRepository.apply_trip(db, before, DailyRollupRepository.trip_snapshot(db_trip))
                 await db.commit()
                 await db.refresh(db_exp)
                 return db_exp
@@ -103,13 +184,13 @@ class TripRepository:
 
     @staticmethod
     async def get_expenses(trip_id: int) -> Sequence[TripExpense]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(TripExpense).where(TripExpense.trip_id == trip_id))
             return result.scalars().all()
 
     @staticmethod
     async def update_location(trip_id: int, lat: float, lng: float) -> Optional[Trip]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Trip).where(Trip.id == trip_id))
             db_trip = result.scalar_one_or_none()
             if not db_trip:
@@ -126,10 +207,47 @@ class TripRepository:
     @staticmethod
     async def get_active_trip_by_driver(driver_id: int) -> Optional[Trip]:
         """Get the current in-transit trip for a driver."""
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(
                 select(Trip)
                 .where(Trip.driver_id == driver_id, Trip.status == TripStatus.IN_TRANSIT)
                 .order_by(Trip.updated_at.desc())
             )
             return result.scalars().first()
+
+    @staticmethod
+    def export_query(start_date: Optional[date] = None, end_date: Optional[date] = None, party_id: Optional[int] = None) -> Select:
+        """Trips with vehicle, driver and party names, for streaming exports."""
+        supplier = aliased(Party)
+        customer = aliased(Party)
+        query = (
+            select(
+                Trip.trip_number,
+                Trip.start_date,
+                Trip.end_date,
+                Trip.status,
+                Trip.source_location,
+                Trip.destination_location,
+                Vehicle.vehicle_number,
+                Driver.name.label("driver_name"),
+                supplier.name.label("supplier_name"),
+                customer.name.label("customer_name"),
+                Trip.start_km,
+                Trip.end_km,
+                Trip.freight_income,
+                Trip.market_truck_cost,
+                Trip.driver_allowance,
+                Trip.diesel_expense,
+                Trip.toll_expense,
+                Trip.other_expense,
+            )
+            .outerjoin(Vehicle, Vehicle.id == Trip.vehicle_id)
+            .outerjoin(Driver, Driver.id == Trip.driver_id)
+            .outerjoin(supplier, supplier.id == Trip.supplier_party_id)
+            .outerjoin(customer, customer.id == Trip.customer_party_id)
+            .where(*date_range_conditions(Trip.start_date, start_date, end_date))
+            .order_by(Trip.start_date, Trip.id)
+        )
+        if party_id:
+            query = query.where(or_(Trip.supplier_party_id == party_id, Trip.customer_party_id == party_id))
+        return query
@@ -1,9 +1,13 @@
 import asyncio
 from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
+from app.core.responses import APIResponse
 from typing import Optional
+from datetime import date
 from app.features.trips.trip_schema import TripCreate, TripUpdate, TripExpenseCreate
 from app.features.trips.trip_service import TripService
+from app.features.trips.trip_repository import TripRepository
+from app.core.export import ExportFormat, export_response
 from app.features.trips.trip_broadcaster import trip_broadcaster
 
 router = APIRouter(prefix="/trips", tags=["Logistics (Trips & Expenses)"])
@@ -15,35 +19,69 @@ async def create_trip(trip_in: TripCreate):
     Supports 'Direct Delivery' by linking Supplier and Customer directly.
     """
     trip = await TripService.create_trip(trip_in)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
-        content={"success": True, "message": "Trip started", "data": trip.model_dump(mode='json')}
+        content={"success": True, "message": "Trip started", "data": trip}
     )
 
 @router.get("/")
-async def list_trips(skip: int = 0, limit: int = 100, vehicle_id: Optional[int] = None):
-    trips = await TripService.get_all_trips(skip, limit, vehicle_id)
-    return JSONResponse(
+async def list_trips(
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    vehicle_id: Optional[int] = None,
+    with_total: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    expand: Optional[str] = None
+):
+    """
+    List trips, newest first. Pass `pagination.next_cursor` back as `cursor` for the next page.
+    `fields=id,trip_number,status,net_profit` returns only those fields; `include=expenses` nests each trip's expenses.
+    `expand=vehicle,driver,supplier_party,customer_party` embeds summaries of the referenced records.
+    """
+    page = await TripService.get_all_trips(cursor, limit, vehicle_id, with_total, fields, include, expand)
+    return APIResponse(
         content={
             "success": True,
-            "message": f"Retrieved {len(trips)} trips",
-            "data": [t.model_dump(mode='json') for t in trips]
+            "message": f"Retrieved {len(page.items)} trips",
+            "data": page.items,
+            "pagination": page.envelope(limit)
         }
     )
 
+@router.get("/export")
+async def export_trips(
+    format: ExportFormat = ExportFormat.CSV,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    party_id: Optional[int] = None
+):
+    """Stream trips as CSV or NDJSON, filtered by start date (inclusive) and supplier/customer party."""
+    query = TripRepository.export_query(start_date, end_date, party_id)
+    return export_response(query, format, "trips")
+
 @router.get("/{trip_id}")
-async def get_trip_detail(trip_id: int):
-    trip = await TripService.get_trip(trip_id)
-    return JSONResponse(
-        content={"success": True, "message": "Trip retrieved", "data": trip.model_dump(mode='json')}
+async def get_trip_detail(trip_id: int, fields: Optional[str] = None, include: Optional[str] = None, expand: Optional[str] = None):
+    """
+    The full trip with its expenses; `expand` alone embeds its summaries on top.
+    With `fields` / `include`, only the requested fields and collections (plus any `expand`).
+    """
+    if fields or include:
+        trip = await TripService.get_trip_fields(trip_id, fields, include, expand)
+    elif expand:
+        trip = await TripService.get_trip_expanded(trip_id, expand)
+    else:
+        trip = await TripService.get_trip(trip_id)
+    return APIResponse(
+        content={"success": True, "message": "Trip retrieved", "data": trip}
     )
 
 @router.patch("/{trip_id}")
 async def update_trip(trip_id: int, trip_in: TripUpdate):
     """Close trip, update readings, or update financials."""
     trip = await TripService.update_trip(trip_id, trip_in)
-    return JSONResponse(
-        content={"success": True, "message": "Trip updated", "data": trip.model_dump(mode='json')}
+    return APIResponse(
+        content={"success": True, "message": "Trip updated", "data": trip}
     )
 
 @router.post("/{trip_id}/expenses")
@@ -53,8 +91,8 @@ async def add_trip_expense(trip_id: int, expense_in: TripExpenseCreate):
     Automatically updates the Trip's profit calculation.
     """
     exp = await TripService.add_expense(trip_id, expense_in)
-    return JSONResponse(
-        content={"success": True, "message": "Expense added", "data": exp.model_dump(mode='json')}
+    return APIResponse(
+        content={"success": True, "message": "Expense added", "data": exp}
     )
 
 @router.get("/{trip_id}/tracking-stream")
@@ -2,10 +2,17 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from jose import jwt
 from passlib.context import CryptContext
+from app.core.bounded_executor import BoundedExecutor
 from app.core.config import settings
+from app.core.token_cache import ReissuedTokenCache, VerifiedTokenCache
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt releases the GIL, so threads hash in parallel while the event loop keeps serving
+password_executor = BoundedExecutor("password hashing", settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+_verified_tokens = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE)
+_reissued_tokens = ReissuedTokenCache(settings.TOKEN_REISSUE_WINDOW_SECONDS)
 
 class AuthHelper:
     @staticmethod
@@ -18,6 +25,16 @@ class AuthHelper:
         """Verify a plain password against a hashed password."""
         return pwd_context.verify(plain_password, hashed_password)
 
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """hash_password on password_executor; use this from request handlers."""
+        return await password_executor.run(pwd_context.hash, password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """verify_password on password_executor; use this from request handlers."""
+        return await password_executor.run(pwd_context.verify, plain_password, hashed_password)
+
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Generate a JWT access token."""
@@ -27,15 +44,31 @@ class AuthHelper:
         else:
             expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         
-        to_encode.update({"exp": expire})
+        # Sub-second `iat` so a login right after a revocation isn't caught by it
+        to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc).timestamp()})
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
+    @staticmethod
+    def refresh_access_token(payload: dict) -> str:
+        """
+        A token with a fresh expiry for the same claims (sliding session).
+        Reuses the one issued for this user within TOKEN_REISSUE_WINDOW_SECONDS,
+        so concurrent requests of one session don't each sign a new token.
+        """
+        claims = {key: value for key, value in payload.items() if key not in ("exp", "iat")}
+        user = claims.get("id", claims.get("sub"))
+        return _reissued_tokens.get_or_issue(user, claims, AuthHelper.create_access_token)
+
     @staticmethod
     def decode_token(token: str) -> Optional[dict]:
-        """Decode a JWT token."""
+        """Decode a JWT token. Signatures are verified once per token, then served from the cache until `exp`."""
+        payload = _verified_tokens.get(token)
+        if payload is not None:
+            return payload
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            return payload
         except Exception:
             return None
+        _verified_tokens.put(token, payload)
+        return payload
@@ -1,14 +1,15 @@
+from datetime import datetime
 from typing import Optional, List, Sequence
-from sqlalchemy import select, update, delete
+from sqlalchemy import case, or_, select, update, delete
 from app.features.users.user_entity import User
 from app.features.users.user_schema import UserCreate, UserUpdate
 from app.core.logger import logger
-from app.core.database import SessionLocal
+from app.core.database import get_session
 
 class UserRepository:
     @staticmethod
     async def create(user_in: UserCreate, hashed_password: str, require_password_change: bool = True) -> User:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_user = User(
                     username=user_in.username,
@@ -34,7 +35,7 @@ class UserRepository:
 
     @staticmethod
     async def get_by_id(user_id: int) -> Optional[User]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.id == user_id))
                 user = result.scalar_one_or_none()
@@ -47,7 +48,7 @@ class UserRepository:
 
     @staticmethod
     async def get_by_username(username: str) -> Optional[User]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.username == username))
                 user = result.scalar_one_or_none()
@@ -60,7 +61,7 @@ class UserRepository:
 
     @staticmethod
     async def get_by_email(email: str) -> Optional[User]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.email == email))
                 user = result.scalar_one_or_none()
@@ -73,7 +74,7 @@ class UserRepository:
 
     @staticmethod
     async def get_multi(skip: int = 0, limit: int = 100) -> Sequence[User]:
-        async with SessionLocal() as db:
+        async with get_session(read_only=True) as db:
             try:
                 result = await db.execute(select(User).offset(skip).limit(limit))
                 users = result.scalars().all()
@@ -85,7 +86,7 @@ class UserRepository:
 
     @staticmethod
     async def update(user_id: int, user_in: UserUpdate) -> Optional[User]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.id == user_id))
                 db_user = result.scalar_one_or_none()
@@ -107,7 +108,7 @@ class UserRepository:
 
     @staticmethod
     async def delete(user_id: int) -> bool:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(delete(User).where(User.id == user_id))
                 await db.commit()
@@ -123,26 +124,62 @@ class UserRepository:
                 raise
 
     @staticmethod
-    async def update_last_login(user_id: int, ip_address: Optional[str] = None) -> None:
-        async with SessionLocal() as db:
+    async def record_login_success(user_id: int, now: datetime, ip_address: Optional[str] = None) -> Optional[User]:
+        """
+        Clear failed attempts and stamp the login in one UPDATE ... RETURNING.
+        Returns None if the account is locked at `now` (e.g. a parallel failed attempt
+        locked it after it was read), so a lockout can't be raced past.
+        """
+        async with get_session() as db:
             try:
-                from datetime import datetime
-                await db.execute(
+                result = await db.execute(
+                    update(User)
+                    .where(User.id == user_id, or_(User.lockout_until.is_(None), User.lockout_until <= now))
+                    .values(failed_login_attempts=0, lockout_until=None, last_login=datetime.now(), last_ip=ip_address)
+                    .returning(User)
+                )
+                user = result.scalar_one_or_none()
+                await db.commit()
+                if user:
+                    logger.info(f"Updated last login for user ID {user_id} from IP {ip_address}")
+                return user
+            except Exception as e:
+                logger.error(f"Error recording login for user {user_id}: {str(e)}")
+                await db.rollback()
+                raise
+
+    @staticmethod
+    async def record_login_failure(user_id: int, max_attempts: int, lockout_until: datetime) -> int:
+        """
+        Count a failed attempt and, once the count reaches `max_attempts`, set the lockout,
+        in one atomic UPDATE ... RETURNING. Returns the new count (0 if the user is gone).
+        """
+        async with get_session() as db:
+            try:
+                attempts = User.failed_login_attempts + 1
+                result = await db.execute(
                     update(User)
                     .where(User.id == user_id)
-                    .values(last_login=datetime.now(), last_ip=ip_address)
+                    .values(
+                        failed_login_attempts=attempts,
+                        lockout_until=case((attempts >= max_attempts, lockout_until), else_=User.lockout_until),
+                    )
+                    .returning(User.failed_login_attempts)
                 )
+                count = result.scalar_one_or_none() or 0
                 await db.commit()
-                logger.info(f"Updated last login for user ID {user_id} from IP {ip_address}")
+                if count >= max_attempts:
+                    logger.warning(f"User ID {user_id} locked out until {lockout_until}")
+                return count
             except Exception as e:
-                logger.error(f"Error updating last login for user {user_id}: {str(e)}")
+                logger.error(f"Error recording failed login for user {user_id}: {str(e)}")
                 await db.rollback()
                 raise
 
     @staticmethod
     async def update_password(user_id: int, new_hashed_password: str):
         """Update user password and clear password_change_required flag."""
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.id == user_id))
                 user = result.scalar_one_or_none()
@@ -157,57 +194,9 @@ class UserRepository:
                 raise
 
     @staticmethod
-    async def increment_failed_login(user_id: int) -> int:
-        async with SessionLocal() as db:
-            try:
-                result = await db.execute(select(User).where(User.id == user_id))
-                user = result.scalar_one_or_none()
-                if not user:
-                    return 0
-                
-                user.failed_login_attempts += 1
-                await db.commit()
-                await db.refresh(user)
-                return user.failed_login_attempts
-            except Exception as e:
-                logger.error(f"Error incrementing failed attempts for user {user_id}: {str(e)}")
-                await db.rollback()
-                raise
-
-    @staticmethod
-    async def reset_failed_login(user_id: int) -> None:
-        async with SessionLocal() as db:
-            try:
-                await db.execute(
-                    update(User)
-                    .where(User.id == user_id)
-                    .values(failed_login_attempts=0, lockout_until=None)
-                )
-                await db.commit()
-            except Exception as e:
-                logger.error(f"Error resetting failed attempts for user {user_id}: {str(e)}")
-                await db.rollback()
-                raise
-
-    @staticmethod
-    async def lockout_user(user_id: int, lockout_until) -> None:
-        async with SessionLocal() as db:
-            try:
-                await db.execute(
-                    update(User)
-                    .where(User.id == user_id)
-                    .values(lockout_until=lockout_until)
-                )
-                await db.commit()
-                logger.warning(f"User ID {user_id} locked out until {lockout_until}")
-            except Exception as e:
-                logger.error(f"Error locking out user {user_id}: {str(e)}")
-                await db.rollback()
-                raise
-    @staticmethod
     async def get_admins_with_telegram() -> List[str]:
         """Fetch all chat IDs for admins who have a telegram_chat_id set."""
-        async with SessionLocal() as db:
+        async with get_session() as db:
             from app.features.users.user_entity import UserRole
             try:
                 # Assuming UserRole.ADMIN is the role to notify
@@ -224,7 +213,7 @@ class UserRepository:
     @staticmethod
     async def link_telegram_user(phone_number: str, chat_id: str) -> bool:
         """Link a telegram chat_id to a user found by phone number."""
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 # Standardize phone number? Assuming exact match for now or basic strip
                 # User.phone_number usually stored as is.
@@ -246,7 +235,7 @@ class UserRepository:
     @staticmethod
     async def get_by_telegram_chat_id(chat_id: str):
         """Get user by their Telegram chat ID."""
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.telegram_chat_id == chat_id))
                 return result.scalar_one_or_none()
@@ -257,7 +246,7 @@ class UserRepository:
     @staticmethod
     async def get_by_phone(phone: str) -> Optional[User]:
         """Get user by their phone number."""
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(User).where(User.phone_number == phone))
                 return result.scalar_one_or_none()
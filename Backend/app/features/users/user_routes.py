@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from typing import List
 from app.features.users.user_schema import UserResponse, UserCreate, ChangePasswordRequest
 from app.features.users.user_service import UserService
@@ -12,12 +12,12 @@ router = APIRouter(prefix="/users", tags=["Users"])
 async def register(user_in: UserCreate):
     """Register a new user with default password."""
     user = await AuthService.register_user(user_in, require_password_change=True)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "success": True,
             "message": f"User registered successfully.",
-            "data": user.model_dump(mode='json')
+            "data": user
         }
     )
 
@@ -25,11 +25,11 @@ async def register(user_in: UserCreate):
 async def get_all_users(skip: int = 0, limit: int = 100):
     """Get all users with pagination."""
     users = await UserService.get_all_users(skip=skip, limit=limit)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": f"Retrieved {len(users)} users",
-            "data": [user.model_dump(mode='json') for user in users],
+            "data": users,
             "pagination": {"skip": skip, "limit": limit, "count": len(users)}
         }
     )
@@ -38,11 +38,11 @@ async def get_all_users(skip: int = 0, limit: int = 100):
 async def get_user_profile(user_id: int):
     """Get user profile by ID."""
     user = await UserService.get_user_by_id(user_id)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": "User retrieved successfully",
-            "data": user.model_dump(mode='json')
+            "data": user
         }
     )
 
@@ -50,11 +50,11 @@ async def get_user_profile(user_id: int):
 async def activate_user(user_id: int):
     """Activate user by ID."""
     user = await UserService.activate_user(user_id)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": f"User '{user.username}' activated successfully",
-            "data": user.model_dump(mode='json')
+            "data": user
         }
     )
 
@@ -62,11 +62,11 @@ async def activate_user(user_id: int):
 async def deactivate_user(user_id: int):
     """Deactivate user by ID."""
     user = await UserService.deactivate_user(user_id)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": f"User '{user.username}' deactivated successfully",
-            "data": user.model_dump(mode='json')
+            "data": user
         }
     )
 
@@ -79,7 +79,7 @@ async def change_password(request: ChangePasswordRequest):
         request.new_password
     )
     
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True,
             "message": "Password changed successfully. Please login with your new password.",
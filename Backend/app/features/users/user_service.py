@@ -2,6 +2,8 @@ from fastapi import HTTPException, status
 from app.features.users.user_repository import UserRepository
 from app.features.users.user_schema import UserResponse, UserUpdate
 from app.features.users.user_helper import AuthHelper
+from app.features.auth.auth_dependencies import active_user_cache
+from app.features.auth.auth_revocation import revoked_tokens
 from typing import List
 from app.core.logger import logger
 
@@ -30,6 +32,7 @@ class UserService:
                 detail="User not found"
             )
         updated_user = await UserRepository.update(user_id, UserUpdate(active=True))
+        active_user_cache.invalidate(user_id)
         return UserResponse.model_validate(updated_user)
     
     @staticmethod
@@ -41,6 +44,9 @@ class UserService:
                 detail="User not found"
             )
         updated_user = await UserRepository.update(user_id, UserUpdate(active=False))
+        active_user_cache.invalidate(user_id)
+        # Live sessions end now rather than when their tokens expire
+        await revoked_tokens.revoke(user_id)
         return UserResponse.model_validate(updated_user)
 
     @staticmethod
@@ -55,17 +61,19 @@ class UserService:
             )
         
         # Verify old password
-        if not AuthHelper.verify_password(old_password, user.hashed_password):
+        if not await AuthHelper.verify_password_async(old_password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Current password is incorrect"
             )
         
         # Hash new password
-        new_hashed_password = AuthHelper.hash_password(new_password)
+        new_hashed_password = await AuthHelper.hash_password_async(new_password)
         
         # Update password and clear password_change_required flag
         await UserRepository.update_password(user.id, new_hashed_password)
+        active_user_cache.invalidate(user.id)
+        await revoked_tokens.revoke(user.id)
         
         logger.info(f"Password changed successfully for user: {username}")
         
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime, date
 from typing import Optional, List
-from sqlalchemy import String, Boolean, DateTime, Date, func, Enum, Float, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, Date, func, Enum, Float, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -18,13 +18,23 @@ class VoucherStatus(str, enum.Enum):
 
 class TradeVoucher(Base):
     __tablename__ = "trade_vouchers"
+    __table_args__ = (
+        Index("ix_trade_vouchers_type_status_date", "voucher_type", "status", "voucher_date"),
+        Index("ix_trade_vouchers_type_created_at", "voucher_type", "created_at"),
+        # Dashboard sums only ever look at issued vouchers
+        Index(
+            "ix_trade_vouchers_issued_type_date", "voucher_type", "voucher_date",
+            postgresql_where=text("status = 'ISSUED'"),
+            sqlite_where=text("status = 'ISSUED'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     voucher_number: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
     voucher_type: Mapped[VoucherType] = mapped_column(Enum(VoucherType), default=VoucherType.CHALLAN)
     voucher_date: Mapped[date] = mapped_column(Date, nullable=False)
     
-    party_id: Mapped[int] = mapped_column(ForeignKey("parties.id"), nullable=False)
+    party_id: Mapped[int] = mapped_column(ForeignKey("parties.id"), nullable=False, index=True)
     trip_id: Mapped[Optional[int]] = mapped_column(ForeignKey("trips.id"))
     
     vehicle_number: Mapped[Optional[str]] = mapped_column(String(20))
@@ -39,7 +49,7 @@ class TradeVoucher(Base):
     approved_by_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
     notes: Mapped[Optional[str]] = mapped_column(String(500))
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationship to items
@@ -59,7 +69,7 @@ class VoucherItem(Base):
     __tablename__ = "voucher_items"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    voucher_id: Mapped[int] = mapped_column(ForeignKey("trade_vouchers.id"), nullable=False)
+    voucher_id: Mapped[int] = mapped_column(ForeignKey("trade_vouchers.id"), nullable=False, index=True)
     item_id: Mapped[int] = mapped_column(ForeignKey("items.id"), nullable=False)
     
     quantity: Mapped[float] = mapped_column(Float, nullable=False)
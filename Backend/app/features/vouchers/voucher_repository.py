@@ -1,15 +1,58 @@
-from typing import Optional, Sequence
-from sqlalchemy import select
+from datetime import date
+from typing import Optional
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload, joinedload
-from app.core.database import SessionLocal
-from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem, VoucherType
-from app.features.vouchers.voucher_schema import VoucherCreate
+from sqlalchemy.sql import Select
+from app.core.database import get_session
+from app.core.export import date_range_conditions
+from app.core.pagination import Page, fetch_page
+from app.core.projection import Expand, Fieldset, Include, schema_columns
+from app.features.dashboard.dashboard_rollup_repository import DailyRollupRepository
+from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem, VoucherType, VoucherStatus
+from app.features.parties.party_entity import Party
+from app.features.inventory.inventory_entity import Item
+from app.features.users.user_entity import User
+from app.features.inventory.inventory_repository import ITEM_SUMMARY
+from app.features.parties.party_repository import PARTY_SUMMARY
+from app.features.vouchers.voucher_schema import VoucherCreate, VoucherResponse, VoucherItemResponse
 from app.core.logger import logger
 
+def _voucher_columns() -> list:
+    """VoucherResponse fields as columns, with item_count in place of the line items and the approver's name joined in."""
+    item_count = (
+        select(func.count(VoucherItem.id))
+        .where(VoucherItem.voucher_id == TradeVoucher.id)
+        .correlate(TradeVoucher)
+        .scalar_subquery()
+    )
+    return [
+        *schema_columns(TradeVoucher, VoucherResponse),
+        item_count.label("item_count"),
+        # Same fallback as TradeVoucher.approved_by_name
+        func.coalesce(func.nullif(User.full_name, ""), User.username).label("approved_by_name"),
+    ]
+
+VOUCHER_FIELDS = Fieldset(_voucher_columns(), includes={
+    "items": Include(
+        VoucherItem.voucher_id,
+        schema_columns(VoucherItem, VoucherItemResponse),
+        order_by=(VoucherItem.id,),
+        expands={"item": Expand(VoucherItem.item_id, ITEM_SUMMARY)},
+    ),
+}, expands={
+    "party": Expand(TradeVoucher.party_id, PARTY_SUMMARY),
+})
+
+def _select_vouchers(selection) -> Select:
+    query = select(*selection.columns).select_from(TradeVoucher)
+    if selection.uses("approved_by_name"):
+        query = query.outerjoin(User, TradeVoucher.approved_by_id == User.id)
+    return query
+
 class VoucherRepository:
     @staticmethod
     async def create(voucher_in: VoucherCreate) -> TradeVoucher:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 # Create Header
                 db_voucher = TradeVoucher(
@@ -43,12 +86,14 @@ class VoucherRepository:
                     )
                     db.add(db_item)
                 
+                await DailyRollupRepository.apply_voucher(db, None, DailyRollupRepository.voucher_snapshot(db_voucher))
                 await db.commit()
-                # Reload with items
+                # Reload with items (populate_existing: the session may be shared by a unit of work)
                 result = await db.execute(
                     select(TradeVoucher)
                     .options(selectinload(TradeVoucher.items), joinedload(TradeVoucher.approver))
                     .where(TradeVoucher.id == db_voucher.id)
+                    .execution_options(populate_existing=True)
                 )
                 return result.scalar_one()
             except Exception as e:
@@ -58,7 +103,7 @@ class VoucherRepository:
 
     @staticmethod
     async def get_by_id(voucher_id: int) -> Optional[TradeVoucher]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(
                 select(TradeVoucher)
                 .options(selectinload(TradeVoucher.items), joinedload(TradeVoucher.approver))
@@ -67,18 +112,101 @@ class VoucherRepository:
             return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_all(skip: int = 0, limit: int = 100, voucher_type: Optional[VoucherType] = None) -> Sequence[TradeVoucher]:
-        async with SessionLocal() as db:
-             query = select(TradeVoucher).options(selectinload(TradeVoucher.items), joinedload(TradeVoucher.approver)).order_by(TradeVoucher.created_at.desc()).offset(skip).limit(limit)
+    async def get_all(
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        voucher_type: Optional[VoucherType] = None,
+        with_total: bool = False,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Page[dict]:
+        """
+        One page of vouchers as dicts with the requested VOUCHER_FIELDS (all by default).
+        Line items are only loaded with include="items" (or expand="items.item"), the party summary
+        with expand="party"; the approver is only joined for approved_by_name.
+        """
+        keys = (TradeVoucher.created_at, TradeVoucher.id)
+        selection = VOUCHER_FIELDS.select(fields, include, expand, required=keys)
+        async with get_session(read_only=True) as db:
+             query = _select_vouchers(selection)
              if voucher_type:
                  query = query.where(TradeVoucher.voucher_type == voucher_type)
-             
-             result = await db.execute(query)
-             return result.scalars().all()
+             page = await fetch_page(db, query, keys, cursor, limit, with_total=with_total, mappings=True)
+             await selection.finish(db, page.items)
+             return page
+
+    @staticmethod
+    async def get_fields(
+        voucher_id: int,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Optional[dict]:
+        """One voucher as a dict with the requested VOUCHER_FIELDS, includes and expansions."""
+        selection = VOUCHER_FIELDS.select(fields, include, expand, required=(TradeVoucher.id,))
+        async with get_session(read_only=True) as db:
+            query = _select_vouchers(selection).where(TradeVoucher.id == voucher_id)
+            row = (await db.execute(query)).mappings().one_or_none()
+            if row is None:
+                return None
+            return (await selection.finish(db, [dict(row)]))[0]
+
+    @staticmethod
+    async def expand(voucher: dict, expand: str) -> dict:
+        """Embed the `expand` summaries (VOUCHER_FIELDS expansions) into a full voucher dict."""
+        async with get_session(read_only=True) as db:
+            return (await VOUCHER_FIELDS.expand(db, [voucher], expand))[0]
+
+    @staticmethod
+    def export_query(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        party_id: Optional[int] = None,
+        voucher_type: Optional[VoucherType] = None,
+        status: Optional[VoucherStatus] = None,
+    ) -> Select:
+        """Vouchers flattened to one row per line item, for streaming exports."""
+        query = (
+            select(
+                TradeVoucher.voucher_number,
+                TradeVoucher.voucher_type,
+                TradeVoucher.voucher_date,
+                TradeVoucher.status,
+                Party.code.label("party_code"),
+                Party.name.label("party_name"),
+                Party.gstin.label("party_gstin"),
+                TradeVoucher.place_of_supply,
+                TradeVoucher.vehicle_number,
+                Item.code.label("item_code"),
+                Item.name.label("item_name"),
+                Item.hsn_code,
+                Item.unit,
+                VoucherItem.quantity,
+                VoucherItem.rate,
+                VoucherItem.tax_rate,
+                VoucherItem.amount.label("line_amount"),
+                TradeVoucher.total_amount,
+                TradeVoucher.tax_amount,
+                TradeVoucher.grand_total,
+            )
+            .join(Party, Party.id == TradeVoucher.party_id)
+            .outerjoin(VoucherItem, VoucherItem.voucher_id == TradeVoucher.id)
+            .outerjoin(Item, Item.id == VoucherItem.item_id)
+            .where(*date_range_conditions(TradeVoucher.voucher_date, start_date, end_date))
+            .order_by(TradeVoucher.voucher_date, TradeVoucher.id, VoucherItem.id)
+        )
+        if party_id:
+            query = query.where(TradeVoucher.party_id == party_id)
+        if voucher_type:
+            query = query.where(TradeVoucher.voucher_type == voucher_type)
+        if status:
+            query = query.where(TradeVoucher.status == status)
+        return query
 
     @staticmethod
     async def update(voucher_id: int, status: Optional[str] = None, notes: Optional[str] = None, approved_by_id: Optional[int] = None) -> Optional[TradeVoucher]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(
                 select(TradeVoucher)
                 .options(selectinload(TradeVoucher.items))
@@ -88,6 +216,7 @@ class VoucherRepository:
             if not db_voucher:
                 return None
             
+            before = DailyRollupRepository.voucher_snapshot(db_voucher)
             if status:
                 db_voucher.status = status
             if notes:
@@ -95,6 +224,7 @@ class VoucherRepository:
             if approved_by_id:
                 db_voucher.approved_by_id = approved_by_id
                 
+            await DailyRollupRepository.apply_voucher(db, before, DailyRollupRepository.voucher_snapshot(db_voucher))
             await db.commit()
             
             # Re-fetch with items and approver
@@ -102,5 +232,6 @@ class VoucherRepository:
                 select(TradeVoucher)
                 .options(selectinload(TradeVoucher.items), joinedload(TradeVoucher.approver))
                 .where(TradeVoucher.id == voucher_id)
+                .execution_options(populate_existing=True)
             )
             return final_result.scalar_one()
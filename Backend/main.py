@@ -2,11 +2,15 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import init_db
+from app.core.database import init_db, close_db
 from app.core.logger import setup_logging, logger
 from app.core.config import settings
+from app.core.responses import APIResponse
+from app.core.role_mapping import ROLE_POLICY
+from app.core.role_policy import registered_routes
+from app.core.ttl_cache import cache_stats
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.features.auth.auth_routes import router as auth_router
@@ -26,7 +30,12 @@ from app.core.exceptions import (
     validation_exception_handler,
     global_exception_handler
 )
+from app.features.auth.auth_dependencies import get_admin_user
+from app.features.auth.auth_revocation import revoked_tokens
+from app.features.users.user_helper import password_executor
 from app.features.middleware.auth_middleware import AuthMiddleware
+from app.features.middleware.db_metrics_middleware import DBMetricsMiddleware
+from app.features.middleware.rate_limit_middleware import RateLimitMiddleware, rate_limit_stats
 
 # Setup logging configuration
 setup_logging()
@@ -42,8 +51,14 @@ app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, global_exception_handler)
 
-# Add Middleware
-# CORS Middleware (Must be added before other middleware usually, but FastAPI handles it well)
+# Add Middleware (each one added wraps the ones before it)
+app.add_middleware(AuthMiddleware)
+# Ahead of auth, the DB and bcrypt: throttled login attempts cost almost nothing
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+# Outside auth and the rate limiter, so their 401/413/429 responses carry the CORS
+# headers too (a browser otherwise sees a network error and can't read Retry-After),
+# and preflight requests are answered before either runs
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -52,7 +67,8 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
     expose_headers=settings.CORS_EXPOSE_HEADERS,
 )
-app.add_middleware(AuthMiddleware)
+# Outermost, so the counts cover everything the request does
+app.add_middleware(DBMetricsMiddleware)
 
 @app.on_event("startup")
 async def startup_event():
@@ -63,11 +79,23 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutting down...")
+    await close_db()
 
 @app.get("/")
 async def root():
     return {"message": f"Welcome to {settings.PROJECT_NAME} API"}
 
+@app.get("/api/metrics")
+async def metrics(admin: dict = Depends(get_admin_user)):
+    """In-process cache, executor, rate limit and revocation counters. Each worker / serverless instance reports its own."""
+    data = {
+        "caches": cache_stats(),
+        "password_hashing": password_executor.stats(),
+        "rate_limits": rate_limit_stats(),
+        "token_revocations": revoked_tokens.stats(),
+    }
+    return APIResponse(content={"success": True, "message": "Metrics retrieved", "data": data})
+
 # Register Routers
 app.include_router(auth_router, prefix="/api")
 app.include_router(user_router, prefix="/api")
@@ -82,6 +110,9 @@ app.include_router(chat_router, prefix="/api")
 app.include_router(notification_router, prefix="/api")
 app.include_router(telegram_router, prefix="/api")
 
+# Fail the boot if ROLE_MAPPING names a missing route or would govern the wrong one
+ROLE_POLICY.validate(registered_routes(app.routes))
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=False, reload_dirs=["."], reload_excludes=["logs", "logs/*", "*.log", "*.db", "trading_system.db", "*.db-journal", "*.db-wal", ".git", "__pycache__"])
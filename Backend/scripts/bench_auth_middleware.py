@@ -0,0 +1,176 @@
+"""
+Auth middleware throughput: BaseHTTPMiddleware (how AuthMiddleware worked before) vs
+the pure ASGI AuthMiddleware.
+
+Both wrap the same minimal app, so the numbers are middleware overhead only:
+  - GET /api/ping       a small JSON response
+  - GET /api/stream     a StreamingResponse of --chunks chunks (like the SSE endpoint)
+  - GET /api/ping (refresh)  with a token past half its life, so each response carries a new token
+Each case reports sequential per-request latency (--iterations calls) and throughput
+(--requests requests from --concurrency concurrent clients). Before timing, both
+middlewares are checked to give the same status, body and refresh header for public,
+missing-token, bad-token, forbidden and allowed requests.
+
+Usage:
+    python scripts/bench_auth_middleware.py [--iterations 2000] [--requests 5000] [--concurrency 50] [--chunks 20]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from bench_utils import asgi_client, format_summary, time_async
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.core.responses import APIResponse
+from app.core.role_mapping import ROLE_POLICY
+from app.features.middleware.auth_middleware import AuthMiddleware
+from app.features.users.user_helper import AuthHelper
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """The previous AuthMiddleware.dispatch, condensed (same checks, same order)."""
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        path = request.url.path
+        if path.startswith("/api/telegram") or "tracking-stream" in path:
+            return await call_next(request)
+        for route in settings.PUBLIC_ROUTES:
+            if path == route or path.startswith(route + "/"):
+                return await call_next(request)
+
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return _error("Missing or invalid authentication token")
+        payload = AuthHelper.decode_token(auth_header.split(" ")[1])
+        if not payload:
+            return _error("Invalid or expired token")
+        user_role = payload.get("role")
+        if not user_role:
+            return _error("Token missing role information", status.HTTP_403_FORBIDDEN)
+
+        # Role lookup shared with AuthMiddleware (ROLE_MAPPING is no longer regex-keyed)
+        allowed_roles = ROLE_POLICY.allowed_roles(request.method, path)
+        if allowed_roles is not None and user_role not in allowed_roles:
+            return _error(f"Access denied. Role '{user_role}' required for this resource.", status.HTTP_403_FORBIDDEN)
+
+        request.state.user = payload
+        response = await call_next(request)
+
+        exp_timestamp = payload.get("exp")
+        if exp_timestamp:
+            time_left = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc) - datetime.now(timezone.utc)
+            if time_left < timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES / 2):
+                new_payload = payload.copy()
+                del new_payload["exp"]
+                response.headers["Authorization"] = f"Bearer {AuthHelper.create_access_token(new_payload)}"
+        return response
+
+def _error(message: str, status_code: int = status.HTTP_401_UNAUTHORIZED):
+    return JSONResponse(status_code=status_code, content={"success": False, "message": message, "data": None})
+
+def build_app(middleware, chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping(request: Request):
+        return APIResponse(content={"success": True, "message": "pong", "data": {"user": request.state.user["sub"]}})
+
+    @app.get("/api/stream")
+    async def stream():
+        async def events():
+            for n in range(chunks):
+                yield f"data: {n}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/api/trips/export")
+    async def export_trips():
+        return APIResponse(content={"success": True, "message": "export", "data": None})
+
+    @app.post("/api/auth/login")
+    async def login():
+        return APIResponse(content={"success": True, "message": "public", "data": None})
+
+    app.add_middleware(middleware)
+    return app
+
+def bearer(role: str = "admin", minutes: float = None) -> dict:
+    expires = timedelta(minutes=minutes) if minutes is not None else None
+    return {"Authorization": f"Bearer {AuthHelper.create_access_token({'sub': 'bench', 'id': 1, 'role': role}, expires)}"}
+
+# A token with 20% of the session left: past the refresh threshold
+def stale_bearer() -> dict:
+    return bearer(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 0.2)
+
+CHECKS = [
+    ("public route", "POST", "/api/auth/login", {}),
+    ("missing token", "GET", "/api/ping", {}),
+    ("bad token", "GET", "/api/ping", {"Authorization": "Bearer nope"}),
+    ("role denied", "GET", "/api/trips/export", bearer("driver")),
+    ("role allowed", "GET", "/api/trips/export", bearer("manager")),
+    ("fresh token", "GET", "/api/ping", bearer()),
+    ("stale token", "GET", "/api/ping", stale_bearer()),
+    ("stream", "GET", "/api/stream", bearer()),
+]
+
+async def check_same_behaviour(legacy: FastAPI, current: FastAPI) -> bool:
+    ok = True
+    async with asgi_client(legacy) as old, asgi_client(current) as new:
+        for name, method, path, headers in CHECKS:
+            a = await old.request(method, path, headers=headers)
+            b = await new.request(method, path, headers=headers)
+            same = (a.status_code, a.content, "authorization" in a.headers) == (b.status_code, b.content, "authorization" in b.headers)
+            ok &= same
+            print(f"  {name:<14} {a.status_code} / {b.status_code}  refreshed={'authorization' in b.headers!s:<5} {'ok' if same else 'MISMATCH'}")
+    return ok
+
+async def run_case(app: FastAPI, path: str, headers: dict, iterations: int, requests: int, concurrency: int):
+    async with asgi_client(app) as client:
+        async def call():
+            (await client.get(path, headers=headers)).raise_for_status()
+
+        samples = await time_async(call, iterations)
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                await call()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return requests / elapsed, samples
+
+async def main(iterations: int, requests: int, concurrency: int, chunks: int) -> int:
+    apps = {
+        "BaseHTTPMiddleware": build_app(LegacyAuthMiddleware, chunks),
+        "pure ASGI": build_app(AuthMiddleware, chunks),
+    }
+    print("Behaviour (BaseHTTPMiddleware / pure ASGI):")
+    if not await check_same_behaviour(*apps.values()):
+        return 1
+
+    cases = [
+        ("ping", "/api/ping", bearer()),
+        ("stream", "/api/stream", bearer()),
+        ("ping (refresh)", "/api/ping", stale_bearer()),
+    ]
+    for case, path, headers in cases:
+        for name, app in apps.items():
+            rps, samples = await run_case(app, path, headers, iterations, requests, concurrency)
+            print(f"{format_summary(f'{case} {name}', samples)}  {rps:8.0f} req/s")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="Sequential calls for the latency figures")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests for the throughput figure")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=20, help="Chunks per streamed response")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.iterations, args.requests, args.concurrency, args.chunks)))
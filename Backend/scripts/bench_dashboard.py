@@ -0,0 +1,90 @@
+"""
+Latency of GET /api/dashboard/overview on a large voucher history.
+
+Tops the database up to --vouchers trade vouchers (bulk insert, spread over the last
+year so the period filters matter), rebuilds the daily rollups the bulk insert bypassed,
+then reports p50/p95 per period.
+Run it on two commits to compare before/after. Responses come from the dashboard snapshot
+cache after the first call; --cold invalidates it before every call to time the queries.
+
+Usage:
+    python scripts/bench_dashboard.py [--vouchers 100000] [--iterations 50] [--cold]
+
+Requires DATABASE_URL to point at a seeded database (see generate_mock_data.py).
+"""
+import asyncio
+import argparse
+import random
+from datetime import date, timedelta
+
+from bench_utils import admin_headers, asgi_client, format_summary, time_async
+
+from sqlalchemy import func, insert, select
+
+from app.core.database import SessionLocal, close_db, engine, init_db
+from app.features.dashboard.dashboard_rollup_repository import rebuild_rollups
+from app.features.dashboard.dashboard_service import DashboardService
+from app.features.parties.party_entity import Party, PartyType
+from app.features.vouchers.voucher_entity import TradeVoucher, VoucherType, VoucherStatus
+from main import app
+
+PERIODS = ["today", "week", "month"]
+BATCH_SIZE = 5000
+
+async def seed_vouchers(target: int):
+    async with SessionLocal() as db:
+        existing = (await db.execute(select(func.count(TradeVoucher.id)))).scalar()
+        if existing >= target:
+            print(f"{existing} vouchers present, no seeding needed")
+            return
+        party_ids = (await db.execute(select(Party.id).limit(50))).scalars().all()
+        if not party_ids:
+            party = Party(name="Dashboard Bench", code="DASH-BENCH", party_type=PartyType.CUSTOMER)
+            db.add(party)
+            await db.flush()
+            party_ids = [party.id]
+
+        missing = target - existing
+        print(f"Seeding {missing} vouchers...", flush=True)
+        today = date.today()
+        for offset in range(0, missing, BATCH_SIZE):
+            rows = []
+            for n in range(offset, min(offset + BATCH_SIZE, missing)):
+                total = round(random.uniform(500, 50000), 2)
+                rows.append({
+                    "voucher_number": f"BENCH-{existing + n:07d}",
+                    "voucher_type": random.choice([VoucherType.INVOICE, VoucherType.INVOICE, VoucherType.BILL, VoucherType.CHALLAN]),
+                    "voucher_date": today - timedelta(days=random.randint(0, 365)),
+                    "party_id": random.choice(party_ids),
+                    "status": random.choice([VoucherStatus.ISSUED, VoucherStatus.ISSUED, VoucherStatus.DRAFT]),
+                    "total_amount": total,
+                    "tax_amount": 0.0,
+                    "grand_total": total,
+                })
+            await db.execute(insert(TradeVoucher), rows)
+        await db.commit()
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_rollups)
+
+async def main(vouchers: int, iterations: int, cold: bool):
+    await init_db()
+    await seed_vouchers(vouchers)
+    headers = admin_headers()
+    async with asgi_client(app) as client:
+        for period in PERIODS:
+            async def call():
+                if cold:
+                    DashboardService.invalidate_cache()
+                response = await client.get("/api/dashboard/overview", params={"period": period}, headers=headers)
+                response.raise_for_status()
+            samples = await time_async(call, iterations)
+            print(format_summary(f"GET /api/dashboard/overview?period={period}", samples))
+    await close_db()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vouchers", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--cold", action="store_true", help="Bypass the snapshot cache")
+    args = parser.parse_args()
+    asyncio.run(main(args.vouchers, args.iterations, args.cold))
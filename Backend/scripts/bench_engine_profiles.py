@@ -0,0 +1,55 @@
+"""
+Compare request latency of the "serverless" (NullPool) and "pooled" engine profiles.
+
+Usage:
+    python scripts/bench_engine_profiles.py [--iterations 100]
+
+Requires DATABASE_URL to point at a seeded database (see generate_mock_data.py).
+"""
+import asyncio
+import argparse
+
+from bench_utils import admin_headers, asgi_client, format_summary, summarize, time_async
+
+from app.core import database
+from app.core.database import SessionLocal, create_engine_for_profile
+from main import app
+
+ENDPOINTS = ["/api/parties/", "/api/dashboard/overview"]
+
+async def run_profile(profile: str, iterations: int) -> dict:
+    engine = create_engine_for_profile(profile)
+    SessionLocal.configure(bind=engine)
+    database.engine = engine
+    results = {}
+    headers = admin_headers()
+    try:
+        async with asgi_client(app) as client:
+            for path in ENDPOINTS:
+                async def call():
+                    response = await client.get(path, headers=headers)
+                    response.raise_for_status()
+                samples = await time_async(call, iterations)
+                print(format_summary(f"[{profile}] GET {path}", samples))
+                results[path] = summarize(samples)
+    finally:
+        await engine.dispose()
+    return results
+
+async def main(iterations: int):
+    serverless = await run_profile("serverless", iterations)
+    pooled = await run_profile("pooled", iterations)
+
+    print("\nLatency saved by the pooled profile:")
+    for path in ENDPOINTS:
+        before, after = serverless[path], pooled[path]
+        for key in ("p50", "p95"):
+            saved = before[key] - after[key]
+            pct = (saved / before[key] * 100) if before[key] else 0.0
+            print(f"  GET {path:<28} {key}: {before[key]:8.2f}ms -> {after[key]:8.2f}ms  ({saved:+.2f}ms, {pct:.1f}% saved)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,85 @@
+"""
+Create many vouchers in parallel and verify every auto-generated number is unique.
+
+Each voucher goes through VoucherService.create_voucher without a number, so the
+IDGenerator allocates it. Any duplicate or unique-constraint failure is a collision.
+
+Usage:
+    python scripts/bench_id_allocator.py [--count 1000] [--concurrency 50]
+
+Exits with status 1 on any collision or failed create. Run it against PostgreSQL:
+SQLite allows a single writer, so high concurrency there fails with "database is locked"
+(reported as other errors, not collisions).
+"""
+import asyncio
+import argparse
+import time
+import uuid
+from datetime import date
+
+from bench_utils import format_summary
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import init_db, close_db
+from app.features.users.user_entity import User
+from app.features.trips.trip_entity import Trip
+from app.features.fleet.fleet_entity import Vehicle, Driver
+from app.features.parties.party_repository import PartyRepository
+from app.features.parties.party_schema import PartyCreate
+from app.features.parties.party_entity import PartyType
+from app.features.inventory.inventory_repository import InventoryRepository
+from app.features.inventory.inventory_schema import ItemCreate
+from app.features.vouchers.voucher_service import VoucherService
+from app.features.vouchers.voucher_schema import VoucherCreate, VoucherItemCreate
+from app.features.vouchers.voucher_entity import VoucherType
+
+async def main(count: int, concurrency: int) -> int:
+    await init_db()
+    suffix = uuid.uuid4().hex[:8].upper()
+    party = await PartyRepository.create(PartyCreate(name=f"ID Bench {suffix}", code=f"IDB-{suffix}", party_type=PartyType.CUSTOMER))
+    item = await InventoryRepository.create_item(ItemCreate(name=f"ID Bench Item {suffix}", code=f"IDBI-{suffix}", unit="NOS", base_price=10))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    numbers, latencies_ms, collisions, errors = [], [], [], []
+
+    async def create_one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                voucher = await VoucherService.create_voucher(VoucherCreate(
+                    voucher_type=VoucherType.CHALLAN,
+                    voucher_date=date.today(),
+                    party_id=party.id,
+                    items=[VoucherItemCreate(item_id=item.id, quantity=1, rate=10)],
+                ))
+                numbers.append(voucher.voucher_number)
+            except IntegrityError as e:
+                collisions.append(str(e.orig))
+            except Exception as e:
+                errors.append(repr(e))
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(create_one() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+
+    duplicates = len(numbers) - len(set(numbers))
+    print(format_summary(f"create_voucher x{count} (concurrency {concurrency})", latencies_ms))
+    print(f"Throughput: {count / elapsed:.1f} vouchers/s over {elapsed:.2f}s")
+    print(f"Created: {len(numbers)}  duplicates: {duplicates}  collisions: {len(collisions)}  other errors: {len(errors)}")
+    if numbers:
+        ordered = sorted(numbers, key=lambda n: int(n.rsplit("-", 1)[-1]))
+        print(f"Range: {ordered[0]} .. {ordered[-1]}")
+    for message in (collisions + errors)[:5]:
+        print(f"  {message[:200]}")
+
+    await close_db()
+    return 1 if duplicates or collisions or errors else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.count, args.concurrency)))
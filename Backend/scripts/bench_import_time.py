@@ -0,0 +1,84 @@
+"""
+Measure cold-start import time of the Vercel entry point (VercelDeployable/api/main.py).
+
+Each run imports `main` in a fresh interpreter with `python -X importtime`, which is what a
+serverless cold start pays before the first request. Prints the p50/p95 total and the
+modules that dominate the import tree.
+
+Usage:
+    python scripts/bench_import_time.py [--runs 10] [--top 15] [--budget-ms 1500] [--target PATH]
+
+With --budget-ms the script exits with status 1 when the p50 import time exceeds the
+budget, so it can gate CI against cold-start regressions.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from bench_utils import format_summary, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+DEFAULT_TARGET = os.path.join(ROOT, "VercelDeployable", "api")
+
+# "import time:      self [us] |    cumulative | imported package"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+def import_once(target: str) -> List[Tuple[str, int, int, int]]:
+    """Import `main` from `target` in a fresh interpreter; returns (module, depth, self_us, cumulative_us)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=target,
+        capture_output=True,
+        text=True,
+        # Import as the Vercel runtime does (console logging only, no local log files)
+        env={**os.environ, "VERCEL": "1"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing main failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return rows
+
+def main(runs: int, top: int, budget_ms: float, target: str) -> int:
+    import_once(target) # Warm the bytecode cache so runs compare like for like
+
+    totals_ms: List[float] = []
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(runs):
+        rows = import_once(target)
+        for module, depth, _self_us, cumulative_us in rows:
+            if module == "main":
+                totals_ms.append(cumulative_us / 1000)
+            elif depth == 1:
+                # Direct imports of main: the app's own modules and the frameworks it pulls in
+                cumulative[module].append(cumulative_us)
+
+    print(format_summary("import main", totals_ms))
+    print(f"\nSlowest direct imports of main (median cumulative over {runs} runs):")
+    medians = sorted(((sorted(v)[len(v) // 2], k) for k, v in cumulative.items()), reverse=True)
+    for us, module in medians[:top]:
+        print(f"  {us / 1000:8.1f}ms  {module}")
+
+    p50 = summarize(totals_ms)["p50"]
+    if budget_ms and p50 > budget_ms:
+        print(f"\nFAIL: p50 import time {p50:.1f}ms exceeds budget {budget_ms:.1f}ms")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=0, help="Fail when p50 exceeds this (0 disables)")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="Directory containing main.py")
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.top, args.budget_ms, args.target))
@@ -0,0 +1,175 @@
+"""
+Trip and voucher list pages: entity path vs column projection.
+
+Compares, for one page of --rows trips / vouchers:
+  - entities: select(Entity) + selectinload(children), model_validate (and trip enrichment)
+    per row, encoded with APIResponse (how the list endpoints worked before)
+  - projection: the repositories' get_all (column-only select, derived fields in SQL,
+    rows as dicts), encoded with APIResponse
+Reports latency p50/p95 and the peak Python memory of one call (tracemalloc).
+
+Tops the database up to --rows trips and vouchers first (bulk insert, --children
+expenses / line items each) and rebuilds the dashboard rollups the bulk insert bypassed.
+
+Usage:
+    python scripts/bench_list_projection.py [--rows 10000] [--children 3] [--iterations 10]
+
+Requires DATABASE_URL to point at a seeded database (see generate_mock_data.py).
+"""
+import asyncio
+import argparse
+import random
+import sys
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from bench_utils import format_summary, time_async
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.database import SessionLocal, close_db, engine, init_db
+from app.core.responses import APIResponse
+from app.features.dashboard.dashboard_rollup_repository import rebuild_rollups
+from app.features.fleet.fleet_entity import Driver, Vehicle
+from app.features.inventory.inventory_entity import Item
+from app.features.parties.party_entity import Party
+from app.features.trips.trip_entity import Trip, TripExpense, TripStatus
+from app.features.trips.trip_repository import TripRepository
+from app.features.trips.trip_service import TripService
+from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem, VoucherStatus, VoucherType
+from app.features.vouchers.voucher_repository import VoucherRepository
+from app.features.vouchers.voucher_schema import VoucherResponse
+
+BATCH_SIZE = 2000
+
+async def _first_id(db, column):
+    return (await db.execute(select(column).limit(1))).scalar()
+
+async def seed(rows: int, children: int) -> bool:
+    async with SessionLocal() as db:
+        party_id = await _first_id(db, Party.id)
+        vehicle_id = await _first_id(db, Vehicle.id)
+        driver_id = await _first_id(db, Driver.id)
+        item_id = await _first_id(db, Item.id)
+        if None in (party_id, vehicle_id, driver_id, item_id):
+            print("Needs at least one party, vehicle, driver and item; run generate_mock_data.py first")
+            return False
+
+        now = datetime.now()
+        missing = rows - (await db.execute(select(func.count(Trip.id)))).scalar()
+        for offset in range(0, max(missing, 0), BATCH_SIZE):
+            batch = range(offset, min(offset + BATCH_SIZE, missing))
+            trip_ids = (await db.execute(insert(Trip).returning(Trip.id), [{
+                "trip_number": f"BENCH-T-{now:%H%M%S}-{n:06d}",
+                "start_date": now - timedelta(minutes=n),
+                "source_location": "Kolkata Port",
+                "destination_location": "Kharagpur Depot",
+                "vehicle_id": vehicle_id,
+                "driver_id": driver_id,
+                "freight_income": 25000.0,
+                "diesel_expense": 1600.0 * children,
+                "status": random.choice(list(TripStatus)),
+            } for n in batch])).scalars().all()
+            await db.execute(insert(TripExpense), [
+                {"trip_id": trip_id, "expense_type": "Diesel", "amount": 1600.0, "date": now}
+                for trip_id in trip_ids for _ in range(children)
+            ])
+
+        missing = rows - (await db.execute(select(func.count(TradeVoucher.id)))).scalar()
+        for offset in range(0, max(missing, 0), BATCH_SIZE):
+            batch = range(offset, min(offset + BATCH_SIZE, missing))
+            voucher_ids = (await db.execute(insert(TradeVoucher).returning(TradeVoucher.id), [{
+                "voucher_number": f"BENCH-V-{now:%H%M%S}-{n:06d}",
+                "voucher_type": VoucherType.INVOICE,
+                "voucher_date": date.today(),
+                "party_id": party_id,
+                "status": VoucherStatus.ISSUED,
+                "total_amount": 2000.0 * children,
+                "tax_amount": 360.0 * children,
+                "grand_total": 2360.0 * children,
+            } for n in batch])).scalars().all()
+            await db.execute(insert(VoucherItem), [
+                {"voucher_id": voucher_id, "item_id": item_id, "quantity": 10.0, "rate": 200.0, "tax_rate": 18.0, "amount": 2000.0}
+                for voucher_id in voucher_ids for _ in range(children)
+            ])
+        await db.commit()
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_rollups)
+    return True
+
+# --- The entity path the list endpoints used before ---
+
+async def trips_via_entities(limit: int) -> list:
+    async with SessionLocal() as db:
+        query = select(Trip).options(selectinload(Trip.expenses)).order_by(Trip.start_date.desc(), Trip.id.desc()).limit(limit)
+        trips = (await db.execute(query)).scalars().all()
+        return [await TripService._enrich_response(t) for t in trips]
+
+async def vouchers_via_entities(limit: int) -> list:
+    async with SessionLocal() as db:
+        query = (
+            select(TradeVoucher)
+            .options(selectinload(TradeVoucher.items), joinedload(TradeVoucher.approver))
+            .order_by(TradeVoucher.created_at.desc(), TradeVoucher.id.desc())
+            .limit(limit)
+        )
+        vouchers = (await db.execute(query)).scalars().all()
+        return [VoucherResponse.model_validate(v) for v in vouchers]
+
+async def trips_via_projection(limit: int) -> list:
+    return (await TripRepository.get_all(limit=limit)).items
+
+async def vouchers_via_projection(limit: int) -> list:
+    return (await VoucherRepository.get_all(limit=limit)).items
+
+def render(items) -> bytes:
+    return APIResponse(content={"success": True, "message": "Bench", "data": items}).body
+
+def check_same_fields(models: list, rows: list, nested: str, count: str):
+    """Every field the projection shares with the full response must carry the same value."""
+    assert len(models) == len(rows), "row counts differ"
+    for model, row in zip(models, rows):
+        full = model.model_dump()
+        for key, value in row.items():
+            if key in full and key != nested:
+                assert full[key] == value, f"{key}: {full[key]!r} != {value!r}"
+        assert len(full[nested]) == row[count], f"{count} does not match {nested}"
+
+async def peak_memory_mib(fn) -> float:
+    tracemalloc.start()
+    render(await fn())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+async def main(rows: int, children: int, iterations: int) -> int:
+    await init_db()
+    if not await seed(rows, children):
+        return 1
+
+    check_same_fields(await trips_via_entities(rows), await trips_via_projection(rows), "expenses", "expense_count")
+    check_same_fields(await vouchers_via_entities(rows), await vouchers_via_projection(rows), "items", "item_count")
+
+    cases = [
+        ("trips entities", trips_via_entities),
+        ("trips projection", trips_via_projection),
+        ("vouchers entities", vouchers_via_entities),
+        ("vouchers projection", vouchers_via_projection),
+    ]
+    for name, fetch in cases:
+        async def call():
+            render(await fetch(rows))
+        samples = await time_async(call, iterations, warmup=1)
+        peak = await peak_memory_mib(lambda: fetch(rows))
+        print(f"{format_summary(f'{name} x{rows}', samples)}  peak={peak:7.1f}MiB")
+    await close_db()
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--children", type=int, default=3, help="Expenses per trip / line items per voucher")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.rows, args.children, args.iterations)))
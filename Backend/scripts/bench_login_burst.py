@@ -0,0 +1,85 @@
+"""
+Latency of an unrelated endpoint (GET /api/trips/) while a burst of logins runs.
+
+Scenarios, each probing /api/trips/?limit=20 back to back for the duration:
+  - idle:          no logins, the baseline
+  - inline bcrypt: --logins concurrent logins with bcrypt verified on the event loop
+                   (how login worked before)
+  - thread pool:   the same burst with AuthHelper's bounded password executor
+Reports the probe's latency percentiles; p99 is the number a login burst inflates.
+
+Creates (or resets) the user --username with password --password for the logins.
+
+Usage:
+    python scripts/bench_login_burst.py [--logins 20] [--probe-seconds 3]
+
+Requires DATABASE_URL to point at a database with the schema (see seed_admin.py).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# The burst deliberately exceeds the login rate limits; measure what lies behind them
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from bench_utils import admin_headers, asgi_client, ensure_bench_user, format_summary
+
+from app.features.users.user_entity import UserRole
+from app.features.users.user_helper import AuthHelper, pwd_context
+from main import app
+
+async def verify_inline(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+async def run_scenario(client, logins: int, username: str, password: str, probe_seconds: float):
+    headers = admin_headers()
+    samples = []
+    done = asyncio.Event()
+
+    async def probe():
+        deadline = time.perf_counter() + probe_seconds
+        while not done.is_set() or time.perf_counter() < deadline:
+            started = time.perf_counter()
+            (await client.get("/api/trips/?limit=20", headers=headers)).raise_for_status()
+            samples.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def login():
+        response = await client.post("/api/auth/login", json={"username": username, "password": password})
+        response.raise_for_status()
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(login() for _ in range(logins)))
+    done.set()
+    await probe_task
+    return samples
+
+async def main(logins: int, username: str, password: str, probe_seconds: float) -> int:
+    await ensure_bench_user(username, password, UserRole.USER, "Login Bench")
+    pooled_verify = AuthHelper.verify_password_async
+    async with asgi_client(app) as client:
+        await client.get("/api/trips/?limit=20", headers=admin_headers()) # warm up
+        scenarios = [
+            ("idle", 0, pooled_verify),
+            (f"{logins} logins, inline bcrypt", logins, verify_inline),
+            (f"{logins} logins, thread pool", logins, pooled_verify),
+        ]
+        for name, count, verify in scenarios:
+            AuthHelper.verify_password_async = staticmethod(verify)
+            started = time.perf_counter()
+            samples = await run_scenario(client, count, username, password, probe_seconds)
+            print(f"{format_summary(f'trips probe, {name}', samples)}  ({time.perf_counter() - started:.1f}s)")
+    AuthHelper.verify_password_async = pooled_verify
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--username", default="bench_login")
+    parser.add_argument("--password", default="Bench@12345")
+    parser.add_argument("--probe-seconds", type=float, default=3.0, help="Minimum probe duration per scenario")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.logins, args.username, args.password, args.probe_seconds)))
@@ -0,0 +1,118 @@
+"""
+Login rate limiting: behaviour and what a rejected attempt costs.
+
+Behaviour (each case from its own client IP):
+  - repeated attempts at one unknown username: USERNAME_BURST pass (401), then 429
+  - attempts at many usernames from one IP: IP_BURST pass, then 429
+  - repeated change-password attempts for one username: limited the same way
+Every 429 must carry Retry-After and run no SQL (X-DB-Queries: 0).
+A body over the middleware's read limit must get 413, also without SQL.
+
+Cost per attempt, sequential:
+  - wrong password for a real user (DB lookup + bcrypt + failure bookkeeping)
+  - unknown username (DB lookup only)
+  - rejected by the limiter
+
+Usage:
+    python scripts/bench_rate_limit.py [--iterations 500]
+
+Requires DATABASE_URL to point at a database with the schema (see seed_admin.py).
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import Counter
+
+from bench_utils import ensure_bench_user, format_summary, time_async
+
+import httpx
+
+from app.core.config import settings
+from app.features.users.user_entity import UserRole
+from main import app
+
+def client_from(ip: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(ip, 50000)), base_url="http://bench")
+
+def unique(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+async def check_case(name: str, ip: str, path: str, bodies, passed: int) -> bool:
+    async with client_from(ip) as client:
+        responses = [await client.post(path, json=body) for body in bodies]
+    statuses = Counter(response.status_code for response in responses)
+    limited = [response for response in responses if response.status_code == 429]
+    ok = len(responses) - len(limited) == passed and all(
+        response.headers.get("retry-after") and response.headers.get("x-db-queries") == "0" for response in limited
+    )
+    retry_after = limited[0].headers.get("retry-after") if limited else "-"
+    print(f"  {name:<34} {dict(sorted(statuses.items()))}  Retry-After={retry_after}  {'ok' if ok else 'FAILED'}")
+    return ok
+
+async def main(iterations: int) -> int:
+    login, change_password = "/api/auth/login", "/api/users/change-password"
+    username_burst, ip_burst = settings.RATE_LIMIT_USERNAME_BURST, settings.RATE_LIMIT_IP_BURST
+
+    print("Behaviour:")
+    nobody = unique("nobody")
+    ok = await check_case(
+        "one unknown username", "10.0.0.1", login,
+        [{"username": nobody, "password": "x"}] * (username_burst + 3), username_burst,
+    )
+    ok &= await check_case(
+        "many usernames, one IP", "10.0.0.2", login,
+        [{"username": unique("spray"), "password": "x"} for _ in range(ip_burst + 3)], ip_burst,
+    )
+    ok &= await check_case(
+        "change-password, one username", "10.0.0.3", change_password,
+        [{"username": nobody, "old_password": "x", "new_password": "Newpass@123"}] * (username_burst + 3), username_burst,
+    )
+    async with client_from("10.0.0.4") as client:
+        response = await client.post(login, json={"username": nobody, "password": "x" * 10000})
+    oversized = response.status_code == 413 and response.headers.get("x-db-queries") == "0"
+    print(f"  {'oversized body':<34} {response.status_code}  {'ok' if oversized else 'FAILED'}")
+    ok &= oversized
+    if not ok:
+        print("FAILED")
+        return 1
+
+    # Costs, each from a fresh IP. Allowed attempts are kept within the buckets' bursts.
+    print("Cost per attempt:")
+    username, password = "ratelimit_bench", "Bench@12345"
+    await ensure_bench_user(username, password, UserRole.USER, "Rate Limit Bench")
+    async with client_from("10.0.1.1") as client:
+        async def wrong_password():
+            await client.post(login, json={"username": username, "password": "wrong"})
+        # Past MAX_LOGIN_ATTEMPTS the lockout answers without bcrypt
+        samples = await time_async(wrong_password, min(username_burst, settings.MAX_LOGIN_ATTEMPTS), warmup=0)
+    print(format_summary("wrong password (bcrypt)", samples))
+    await ensure_bench_user(username, password, UserRole.USER, "Rate Limit Bench") # clear the lockout
+
+    async with client_from("10.0.1.2") as client:
+        async def unknown_username():
+            await client.post(login, json={"username": unique("nobody"), "password": "x"})
+        samples = await time_async(unknown_username, ip_burst - 3)
+    print(format_summary("unknown username (DB lookup)", samples))
+
+    async with client_from("10.0.1.3") as client:
+        for _ in range(username_burst):
+            await client.post(login, json={"username": nobody, "password": "x"})
+
+        async def rejected():
+            response = await client.post(login, json={"username": nobody, "password": "x"})
+            assert response.status_code == 429
+
+        started = time.perf_counter()
+        samples = await time_async(rejected, iterations)
+        print(format_summary("rejected by the limiter", samples))
+        print(f"  {iterations / (time.perf_counter() - started):.0f} rejections/s")
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500, help="Sequential rejected attempts to time")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.iterations)))
@@ -0,0 +1,84 @@
+"""
+Microbenchmark: encoding a page of TripResponse / VoucherResponse models into the
+response envelope.
+
+Compares the old path (model_dump(mode='json') per item, then stdlib json via
+JSONResponse) with APIResponse (pydantic-core writes models straight to bytes).
+No database needed; the models are built in memory.
+
+Usage:
+    python scripts/bench_serialization.py [--items 100] [--children 5] [--iterations 500]
+"""
+import argparse
+import time
+from datetime import date, datetime
+
+from bench_utils import format_summary
+
+from fastapi.responses import JSONResponse
+
+from app.core.responses import APIResponse
+from app.features.trips.trip_schema import TripResponse, TripExpenseResponse
+from app.features.vouchers.voucher_schema import VoucherResponse, VoucherItemResponse
+
+def build_trips(count: int, children: int):
+    now = datetime.now()
+    return [
+        TripResponse(
+            id=n, trip_number=f"T-{n:05d}", start_date=now, end_date=now, end_km=1200.0, start_km=1000.0,
+            source_location="Kolkata Port", destination_location="Kharagpur Depot",
+            vehicle_id=1, driver_id=1, freight_income=25000.0, diesel_expense=8000.0, toll_expense=900.0,
+            other_expense=0.0, total_expense=8900.0, net_profit=16100.0, notes="Bench trip",
+            expenses=[
+                TripExpenseResponse(id=n * children + c, trip_id=n, expense_type="Diesel", amount=1600.0, date=now)
+                for c in range(children)
+            ],
+            created_at=now, updated_at=now,
+        )
+        for n in range(count)
+    ]
+
+def build_vouchers(count: int, children: int):
+    now = datetime.now()
+    return [
+        VoucherResponse(
+            id=n, voucher_number=f"INV-{n:05d}", voucher_date=date.today(), party_id=1,
+            vehicle_number="WB-12-3456", total_amount=10000.0, tax_amount=1800.0, grand_total=11800.0,
+            items=[
+                VoucherItemResponse(id=n * children + c, item_id=c + 1, quantity=10.0, rate=200.0, tax_rate=18.0, amount=2000.0)
+                for c in range(children)
+            ],
+            created_at=now, updated_at=now,
+        )
+        for n in range(count)
+    ]
+
+def legacy(items) -> bytes:
+    return JSONResponse(content={"success": True, "message": "Bench", "data": [i.model_dump(mode='json') for i in items]}).body
+
+def current(items) -> bytes:
+    return APIResponse(content={"success": True, "message": "Bench", "data": items}).body
+
+def time_sync(fn, iterations: int, warmup: int = 10):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def main(count: int, children: int, iterations: int):
+    for name, items in [("TripResponse", build_trips(count, children)), ("VoucherResponse", build_vouchers(count, children))]:
+        assert legacy(items) == current(items), f"{name}: encoders disagree"
+        print(format_summary(f"{name} x{count} model_dump+json", time_sync(lambda: legacy(items), iterations)))
+        print(format_summary(f"{name} x{count} APIResponse", time_sync(lambda: current(items), iterations)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--children", type=int, default=5, help="Expenses per trip / line items per voucher")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    main(args.items, args.children, args.iterations)
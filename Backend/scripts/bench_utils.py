@@ -0,0 +1,76 @@
+"""
+Shared helpers for the benchmark scripts in this folder.
+Benchmarks call the ASGI app in-process (no network hop), so numbers reflect
+application + database time only.
+"""
+import sys
+import os
+import time
+import statistics
+from typing import Awaitable, Callable, Dict, List
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(samples_ms),
+        "mean": statistics.fmean(samples_ms) if samples_ms else 0.0,
+        "p50": percentile(samples_ms, 50),
+        "p95": percentile(samples_ms, 95),
+        "p99": percentile(samples_ms, 99),
+    }
+
+def format_summary(label: str, samples_ms: List[float]) -> str:
+    s = summarize(samples_ms)
+    return f"{label:<40} n={s['n']:<5} mean={s['mean']:8.2f}ms  p50={s['p50']:8.2f}ms  p95={s['p95']:8.2f}ms  p99={s['p99']:8.2f}ms"
+
+async def time_async(fn: Callable[[], Awaitable], iterations: int, warmup: int = 3) -> List[float]:
+    """Run `fn` sequentially and return per-call latencies in milliseconds."""
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def admin_headers(user_id: int = 1, username: str = "admin") -> Dict[str, str]:
+    """Authorization header with a freshly minted admin token."""
+    from app.features.users.user_helper import AuthHelper
+    token = AuthHelper.create_access_token({"sub": username, "id": user_id, "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+async def ensure_bench_user(username: str, password: str, role, full_name: str) -> int:
+    """Create the user, or reset it to active, unlocked and with `password`. Returns its id."""
+    from sqlalchemy import select
+    from app.core.database import SessionLocal
+    from app.features.users.user_entity import User
+    from app.features.users.user_helper import AuthHelper
+    async with SessionLocal() as db:
+        user = (await db.execute(select(User).where(User.username == username))).scalar_one_or_none()
+        if user is None:
+            user = User(username=username, full_name=full_name, role=role)
+            db.add(user)
+        user.email = f"{username}@example.com" # UserResponse rejects reserved domains like .local
+        user.hashed_password = await AuthHelper.hash_password_async(password)
+        user.active = True
+        user.password_change_required = False
+        user.failed_login_attempts = 0
+        user.lockout_until = None
+        await db.commit()
+        return user.id
+
+def asgi_client(app):
+    """httpx client that talks to the ASGI app in-process."""
+    import httpx
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
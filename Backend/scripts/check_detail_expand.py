@@ -0,0 +1,69 @@
+"""
+Verify that `?expand=` on the trip and voucher detail endpoints only adds summaries.
+
+For the newest voucher and trip, GET /api/<resource>/{id}?expand=<every expansion>
+must equal the plain GET /api/<resource>/{id} (line items / expenses included) once
+the expanded keys are removed, and every expanded key must hold the referenced
+record's summary (or null for an empty reference).
+
+Usage:
+    python scripts/check_detail_expand.py
+
+Requires DATABASE_URL to point at a seeded database (see generate_mock_data.py).
+"""
+import asyncio
+import sys
+
+from bench_utils import admin_headers, asgi_client
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.features.trips.trip_entity import Trip
+from app.features.vouchers.voucher_entity import TradeVoucher
+from main import app
+
+# (resource, entity, row expansions, (collection, expansion) inside a collection)
+CASES = [
+    ("vouchers", TradeVoucher, ["party"], ("items", "item")),
+    ("trips", Trip, ["vehicle", "driver", "supplier_party", "customer_party"], None),
+]
+
+def without(data: dict, expanded, nested) -> dict:
+    data = {key: value for key, value in data.items() if key not in expanded}
+    if nested:
+        collection, name = nested
+        data[collection] = [{key: value for key, value in child.items() if key != name} for child in data[collection]]
+    return data
+
+def summaries_present(data: dict, expanded, nested) -> bool:
+    rows = [(data, name) for name in expanded]
+    if nested:
+        collection, name = nested
+        rows += [(child, name) for child in data[collection]]
+    return all(name in row and (row[name] is None or "id" in row[name]) for row, name in rows)
+
+async def main() -> int:
+    ok = True
+    async with asgi_client(app) as client:
+        headers = admin_headers()
+        for resource, entity, expanded, nested in CASES:
+            async with SessionLocal() as db:
+                record_id = (await db.execute(select(entity.id).order_by(entity.id.desc()).limit(1))).scalar()
+            if record_id is None:
+                print(f"No {resource} to check; run generate_mock_data.py first")
+                return 1
+            expand = ",".join([*expanded, *([".".join(nested)] if nested else [])])
+            plain = await client.get(f"/api/{resource}/{record_id}", headers=headers)
+            rich = await client.get(f"/api/{resource}/{record_id}", params={"expand": expand}, headers=headers)
+            plain_data, rich_data = plain.json()["data"], rich.json()["data"]
+            same = plain.status_code == rich.status_code == 200 and without(rich_data, expanded, nested) == plain_data
+            present = rich.status_code == 200 and summaries_present(rich_data, expanded, nested)
+            ok &= same and present
+            print(f"  {resource}/{record_id}?expand={expand}")
+            print(f"    full detail kept: {same}, summaries embedded: {present}")
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
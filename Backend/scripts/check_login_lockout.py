@@ -0,0 +1,113 @@
+"""
+Verify login bookkeeping under parallel attempts.
+
+Resets the user --username, then:
+  - fires --attempts parallel wrong-password logins: exactly MAX_LOGIN_ATTEMPTS - 1 of
+    them may get 401, the rest 403 (locked), and every attempt must be counted
+  - tries the right password: still 403 while locked
+  - after clearing the lockout, the right password gets 200 and a successful login
+    runs two statements (the user lookup and one UPDATE ... RETURNING)
+For comparison it also runs --attempts parallel increments the way login used to
+(read the row, add one in Python, commit) and reports how many were lost.
+
+Usage:
+    python scripts/check_login_lockout.py [--attempts 10]
+
+Requires DATABASE_URL to point at a database with the schema (see seed_admin.py).
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import Counter
+
+# The parallel attempts exceed the per-username rate limit; check the lockout behind it
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from bench_utils import asgi_client, ensure_bench_user
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import SessionLocal, track_database_stats
+from app.features.auth.auth_service import AuthService
+from app.features.users.user_entity import User, UserRole
+from main import app
+
+async def stored_state(user_id: int):
+    async with SessionLocal() as db:
+        row = (await db.execute(select(User.failed_login_attempts, User.lockout_until).where(User.id == user_id))).one()
+        return row.failed_login_attempts, row.lockout_until
+
+async def clear_lockout(user_id: int):
+    async with SessionLocal() as db:
+        await db.execute(update(User).where(User.id == user_id).values(failed_login_attempts=0, lockout_until=None))
+        await db.commit()
+
+async def record_failures(user_id: int, count: int):
+    async with SessionLocal() as db:
+        await db.execute(update(User).where(User.id == user_id).values(failed_login_attempts=count))
+        await db.commit()
+
+async def legacy_increment(user_id: int) -> bool:
+    """The previous UserRepository.increment_failed_login: read, add one, commit."""
+    try:
+        async with SessionLocal() as db:
+            user = (await db.execute(select(User).where(User.id == user_id))).scalar_one()
+            await asyncio.sleep(0) # let the other attempts read too, as their bcrypt calls would
+            user.failed_login_attempts += 1
+            await db.commit()
+        return True
+    except Exception:
+        return False
+
+async def main(username: str, password: str, attempts: int) -> int:
+    limit = settings.MAX_LOGIN_ATTEMPTS
+    user_id = await ensure_bench_user(username, password, UserRole.USER, "Lockout Check")
+    ok = True
+
+    async with asgi_client(app) as client:
+        async def login(secret: str):
+            return await client.post("/api/auth/login", json={"username": username, "password": secret})
+
+        responses = await asyncio.gather(*(login("wrong-password") for _ in range(attempts)))
+        statuses = Counter(response.status_code for response in responses)
+        count, lockout_until = await stored_state(user_id)
+        print(f"{attempts} parallel wrong passwords (MAX_LOGIN_ATTEMPTS={limit}): {dict(sorted(statuses.items()))}")
+        print(f"  stored failed_login_attempts={count} lockout_until={lockout_until}")
+        ok &= statuses == Counter({401: limit - 1, 403: attempts - limit + 1})
+        ok &= count == attempts and lockout_until is not None
+
+        locked = await login(password)
+        print(f"Right password while locked: {locked.status_code}")
+        ok &= locked.status_code == 403
+
+        await clear_lockout(user_id)
+        success = await login(password)
+        print(f"Right password after reset: {success.status_code}")
+        ok &= success.status_code == 200
+
+    # The request scope tracks its own stats, so count the service call directly
+    await record_failures(user_id, limit - 1)
+    with track_database_stats() as stats:
+        await AuthService.login_user(username, password, ip_address="127.0.0.1")
+    count, lockout_until = await stored_state(user_id)
+    print(f"Successful login: statements={stats.statements} commits={stats.commits}, stored failed_login_attempts={count}")
+    ok &= stats.statements == 2 and count == 0 and lockout_until is None
+
+    await clear_lockout(user_id)
+    results = await asyncio.gather(*(legacy_increment(user_id) for _ in range(attempts)))
+    count, _ = await stored_state(user_id)
+    print(f"Previous read-modify-write, {attempts} parallel increments: stored {count}, {results.count(False)} failed")
+    await ensure_bench_user(username, password, UserRole.USER, "Lockout Check")
+
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=10)
+    parser.add_argument("--username", default="lockout_check")
+    parser.add_argument("--password", default="Lockout@12345")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.username, args.password, args.attempts)))
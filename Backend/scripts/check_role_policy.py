@@ -0,0 +1,97 @@
+"""
+List every registered route with the roles AuthMiddleware lets through, and check the
+compiled role policy. (Endpoint dependencies such as get_admin_user can narrow a route
+further; /api/metrics is admin-only that way.)
+
+  - prints METHOD, path and effective roles ("public", "any role" or the ROLE_MAPPING
+    entry) for each route
+  - a concrete request path for each route (parameters filled in) must resolve to the
+    same roles as the route itself
+  - policies that name a missing route, or whose parameter entry would cover a literal
+    sibling route, must fail validation (as they would fail the boot)
+  - times ROLE_POLICY lookups against a linear scan of one regex per entry (how
+    AuthMiddleware matched before)
+
+Usage:
+    python scripts/check_role_policy.py [--iterations 200]
+"""
+import argparse
+import re
+import sys
+import time
+
+import bench_utils # noqa: F401  (puts the project root on sys.path)
+
+from app.core.role_mapping import ROLE_MAPPING, ROLE_POLICY
+from app.core.role_policy import RolePolicy, registered_routes
+from app.features.middleware.auth_middleware import AuthMiddleware
+from main import app
+
+def concrete(path: str) -> str:
+    return re.sub(r"\{[^}]+\}", "1", path)
+
+def describe(method: str, path: str) -> str:
+    if AuthMiddleware._is_public(method, concrete(path)):
+        return "public"
+    roles = ROLE_POLICY.allowed_roles(method, path)
+    return "any role" if roles is None else ", ".join(sorted(roles))
+
+def expect_invalid(name: str, mapping: dict) -> bool:
+    try:
+        RolePolicy(mapping).validate(registered_routes(app.routes))
+    except RuntimeError as e:
+        print(f"  {name:<34} rejected: {str(e).splitlines()[1].strip()}")
+        return True
+    print(f"  {name:<34} NOT rejected")
+    return False
+
+def time_lookups(requests, iterations: int):
+    # The previous approach: one anchored regex per entry, tried in order
+    scan = [
+        (re.compile(f"{method}:{re.sub(r'{[^}]+}', '[^/]+', path)}$"), roles)
+        for (method, path), roles in ROLE_POLICY.rules.items()
+    ]
+
+    def scan_lookup(method: str, path: str):
+        key = f"{method}:{path}"
+        for pattern, roles in scan:
+            if pattern.match(key):
+                return roles
+        return None
+
+    results = {}
+    for name, lookup in (("regex scan", scan_lookup), ("trie", ROLE_POLICY.allowed_roles)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for method, path in requests:
+                lookup(method, path)
+        results[name] = (time.perf_counter() - started) / (iterations * len(requests)) * 1e9
+    return results
+
+def main(iterations: int) -> int:
+    routes = sorted(set(registered_routes(app.routes)), key=lambda route: (route[1], route[0]))
+    routes = [(method, path) for method, path in routes if method != "HEAD"]
+    print(f"{len(routes)} routes, {len(ROLE_MAPPING)} ROLE_MAPPING entries:")
+    ok = True
+    for method, path in routes:
+        request_roles = ROLE_POLICY.allowed_roles(method, concrete(path))
+        same = request_roles == ROLE_POLICY.allowed_roles(method, path)
+        ok &= same
+        print(f"  {method:<7} {path:<44} {describe(method, path)}{'' if same else '  MISMATCH for ' + concrete(path)}")
+
+    print("Validation:")
+    ok &= expect_invalid("entry for a missing route", {**ROLE_MAPPING, "GET /users/": []})
+    ok &= expect_invalid("parameter entry over a literal", {"GET /api/vouchers/{voucher_id}": ["admin"]})
+
+    requests = [(method, concrete(path)) for method, path in routes]
+    timings = time_lookups(requests, iterations)
+    print("Lookup per request: " + ", ".join(f"{name} {ns:.0f} ns" for name, ns in timings.items()))
+
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Passes over all routes for the lookup timing")
+    args = parser.parse_args()
+    sys.exit(main(args.iterations))
@@ -0,0 +1,105 @@
+"""
+Verify that deactivating a user or changing their password ends their live tokens.
+
+Uses the throwaway admin --username against GET /api/metrics, which trusts the token
+payload alone (no user lookup), so only the revocation check can stop the request:
+  - a live token works, then is rejected right after UserService.deactivate_user,
+    without a database query on that request
+  - a second TokenRevocationList, standing in for another worker, accepts the token
+    until its next sync and rejects it after
+  - after reactivation, a new login works while the old token stays rejected
+  - change_password rejects the token issued before it; the next login works
+Then times TokenRevocationList.is_revoked with --revoked users on the list.
+
+Usage:
+    python scripts/check_token_revocation.py [--revoked 10000]
+
+Requires DATABASE_URL to point at a database with the schema (see seed_admin.py);
+creates the token_revocations table if it is missing.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import timedelta
+
+from bench_utils import asgi_client, ensure_bench_user
+
+from app.core.config import settings
+from app.core.database import init_db
+from app.features.auth.auth_revocation import TokenRevocationList
+from app.features.auth.auth_service import AuthService
+from app.features.users.user_entity import UserRole
+from app.features.users.user_helper import AuthHelper
+from app.features.users.user_service import UserService
+from main import app
+
+async def login(username: str, password: str) -> str:
+    return (await AuthService.login_user(username, password))["access_token"]
+
+def time_lookups(revoked: int) -> float:
+    """Nanoseconds per is_revoked call with `revoked` users on the list."""
+    revocations = TokenRevocationList(settings.TOKEN_REVOCATION_SYNC_SECONDS, timedelta(hours=1))
+    now = time.time()
+    revocations._cutoffs = {user_id: now for user_id in range(revoked)}
+    payloads = [{"id": user_id * 7 % (2 * revoked), "iat": now - 1} for user_id in range(1000)]
+    rounds = 200
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            revocations.is_revoked(payload)
+    return (time.perf_counter() - started) / (rounds * len(payloads)) * 1e9
+
+async def main(username: str, password: str, revoked: int) -> int:
+    await init_db()
+    user_id = await ensure_bench_user(username, password, UserRole.ADMIN, "Revocation Check")
+    other_worker = TokenRevocationList(settings.TOKEN_REVOCATION_SYNC_SECONDS, timedelta(hours=settings.TOKEN_REVOCATION_RETENTION_HOURS))
+    ok = True
+
+    async with asgi_client(app) as client:
+        async def get(token: str):
+            response = await client.get("/api/metrics", headers={"Authorization": f"Bearer {token}"})
+            return response.status_code, response.headers.get("x-db-queries")
+
+        def report(name: str, result, expected: int):
+            nonlocal ok
+            ok &= result[0] == expected
+            print(f"  {name:<44} {result[0]}  queries={result[1]}  {'ok' if result[0] == expected else 'FAILED'}")
+
+        first = await login(username, password)
+        await get(first) # let this process sync once
+        await other_worker.sync_if_due()
+        report("live token", await get(first), 200)
+
+        await UserService.deactivate_user(user_id)
+        report("same token after deactivate_user", await get(first), 401)
+        payload = AuthHelper.decode_token(first)
+        before_sync = other_worker.is_revoked(payload)
+        other_worker.synced_at = None # its sync interval has passed
+        await other_worker.sync_if_due()
+        after_sync = other_worker.is_revoked(payload)
+        ok &= not before_sync and after_sync
+        print(f"  other worker: revoked before sync={before_sync}, after sync={after_sync}")
+
+        await UserService.activate_user(user_id)
+        second = await login(username, password)
+        report("new login after activate_user", await get(second), 200)
+        report("token from before deactivation", await get(first), 401)
+
+        await UserService.change_password(username, password, password)
+        report("token from before change_password", await get(second), 401)
+        third = await login(username, password)
+        report("login after change_password", await get(third), 200)
+
+    print(f"is_revoked with {revoked} revoked users: {time_lookups(revoked):.0f} ns per check")
+    await ensure_bench_user(username, password, UserRole.ADMIN, "Revocation Check")
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--username", default="revocation_check")
+    parser.add_argument("--password", default="Revoke@12345")
+    parser.add_argument("--revoked", type=int, default=10000, help="Revoked users on the list for the lookup timing")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.username, args.password, args.revoked)))
@@ -0,0 +1,115 @@
+"""
+Verify that issuing a voucher runs on one connection with one commit, plus the
+dashboard rollup update in its own short transaction after it.
+
+Creates a throwaway party, item and draft invoice, then issues it through
+VoucherService.update_voucher while counting database work. The stored rollups
+must move exactly as a rebuild from the raw rows would (compared as the drift
+between the two, before and after). A unit of work whose inner rollback was
+swallowed must raise and keep none of its writes.
+
+Usage:
+    python scripts/check_unit_of_work.py
+"""
+import asyncio
+import sys
+import os
+import uuid
+from datetime import date
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from sqlalchemy import select
+
+from app.core.database import RollbackOnlyError, engine, get_session, track_database_stats, unit_of_work
+from app.features.dashboard.dashboard_entity import DailySalesRollup
+from app.features.dashboard.dashboard_rollup_repository import rebuild_rollups
+from app.features.users.user_entity import User
+from app.features.trips.trip_entity import Trip
+from app.features.fleet.fleet_entity import Vehicle, Driver
+from app.features.parties.party_repository import PartyRepository
+from app.features.parties.party_schema import PartyCreate
+from app.features.parties.party_entity import PartyType
+from app.features.inventory.inventory_repository import InventoryRepository
+from app.features.inventory.inventory_schema import ItemCreate
+from app.features.vouchers.voucher_service import VoucherService
+from app.features.vouchers.voucher_schema import VoucherCreate, VoucherItemCreate, VoucherUpdate
+from app.features.vouchers.voucher_entity import VoucherType, VoucherStatus
+
+async def sales_rollup_drift() -> dict:
+    """Stored sales rollups minus a rebuild from trade_vouchers, per bucket (the rebuild is rolled back)."""
+    columns = (DailySalesRollup.day, DailySalesRollup.voucher_type, DailySalesRollup.status)
+    query = select(*columns, DailySalesRollup.voucher_count, DailySalesRollup.grand_total)
+
+    def read(conn):
+        return {tuple(row[:3]): (row[3], round(row[4], 2)) for row in conn.execute(query)}
+
+    async with engine.connect() as conn:
+        stored = await conn.run_sync(read)
+        await conn.run_sync(rebuild_rollups)
+        rebuilt = await conn.run_sync(read)
+        await conn.rollback()
+    drift = {}
+    for key in stored.keys() | rebuilt.keys():
+        (count, total), (expected_count, expected_total) = stored.get(key, (0, 0.0)), rebuilt.get(key, (0, 0.0))
+        if count != expected_count or round(total - expected_total, 2):
+            drift[key] = (count - expected_count, round(total - expected_total, 2))
+    return drift
+
+async def check_voucher_issue():
+    drift = await sales_rollup_drift()
+    suffix = uuid.uuid4().hex[:8].upper()
+    party = await PartyRepository.create(PartyCreate(name=f"UoW Check {suffix}", code=f"UOW-{suffix}", party_type=PartyType.CUSTOMER))
+    item = await InventoryRepository.create_item(ItemCreate(name=f"UoW Item {suffix}", code=f"UOWI-{suffix}", unit="NOS", base_price=10))
+    draft = await VoucherService.create_voucher(VoucherCreate(
+        voucher_number=f"UOW-{suffix}",
+        voucher_type=VoucherType.INVOICE,
+        voucher_date=date.today(),
+        party_id=party.id,
+        items=[VoucherItemCreate(item_id=item.id, quantity=2, rate=50, tax_rate=18)],
+    ))
+
+    with track_database_stats() as stats:
+        issued = await VoucherService.update_voucher(draft.id, VoucherUpdate(status=VoucherStatus.ISSUED, approved_by_id=None))
+        # Snapshot now: the background email task shares this scope and does its own lookup later
+        connections, commits = stats.connections, stats.commits
+
+    print(f"Issued {issued.voucher_number}: connections={connections} commits={commits}")
+    refreshed_party = await PartyRepository.get_by_id(party.id)
+    refreshed_item = await InventoryRepository.get_item_by_id(item.id)
+    print(f"Party balance={refreshed_party.current_balance} item stock={refreshed_item.current_stock}")
+
+    # The unit of work, then the rollup update after it commits
+    assert connections == 2, f"expected 2 connections, got {connections}"
+    assert commits == 2, f"expected 2 commits, got {commits}"
+    assert refreshed_party.current_balance == issued.grand_total
+    assert refreshed_item.current_stock == -2
+    assert await sales_rollup_drift() == drift, "rollups moved differently from the vouchers"
+    print("OK")
+
+async def check_swallowed_rollback():
+    """A unit of work whose inner rollback was swallowed must raise, not exit as if it committed."""
+    suffix = uuid.uuid4().hex[:8].upper()
+    code = f"UOWR-{suffix}"
+    try:
+        async with unit_of_work():
+            await PartyRepository.create(PartyCreate(name=f"UoW Rollback {suffix}", code=code, party_type=PartyType.CUSTOMER))
+            async with get_session() as db:
+                await db.rollback() # what a repository's error handler does before re-raising
+        raised = False
+    except RollbackOnlyError:
+        raised = True
+    kept = await PartyRepository.get_by_code(code) is not None
+
+    print(f"Swallowed inner rollback: raised={raised} party kept={kept}")
+    assert raised, "expected RollbackOnlyError"
+    assert not kept, "the unit of work's writes must be discarded"
+    print("OK")
+
+async def main():
+    await check_voucher_issue()
+    await check_swallowed_rollback()
+
+if __name__ == "__main__":
+    asyncio.run(main())
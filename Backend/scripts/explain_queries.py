@@ -0,0 +1,250 @@
+"""
+EXPLAIN every repository read query and fail on sequential scans of large tables.
+
+Each case calls a real repository method against the configured (seeded) database,
+captures the SQL it sends, and EXPLAINs every captured read (SELECT or WITH). A case
+that sends no read at all fails, since nothing was checked. A sequential scan on a
+table holding more than --min-rows rows is a regression, unless the case explicitly
+allows it (full-table reports, substring search, unordered pages).
+
+Usage:
+    python scripts/explain_queries.py [--min-rows 1000] [--verbose]
+
+Exits with status 1 when a regression is found, so it can gate CI.
+Works on PostgreSQL (EXPLAIN FORMAT JSON) and SQLite (EXPLAIN QUERY PLAN).
+"""
+import asyncio
+import argparse
+import json
+import re
+import sys
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+
+from app.core.database import Base, engine, init_db
+from app.features.users.user_entity import User
+from app.features.parties.party_entity import Party
+from app.features.transactions.transaction_entity import Transaction
+from app.features.inventory.inventory_entity import Item, CustomerItemRate
+from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem, VoucherType
+from app.features.fleet.fleet_entity import Vehicle, Driver
+from app.features.trips.trip_entity import Trip, TripExpense
+from app.features.notifications.notification_entity import Notification
+
+from app.features.users.user_repository import UserRepository
+from app.features.parties.party_repository import PartyRepository
+from app.features.transactions.transaction_repository import TransactionRepository
+from app.features.inventory.inventory_repository import InventoryRepository
+from app.features.vouchers.voucher_repository import VoucherRepository
+from app.features.fleet.fleet_repository import FleetRepository
+from app.features.trips.trip_repository import TripRepository
+from app.features.notifications.notification_repository import NotificationRepository
+from app.features.dashboard.dashboard_repository import DashboardRepository
+
+class Case(NamedTuple):
+    name: str
+    call: Callable[[Dict], Awaitable]
+    allow_seq_scan: FrozenSet[str] = frozenset()
+
+def allow(*tables: str) -> FrozenSet[str]:
+    return frozenset(tables)
+
+async def next_page(fetch: Callable[[Optional[str]], Awaitable]):
+    """Fetch the page after the first one, so the keyset (cursor) predicate is explained too."""
+    page = await fetch(None)
+    if page.next_cursor:
+        await fetch(page.next_cursor)
+
+# A narrow, past window so date-range reports must use their index rather than read everything
+DAY_START = datetime.now() - timedelta(days=1)
+DAY_END = datetime.now()
+
+CASES: List[Case] = [
+    # Parties
+    Case("PartyRepository.get_by_id", lambda s: PartyRepository.get_by_id(s["party_id"])),
+    Case("PartyRepository.get_by_code", lambda s: PartyRepository.get_by_code(s["party_code"])),
+    Case("PartyRepository.get_all", lambda s: PartyRepository.get_all()),
+    Case("PartyRepository.get_all(search)", lambda s: PartyRepository.get_all(search="star"), allow("parties")),
+    Case("PartyRepository.get_all(cursor)", lambda s: next_page(lambda c: PartyRepository.get_all(cursor=c))),
+    # Ledger
+    Case("TransactionRepository.get_all", lambda s: TransactionRepository.get_all()),
+    Case("TransactionRepository.get_all(cursor)", lambda s: next_page(lambda c: TransactionRepository.get_all(cursor=c))),
+    Case("TransactionRepository.get_by_party", lambda s: TransactionRepository.get_by_party(s["party_id"])),
+    Case("TransactionRepository.get_by_id", lambda s: TransactionRepository.get_by_id(s["transaction_id"])),
+    # Inventory
+    Case("InventoryRepository.get_item_by_id", lambda s: InventoryRepository.get_item_by_id(s["item_id"])),
+    Case("InventoryRepository.get_item_by_code", lambda s: InventoryRepository.get_item_by_code(s["item_code"])),
+    Case("InventoryRepository.get_items_by_ids", lambda s: InventoryRepository.get_items_by_ids([s["item_id"], s["item_id"] + 1])),
+    Case("InventoryRepository.get_all_items", lambda s: InventoryRepository.get_all_items()),
+    Case("InventoryRepository.get_all_items(search)", lambda s: InventoryRepository.get_all_items(search="cement"), allow("items")),
+    Case("InventoryRepository.get_best_price", lambda s: InventoryRepository.get_best_price(s["item_id"], s["party_id"])),
+    # Vouchers
+    Case("VoucherRepository.get_by_id", lambda s: VoucherRepository.get_by_id(s["voucher_id"])),
+    Case("VoucherRepository.get_all", lambda s: VoucherRepository.get_all()),
+    Case("VoucherRepository.get_all(type)", lambda s: VoucherRepository.get_all(voucher_type=VoucherType.INVOICE)),
+    Case("VoucherRepository.get_all(cursor)", lambda s: next_page(lambda c: VoucherRepository.get_all(cursor=c))),
+    # Fleet (unordered pages stop after LIMIT rows)
+    Case("FleetRepository.get_all_vehicles", lambda s: FleetRepository.get_all_vehicles(), allow("vehicles")),
+    Case("FleetRepository.get_all_drivers", lambda s: FleetRepository.get_all_drivers(), allow("drivers")),
+    Case("FleetRepository.get_vehicle_by_number", lambda s: FleetRepository.get_vehicle_by_number(s["vehicle_number"])),
+    Case("FleetRepository.get_driver_by_id", lambda s: FleetRepository.get_driver_by_id(s["driver_id"])),
+    Case("FleetRepository.get_driver_by_phone", lambda s: FleetRepository.get_driver_by_phone("9999999999")),
+    Case("FleetRepository.get_driver_by_telegram_id", lambda s: FleetRepository.get_driver_by_telegram_id("0")),
+    # Trips
+    Case("TripRepository.get_all", lambda s: TripRepository.get_all()),
+    Case("TripRepository.get_all(vehicle)", lambda s: TripRepository.get_all(vehicle_id=s["vehicle_id"])),
+    Case("TripRepository.get_all(cursor)", lambda s: next_page(lambda c: TripRepository.get_all(cursor=c))),
+    Case("TripRepository.get_by_id", lambda s: TripRepository.get_by_id(s["trip_id"])),
+    Case("TripRepository.get_expenses", lambda s: TripRepository.get_expenses(s["trip_id"])),
+    Case("TripRepository.get_active_trip_by_driver", lambda s: TripRepository.get_active_trip_by_driver(s["driver_id"])),
+    # Users
+    Case("UserRepository.get_by_id", lambda s: UserRepository.get_by_id(s["user_id"])),
+    Case("UserRepository.get_by_username", lambda s: UserRepository.get_by_username("admin")),
+    Case("UserRepository.get_by_email", lambda s: UserRepository.get_by_email("admin@example.com")),
+    Case("UserRepository.get_by_phone", lambda s: UserRepository.get_by_phone("9999999999")),
+    Case("UserRepository.get_by_telegram_chat_id", lambda s: UserRepository.get_by_telegram_chat_id("0")),
+    # users is a small staff table; listing it or filtering admins is expected to scan
+    Case("UserRepository.get_multi", lambda s: UserRepository.get_multi(), allow("users")),
+    Case("UserRepository.get_admins_with_telegram", lambda s: UserRepository.get_admins_with_telegram(), allow("users")),
+    # Notifications
+    Case("NotificationRepository.get_for_user", lambda s: NotificationRepository.get_for_user(s["user_id"])),
+    Case("NotificationRepository.get_for_user(unread)", lambda s: NotificationRepository.get_for_user(s["user_id"], unread_only=True)),
+    Case("NotificationRepository.get_for_user(cursor)", lambda s: next_page(lambda c: NotificationRepository.get_for_user(s["user_id"], cursor=c))),
+    # Dashboard (whole-table reports are expected to scan)
+    Case("DashboardRepository.get_financial_summary", lambda s: DashboardRepository.get_financial_summary(DAY_START, DAY_END), allow("parties")),
+    Case("DashboardRepository.get_trip_stats", lambda s: DashboardRepository.get_trip_stats(DAY_START, DAY_END)),
+    Case("DashboardRepository.get_revenue_trends", lambda s: DashboardRepository.get_revenue_trends(days=1)),
+    Case("DashboardRepository.get_top_parties", lambda s: DashboardRepository.get_top_parties()),
+    Case("DashboardRepository.get_inventory_alerts", lambda s: DashboardRepository.get_inventory_alerts(), allow("items")),
+    Case("DashboardRepository.get_fleet_overview", lambda s: DashboardRepository.get_fleet_overview(), allow("vehicles", "drivers")),
+]
+
+# --- Statement capture ---
+
+_captured: Optional[List[Tuple[str, object]]] = None
+# Reads, including CTE queries ("WITH ... SELECT") and parenthesised unions
+_READ = re.compile(r"^[\s(]*(SELECT|WITH)\b", re.IGNORECASE)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if _captured is not None and _READ.match(statement):
+        _captured.append((statement, parameters))
+
+async def capture_statements(case: Case, samples: Dict) -> List[Tuple[str, object]]:
+    global _captured
+    _captured = []
+    try:
+        await case.call(samples)
+        return _captured
+    finally:
+        _captured = None
+
+# --- Plans ---
+
+def _pg_seq_scans(plan: Dict) -> List[str]:
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        tables.extend(_pg_seq_scans(child))
+    return tables
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+
+async def seq_scanned_tables(conn, dialect: str, statement: str, parameters) -> Tuple[List[str], str]:
+    """Tables read by a sequential scan, plus the plan as text for --verbose."""
+    if dialect == "postgresql":
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        raw = result.scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        return _pg_seq_scans(plan), json.dumps(plan, indent=2)
+
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    details = [row[-1] for row in result.all()]
+    tables = []
+    for detail in details:
+        match = _SQLITE_SCAN.match(detail)
+        if match and "USING" not in detail:
+            tables.append(match.group(1))
+    return tables, "\n".join(details)
+
+async def table_sizes() -> Dict[str, int]:
+    sizes = {}
+    async with engine.connect() as conn:
+        for table in Base.metadata.sorted_tables:
+            sizes[table.name] = (await conn.execute(select(func.count()).select_from(table))).scalar()
+    return sizes
+
+async def sample_values() -> Dict:
+    """Real ids/codes from the seeded data, so lookups hit existing rows."""
+    async def first(column, default):
+        async with engine.connect() as conn:
+            value = (await conn.execute(select(column).limit(1))).scalar()
+        return value if value is not None else default
+
+    return {
+        "party_id": await first(Party.id, 1),
+        "party_code": await first(Party.code, "P-0001"),
+        "transaction_id": await first(Transaction.id, 1),
+        "item_id": await first(Item.id, 1),
+        "item_code": await first(Item.code, "I-0001"),
+        "voucher_id": await first(TradeVoucher.id, 1),
+        "vehicle_id": await first(Vehicle.id, 1),
+        "vehicle_number": await first(Vehicle.vehicle_number, "WB00A0000"),
+        "driver_id": await first(Driver.id, 1),
+        "trip_id": await first(Trip.id, 1),
+        "user_id": await first(User.id, 1),
+    }
+
+async def main(min_rows: int, verbose: bool) -> int:
+    await init_db()
+    dialect = engine.dialect.name
+    sizes = await table_sizes()
+    samples = await sample_values()
+    large = {name for name, count in sizes.items() if count > min_rows}
+    print(f"Dialect: {dialect}. Tables above {min_rows} rows: {', '.join(sorted(large)) or 'none'}\n")
+
+    failures = 0
+    for case in CASES:
+        statements = await capture_statements(case, samples)
+        problems = []
+        async with engine.connect() as conn:
+            for statement, parameters in statements:
+                scanned, plan_text = await seq_scanned_tables(conn, dialect, statement, parameters)
+                bad = [t for t in scanned if t in large and t not in case.allow_seq_scan]
+                if bad:
+                    problems.append((bad, statement, plan_text))
+                elif verbose:
+                    print(f"    {' '.join(statement.split())[:120]}\n      {plan_text.replace(chr(10), chr(10) + '      ')}")
+
+        if not statements:
+            # Nothing was explained, so nothing was checked (e.g. a statement kind the capture misses)
+            failures += 1
+            print(f"FAIL {case.name}: no queries captured")
+        elif problems:
+            failures += 1
+            print(f"FAIL {case.name}")
+            for bad, statement, plan_text in problems:
+                print(f"     seq scan on {', '.join(bad)}: {' '.join(statement.split())[:200]}")
+                if verbose:
+                    print(f"     {plan_text}")
+        else:
+            print(f"ok   {case.name} ({len(statements)} queries)")
+
+    print(f"\n{len(CASES) - failures}/{len(CASES)} cases free of large sequential scans")
+    await engine.dispose()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-rows", type=int, default=1000, help="Only flag sequential scans on tables larger than this")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.min_rows, args.verbose)))
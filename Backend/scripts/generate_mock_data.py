@@ -19,6 +19,7 @@ from app.features.inventory.inventory_entity import Item, ItemType, ItemCategory
 from app.features.fleet.fleet_entity import Vehicle, Driver, VehicleType, VehicleStatus, DriverStatus
 from app.features.trips.trip_entity import Trip, TripExpense, TripStatus
 from app.features.vouchers.voucher_entity import TradeVoucher, VoucherItem, VoucherType, VoucherStatus
+from app.features.dashboard.dashboard_rollup_repository import rebuild_rollups
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -45,7 +46,7 @@ async def generate_mock_data():
         print("Scrubbing/Preparing data...", flush=True)
         
         # 1. Ensure we have an admin and some users
-        hashed_password = AuthHelper.hash_password("password123")
+        hashed_password = await AuthHelper.hash_password_async("password123")
         
         users = [
             User(username="manager1", email="m1@bluestart.com", full_name="Manager One", role=UserRole.MANAGER, hashed_password=hashed_password),
@@ -257,7 +258,11 @@ async def generate_mock_data():
                 ))
 
         await db.commit()
-        print("Mock data generated successfully for the last 1 week!", flush=True)
+
+    # db.add bypasses the repositories' rollup updates; recompute the dashboard rollups
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_rollups)
+    print("Mock data generated successfully for the last 1 week!", flush=True)
 
 if __name__ == "__main__":
     asyncio.run(generate_mock_data())
@@ -0,0 +1,38 @@
+"""
+Recompute the daily dashboard rollups (daily_sales_rollup, daily_trip_rollup) from the
+raw vouchers and trips, in one transaction.
+
+Use after backfills or bulk edits made outside the repositories. Day-to-day writes keep
+the rollups current on their own.
+
+Usage:
+    python scripts/rebuild_rollups.py
+"""
+import asyncio
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from sqlalchemy import func, select
+
+from app.core.database import engine, init_db, close_db
+from app.core.logger import logger, setup_logging
+from app.core.schema import set_schema_meta
+from app.features.dashboard.dashboard_entity import DailySalesRollup, DailyTripRollup
+from app.features.dashboard.dashboard_rollup_repository import ROLLUP_VERSION, ROLLUP_VERSION_KEY, rebuild_rollups
+
+async def main():
+    setup_logging()
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_rollups)
+        await conn.run_sync(set_schema_meta, ROLLUP_VERSION_KEY, str(ROLLUP_VERSION))
+        sales_days = (await conn.execute(select(func.count(func.distinct(DailySalesRollup.day))))).scalar()
+        trip_days = (await conn.execute(select(func.count(func.distinct(DailyTripRollup.day))))).scalar()
+    logger.info(f"Rollups rebuilt: {sales_days} days of vouchers, {trip_days} days of trips")
+    await close_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
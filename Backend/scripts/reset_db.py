@@ -15,6 +15,7 @@ async def reset_database():
     async with engine.begin() as conn:
         # Import all entities to ensure they are registered with Base.metadata
         from app.features.users.user_entity import User
+        from app.features.auth.auth_entity import TokenRevocation
         from app.features.parties.party_entity import Party
         from app.features.transactions.transaction_entity import Transaction
         from app.features.inventory.inventory_entity import Item, CustomerItemRate
@@ -22,6 +23,7 @@ async def reset_database():
         from app.features.fleet.fleet_entity import Vehicle, Driver
         from app.features.trips.trip_entity import Trip, TripExpense
         from app.features.notifications.notification_entity import Notification
+        from app.features.dashboard.dashboard_entity import DailySalesRollup, DailyTripRollup
 
         logger.info("Dropping all tables...")
         await conn.run_sync(Base.metadata.drop_all)
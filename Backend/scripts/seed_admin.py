@@ -31,7 +31,7 @@ async def create_initial_admin():
             print("Password change requirement cleared for existing admin.")
             return
 
-        hashed_password = AuthHelper.hash_password(password)
+        hashed_password = await AuthHelper.hash_password_async(password)
         
         new_user = User(
             username=username,
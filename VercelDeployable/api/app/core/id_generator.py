@@ -1,37 +1,118 @@
-import random
-import string
-from sqlalchemy import select, func
-from app.core.database import SessionLocal
+import re
+import asyncio
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import String, Integer, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base, SessionLocal
+from app.core.config import settings
 
-class IDGenerator:
+class DocumentCounter(Base):
+    """Last number handed out per prefix and period, e.g. ("INV", "20240130") -> 17."""
+    __tablename__ = "document_counters"
+
+    prefix: Mapped[str] = mapped_column(String(20), primary_key=True)
+    period: Mapped[str] = mapped_column(String(20), primary_key=True) # "" for codes that never reset
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
+def dialect_insert(dialect_name: str):
+    """INSERT construct with ON CONFLICT support for the given dialect."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"No upsert support for dialect '{dialect_name}'")
+    return insert
+
+class IDGenerator:
+    # Per-process reserved blocks when ID_BLOCK_SIZE > 1: (prefix, period) -> [next, last]
+    _blocks: Dict[Tuple[str, str], List[int]] = {}
+    _locks: Dict[Tuple[str, str], asyncio.Lock] = {}
 
     @staticmethod
-    async def generate_transaction_id(prefix: str, entity_class, date_field="created_at") -> str:
+    async def generate_transaction_id(prefix: str, entity_class, number_field: str) -> str:
         """
-        Generates a smart ID like T-20240130-001.
-        Reset counts daily using the `date_field` column.
+        Generates a smart ID like T-20240130-001 (daily reset) or INV-FY2425-0001
+        (fiscal year reset, see ID_RESET_PERIOD). `number_field` is the entity's unique
+        number column, used once per period to continue after numbers already in the table.
         """
-        from datetime import datetime
-        from sqlalchemy import cast, Date
-        
-        today = datetime.now().date()
-        date_str = today.strftime("%Y%m%d")
-        
+        period = IDGenerator.current_period()
+        value = await IDGenerator._next_value(prefix, period, getattr(entity_class, number_field))
+        if period.startswith("FY"):
+            return f"{prefix}-{period}-{str(value).zfill(4)}"
+        return f"{prefix}-{period}-{str(value).zfill(3)}"
+
+    @staticmethod
+    async def generate_code(prefix: str, entity_class, code_field: str = "code") -> str:
+        """Generates a master-data code like P-001 that never resets."""
+        value = await IDGenerator._next_value(prefix, "", getattr(entity_class, code_field))
+        return f"{prefix}-{str(value).zfill(3)}"
+
+    @staticmethod
+    def current_period(today: Optional[date] = None) -> str:
+        today = today or datetime.now().date()
+        if settings.ID_RESET_PERIOD == "fiscal_year":
+            start_year = today.year if today.month >= settings.ID_FISCAL_YEAR_START_MONTH else today.year - 1
+            return f"FY{start_year % 100:02d}{(start_year + 1) % 100:02d}"
+        return today.strftime("%Y%m%d")
+
+    @staticmethod
+    async def _next_value(prefix: str, period: str, column) -> int:
+        block_size = max(1, settings.ID_BLOCK_SIZE)
+        if block_size == 1:
+            return await IDGenerator._reserve(prefix, period, 1, column)
+
+        key = (prefix, period)
+        lock = IDGenerator._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            block = IDGenerator._blocks.get(key)
+            if block is None or block[0] > block[1]:
+                last = await IDGenerator._reserve(prefix, period, block_size, column)
+                block = IDGenerator._blocks[key] = [last - block_size + 1, last]
+            value = block[0]
+            block[0] += 1
+            return value
+
+    @staticmethod
+    async def _reserve(prefix: str, period: str, count: int, column) -> int:
+        """Atomically advance the counter by `count` and return the last reserved value."""
+        # Own short transaction (not the caller's unit of work), so the counter row is
+        # locked only for this statement and concurrent creates never wait on each other
         async with SessionLocal() as db:
-            # Count records created TODAY
-            # We assume the entity has a field named by `date_field` (default: created_at)
-            column = getattr(entity_class, date_field)
-            
-            query = (
-                select(func.count())
-                .select_from(entity_class)
-                .where(cast(column, Date) == today)
+            result = await db.execute(
+                update(DocumentCounter)
+                .where(DocumentCounter.prefix == prefix, DocumentCounter.period == period)
+                .values(last_value=DocumentCounter.last_value + count)
+                .returning(DocumentCounter.last_value)
+                .execution_options(synchronize_session=False)
             )
-            result = await db.execute(query)
-            count = result.scalar()
-            
-            # Sequence is count + 1
-            sequence = str(count + 1).zfill(3)
-            
-            return f"{prefix}-{date_str}-{sequence}"
+            last = result.scalar_one_or_none()
+
+            if last is None:
+                # First number of this prefix/period: start after anything already issued
+                start = await IDGenerator._highest_existing(db, prefix, period, column)
+                insert = dialect_insert(db.get_bind().dialect.name)
+                stmt = insert(DocumentCounter).values(prefix=prefix, period=period, last_value=start + count)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[DocumentCounter.prefix, DocumentCounter.period],
+                    set_={"last_value": DocumentCounter.last_value + count},
+                ).returning(DocumentCounter.last_value)
+                last = (await db.execute(stmt)).scalar_one()
+
+            await db.commit()
+
+        # Drop blocks of earlier periods once a new one starts
+        for key in [k for k in IDGenerator._blocks if k[0] == prefix and k[1] != period]:
+            IDGenerator._blocks.pop(key, None)
+            IDGenerator._locks.pop(key, None)
+        return last
+
+    @staticmethod
+    async def _highest_existing(db: AsyncSession, prefix: str, period: str, column) -> int:
+        stem = f"{prefix}-{period}-" if period else f"{prefix}-"
+        pattern = re.compile(rf"^{re.escape(stem)}(\d+)$")
+        result = await db.execute(select(column).where(column.like(f"{stem}%")))
+        numbers = [int(m.group(1)) for value in result.scalars() if (m := pattern.match(value or ""))]
+        return max(numbers, default=0)
@@ -0,0 +1,47 @@
+"""
+In-process token buckets for throttling expensive public endpoints (e.g. login).
+
+Each key (a client IP, a username, a whole route) gets `burst` tokens that refill at
+`per_minute` per minute; a request spends one. Keys are kept in a bounded LRU so a flood
+of made-up usernames cannot grow memory without limit; an evicted key simply starts
+again with a full bucket. Per process, only touched from the event loop.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+class TokenBucketLimiter:
+    def __init__(self, name: str, burst: int, per_minute: float, max_keys: int):
+        self.name = name
+        self.burst = burst
+        self.refill_per_second = per_minute / 60
+        self.max_keys = max_keys
+        self.limited = 0
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict() # key -> (tokens, updated at)
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return float(self.burst)
+        tokens, updated_at = entry
+        return min(float(self.burst), tokens + (now - updated_at) * self.refill_per_second)
+
+    def wait_time(self, key: Hashable, now: float = None) -> float:
+        """Seconds until `key` has a token; 0 if it has one now. Spends nothing."""
+        now = time.monotonic() if now is None else now
+        missing = 1 - self._tokens(key, now)
+        if missing <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return missing / self.refill_per_second
+
+    def spend(self, key: Hashable, now: float = None):
+        now = time.monotonic() if now is None else now
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        return {"keys": len(self._buckets), "burst": self.burst, "per_minute": self.refill_per_second * 60, "limited": self.limited}
@@ -1,24 +1,29 @@
+from app.core.role_policy import RolePolicy
 from app.features.users.user_entity import UserRole
 
-# Dictionary mapping 'HTTP_METHOD:PATH_REGEX' to allowed roles
-# If a route is not in this map but is not public, we can decide policies (allow all authenticated or block).
-# Here we will define specific protected routes.
+# "METHOD /path" exactly as the route is registered (with the /api prefix and FastAPI's
+# {param} syntax) -> allowed roles. Routes not listed are open to every authenticated role.
+# main.py validates the entries against the route table at startup, so a typo or a
+# renamed route fails the boot instead of silently leaving the route open.
 
 ROLE_MAPPING = {
     # User Management
-    r"GET:^/users/$": [UserRole.ADMIN, UserRole.MANAGER],
-    r"GET:^/users/\d+$": [UserRole.ADMIN, UserRole.MANAGER, UserRole.USER],
-    r"PATCH:^/users/activate/\d+$": [UserRole.ADMIN],
-    r"PATCH:^/users/deactivate/\d+$": [UserRole.ADMIN],
-    
+    "GET /api/users/": [UserRole.ADMIN, UserRole.MANAGER],
+    "GET /api/users/{user_id}": [UserRole.ADMIN, UserRole.MANAGER, UserRole.USER],
+    "PATCH /api/users/activate/{user_id}": [UserRole.ADMIN],
+    "PATCH /api/users/deactivate/{user_id}": [UserRole.ADMIN],
+
     # Parties
-    r"DELETE:^/parties/\d+$": [UserRole.ADMIN],                # Only Admin can delete parties
+    "DELETE /api/parties/{party_id}": [UserRole.ADMIN],                # Only Admin can delete parties
+
+    # Vouchers: issuing is a PATCH /api/vouchers/{voucher_id} with status=ISSUED, which the
+    # path alone can't tell apart from any other edit, so it has no entry here.
 
-    # Vouchers
-    r"PATCH:^/api/vouchers/issue/\d+$": [UserRole.ADMIN],      # Only Admin can issue vouchers
-    
-    # Default policy for other routes:
-    # If not matched, we grant access to all authenticated users by default? 
-    # Or strict blocking? 
-    # For now, let's assume if it is not here, any valid Role is allowed.
+    # Bulk exports (financial data, not for drivers)
+    "GET /api/vouchers/export": [UserRole.ADMIN, UserRole.MANAGER, UserRole.USER],
+    "GET /api/transactions/export": [UserRole.ADMIN, UserRole.MANAGER, UserRole.USER],
+    "GET /api/trips/export": [UserRole.ADMIN, UserRole.MANAGER, UserRole.USER],
 }
+
+# Compiled once at import; AuthMiddleware looks requests up here
+ROLE_POLICY = RolePolicy(ROLE_MAPPING)
@@ -0,0 +1,114 @@
+"""
+ROLE_MAPPING compiled for AuthMiddleware: one path-segment trie per HTTP method.
+
+A lookup walks the request path once, segment by segment, so it costs the same however
+many rules there are. Literal segments win over path parameters ("/api/vouchers/export"
+over "/api/vouchers/{voucher_id}"); parameter branches are copied into their literal
+siblings at compile time, so a lookup never has to back up and try the parameter.
+
+`validate` checks the policy against the registered routes: every entry must name a
+route, and no route may fall under another route's entry.
+"""
+import copy
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+RouteKey = Tuple[str, str] # (method, path as registered, e.g. "/api/users/{user_id}")
+
+_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+# Path segments never contain "/", so these keys can't collide with one
+_PARAM = "/param"
+_RULE = "/rule"
+
+def _is_param(segment: str) -> bool:
+    return segment.startswith("{") and segment.endswith("}")
+
+def _merge(into: dict, other: dict):
+    """Copy `other`'s branches into `into`; what `into` already has wins."""
+    for key, value in other.items():
+        if key == _RULE:
+            into.setdefault(_RULE, value)
+        elif key in into:
+            _merge(into[key], value)
+        else:
+            into[key] = copy.deepcopy(value)
+
+def _resolve_overlaps(node: dict):
+    param = node.get(_PARAM)
+    if param is not None:
+        for segment, child in node.items():
+            # A parameter never matches an empty segment (trailing slash)
+            if segment not in (_PARAM, _RULE, ""):
+                _merge(child, param)
+    for segment, child in node.items():
+        if segment != _RULE:
+            _resolve_overlaps(child)
+
+def registered_routes(routes: Sequence) -> Iterator[RouteKey]:
+    """(method, path) of every HTTP route, router prefixes included."""
+    for route in routes:
+        contexts = getattr(route, "effective_route_contexts", None)
+        if contexts is not None:
+            # Routers included by reference (newer FastAPI): the prefixed path is on the context
+            for context in contexts():
+                for method in getattr(context.original_route, "methods", None) or ():
+                    yield method, context.path
+        else:
+            for method in getattr(route, "methods", None) or ():
+                yield method, route.path
+
+class RolePolicy:
+    def __init__(self, mapping: Mapping[str, Iterable]):
+        """`mapping`: "METHOD /path" (FastAPI path syntax) -> allowed roles."""
+        self.rules: Dict[RouteKey, FrozenSet[str]] = {}
+        for key, roles in mapping.items():
+            method, _, path = key.partition(" ")
+            if method not in _METHODS or not path.startswith("/"):
+                raise ValueError(f"Role rule '{key}' must look like 'GET /api/...'")
+            for segment in path.split("/"):
+                if ("{" in segment or "}" in segment) and (not _is_param(segment) or ":" in segment):
+                    raise ValueError(f"Role rule '{key}': only whole-segment parameters like '{{id}}' are supported")
+            self.rules[(method, path)] = frozenset(str(getattr(role, "value", role)) for role in roles)
+        self._tries = self._compile()
+
+    def _compile(self) -> Dict[str, dict]:
+        tries: Dict[str, dict] = {}
+        for method, path in self.rules:
+            # Starlette answers HEAD with the GET endpoint, so it gets the same rule
+            for trie_method in (method, "HEAD") if method == "GET" else (method,):
+                node = tries.setdefault(trie_method, {})
+                for segment in path.split("/"):
+                    node = node.setdefault(_PARAM if _is_param(segment) else segment, {})
+                node[_RULE] = (method, path)
+        for trie in tries.values():
+            _resolve_overlaps(trie)
+        return tries
+
+    def match(self, method: str, path: str) -> Optional[RouteKey]:
+        """The entry that governs a request (or a registered path), if any."""
+        node = self._tries.get(method)
+        if node is None:
+            return None
+        for segment in path.split("/"):
+            child = node.get(segment)
+            if child is None and segment:
+                child = node.get(_PARAM)
+            if child is None:
+                return None
+            node = child
+        return node.get(_RULE)
+
+    def allowed_roles(self, method: str, path: str) -> Optional[FrozenSet[str]]:
+        """Roles allowed on the request, or None if no entry applies (any authenticated role)."""
+        rule = self.match(method, path)
+        return self.rules[rule] if rule is not None else None
+
+    def validate(self, routes: Iterable[RouteKey]):
+        """Raise RuntimeError if an entry names no route or a route falls under another route's entry."""
+        registered = set(routes)
+        problems: List[str] = [f"'{method} {path}' matches no route" for method, path in self.rules if (method, path) not in registered]
+        for method, path in sorted(registered):
+            rule = self.match(method, path)
+            if rule is not None and rule != (method, path) and not (method == "HEAD" and rule == ("GET", path)):
+                problems.append(f"'{method} {path}' would get the roles of '{rule[0]} {rule[1]}'; give it its own entry")
+        if problems:
+            raise RuntimeError("ROLE_MAPPING does not fit the registered routes:\n  " + "\n  ".join(problems))
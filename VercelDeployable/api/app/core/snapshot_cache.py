@@ -0,0 +1,70 @@
+"""
+In-process stale-while-revalidate cache for expensive read models (e.g. the dashboard).
+
+- A cold key is computed once and every concurrent caller awaits the same load (single-flight).
+- A key older than `ttl_seconds` is served as-is while one background load replaces it.
+- `invalidate()` drops every entry after a write; loads that started before it are not stored.
+
+The cache is per process: on serverless each instance keeps its own copy and only sees
+its own invalidations, so `ttl_seconds` bounds how stale another instance can get.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, NamedTuple, TypeVar
+from app.core.logger import logger
+
+T = TypeVar("T")
+
+class Snapshot(NamedTuple):
+    value: Any
+    computed_at: float # time.monotonic() when the load finished
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.computed_at
+
+class SnapshotCache(Generic[T]):
+    def __init__(self, name: str, loader: Callable[[Hashable], Awaitable[T]], ttl_seconds: float):
+        self.name = name
+        self._loader = loader
+        self._ttl = ttl_seconds
+        self._entries: Dict[Hashable, Snapshot] = {}
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+
+    async def get(self, key: Hashable) -> Snapshot:
+        """Cached snapshot for `key`, loading it on a miss and refreshing it in the background once stale."""
+        snapshot = self._entries.get(key)
+        if snapshot is None:
+            # shield: a caller that disconnects must not cancel the load others are waiting on
+            return await asyncio.shield(self._load(key))
+        if snapshot.age > self._ttl:
+            self._load(key)
+        return snapshot
+
+    def invalidate(self):
+        """Forget every snapshot; the next read of each key loads fresh data."""
+        self._generation += 1
+        self._entries.clear()
+        self._loading.clear()
+
+    def _load(self, key: Hashable) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute(key, self._generation))
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    async def _compute(self, key: Hashable, generation: int) -> Snapshot:
+        snapshot = Snapshot(await self._loader(key), time.monotonic())
+        # A write landed while loading: hand the result to the callers already waiting, but don't cache it
+        if generation == self._generation:
+            self._entries[key] = snapshot
+        return snapshot
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"{self.name} cache: loading {key!r} failed: {task.exception()}")
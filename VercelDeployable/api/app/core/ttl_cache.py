@@ -0,0 +1,59 @@
+"""
+Small in-process TTL cache for per-request lookups (e.g. the current user).
+
+Entries expire `ttl_seconds` after they were stored and writers drop them with
+`invalidate(key)`, so the TTL only bounds how stale another process can be.
+Hits and misses are counted; `cache_stats()` reports every cache created here.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_caches: List["TTLCache"] = []
+
+class TTLCache(Generic[V]):
+    def __init__(self, name: str, ttl_seconds: float, max_size: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        _caches.append(self)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: V):
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    """Counters of every TTLCache in this process, by name."""
+    return {cache.name: cache.stats() for cache in _caches}
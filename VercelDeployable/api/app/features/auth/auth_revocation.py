@@ -0,0 +1,75 @@
+"""
+Token revocation: a user's tokens issued (`iat`) before their cutoff are rejected.
+
+The token_revocations table is shared by every worker. Each process keeps the cutoffs
+of the last TOKEN_REVOCATION_RETENTION_HOURS in a dict (older ones can't match a live
+token), so the check in AuthMiddleware is one lookup without a query. A process applies
+its own revocations immediately and reloads the table at most every
+TOKEN_REVOCATION_SYNC_SECONDS, which bounds how long another worker keeps accepting a
+revoked token.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.logger import logger
+from app.features.auth.auth_repository import TokenRevocationRepository
+
+def _epoch(moment: datetime) -> float:
+    return (moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)).timestamp()
+
+class TokenRevocationList:
+    def __init__(self, sync_interval: float, retention: timedelta):
+        self.sync_interval = sync_interval
+        self.retention = retention
+        self.rejected = 0
+        self.synced_at: Optional[float] = None
+        self._cutoffs: Dict[int, float] = {} # user id -> epoch seconds
+        self._lock = asyncio.Lock()
+
+    def is_revoked(self, payload: dict) -> bool:
+        cutoff = self._cutoffs.get(payload.get("id"))
+        # Tokens from before `iat` was issued count as infinitely old
+        if cutoff is None or payload.get("iat", 0) >= cutoff:
+            return False
+        self.rejected += 1
+        return True
+
+    async def revoke(self, user_id: int):
+        """Reject every token of the user issued until now, here and (after their next sync) on other workers."""
+        now = datetime.now(timezone.utc)
+        await TokenRevocationRepository.revoke(user_id, now.replace(tzinfo=None))
+        self._cutoffs[user_id] = max(self._cutoffs.get(user_id, 0.0), now.timestamp())
+
+    def _is_due(self) -> bool:
+        return self.synced_at is None or time.monotonic() - self.synced_at >= self.sync_interval
+
+    async def sync_if_due(self):
+        if self._is_due():
+            async with self._lock:
+                if self._is_due():
+                    await self._sync()
+
+    async def _sync(self):
+        horizon = datetime.now(timezone.utc) - self.retention
+        try:
+            rows = await TokenRevocationRepository.get_since(horizon.replace(tzinfo=None))
+        except Exception as e:
+            # Keep what we have; local revocations still apply. Retried after the interval.
+            logger.warning(f"Token revocation sync failed: {e}")
+            rows = []
+        # Merge rather than replace: a revocation made here while the query ran must not be lost
+        cutoffs = {user_id: cutoff for user_id, cutoff in self._cutoffs.items() if cutoff > horizon.timestamp()}
+        for user_id, revoked_at in rows:
+            cutoffs[user_id] = max(cutoffs.get(user_id, 0.0), _epoch(revoked_at))
+        self._cutoffs = cutoffs
+        self.synced_at = time.monotonic()
+
+    def stats(self) -> Dict[str, int]:
+        return {"revoked_users": len(self._cutoffs), "rejected": self.rejected}
+
+revoked_tokens = TokenRevocationList(
+    settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    timedelta(hours=settings.TOKEN_REVOCATION_RETENTION_HOURS),
+)
@@ -23,7 +23,7 @@ class AuthService:
         
         # Hash password and create user
         final_password = password or settings.DEFAULT_PASSWORD
-        hashed_password = AuthHelper.hash_password(final_password)
+        hashed_password = await AuthHelper.hash_password_async(final_password)
         new_user = await UserRepository.create(user_in, hashed_password, require_password_change)
         return UserResponse.model_validate(new_user)
 
@@ -40,38 +40,27 @@ class AuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid username or password"
             )
-        # 2. Check Lockout - using timezone-aware usage
-        if user.lockout_until:
-            # Add timezone info to now() if lockout_until is timezone aware
-            # Assuming DB stores aware datetimes or UTC
-            now = datetime.now(timezone.utc) if user.lockout_until.tzinfo else datetime.now()
-            
-            if user.lockout_until > now:
-                 wait_minutes = int((user.lockout_until - now).total_seconds() / 60)
-                 raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Account locked. Try again in {wait_minutes + 1} minutes."
-                )
-            else:
-                 # Lockout expired, perform reset inside login flow or here
-                 # We rely on successful login to reset, or reset explicitly
-                 pass
+        # 2. Check Lockout. Stored datetimes are UTC, naive if the DB is naive
+        now = datetime.now(timezone.utc)
+        if not user.created_at.tzinfo:
+            now = now.replace(tzinfo=None)
+        if user.lockout_until and user.lockout_until > now:
+            wait_minutes = int((user.lockout_until - now).total_seconds() / 60)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Account locked. Try again in {wait_minutes + 1} minutes."
+            )
         # 3. Verify Password
-        if not AuthHelper.verify_password(password, user.hashed_password):
+        if not await AuthHelper.verify_password_async(password, user.hashed_password):
             logger.warning(f"Failed login attempt for username: {username}")
             
-            # Increment failed attempts
-            attempts = await UserRepository.increment_failed_login(user.id)
+            # Increment failed attempts and lock at the limit in one statement, so parallel
+            # attempts can't lose a count or skip the lockout
+            lockout_time = now + timedelta(minutes=settings.LOGIN_LOCKOUT_MINUTES)
+            attempts = await UserRepository.record_login_failure(user.id, settings.MAX_LOGIN_ATTEMPTS, lockout_time)
             
             if attempts >= settings.MAX_LOGIN_ATTEMPTS:
-                lockout_time = datetime.now(timezone.utc) + timedelta(minutes=settings.LOGIN_LOCKOUT_MINUTES)
-                # Remove timezone info if your DB is naive, but recommneded usage is aware
-                if not user.created_at.tzinfo: # minimal check to match db style
-                     lockout_time = lockout_time.replace(tzinfo=None)
-                
-                await UserRepository.lockout_user(user.id, lockout_time)
                 logger.warning(f"User {username} exceeded max login attempts. Locked out.")
-                
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Account locked due to too many failed attempts. Try again in {settings.LOGIN_LOCKOUT_MINUTES} minutes."
@@ -88,9 +77,14 @@ class AuthService:
                 detail="User account is deactivated"
             )
         
-        # 5. Success - Reset failures and update login info
-        await UserRepository.reset_failed_login(user.id)
-        await UserRepository.update_last_login(user.id, ip_address=ip_address)
+        # 5. Success - Reset failures and update login info, returning the row as stored now
+        user = await UserRepository.record_login_success(user.id, now, ip_address=ip_address)
+        if not user:
+            # Locked by a parallel failed attempt since we read the user
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Account locked due to too many failed attempts. Try again in {settings.LOGIN_LOCKOUT_MINUTES} minutes."
+            )
         
         # Generate token
         access_token = AuthHelper.create_access_token(
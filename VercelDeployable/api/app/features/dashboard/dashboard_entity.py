@@ -0,0 +1,33 @@
+from datetime import date
+from sqlalchemy import Date, Enum, Float, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from app.features.vouchers.voucher_entity import VoucherType, VoucherStatus
+from app.features.trips.trip_entity import TripStatus
+
+# Daily rollups keep dashboard reads proportional to the number of days, not rows.
+# Maintained incrementally by the voucher/trip writers (see dashboard_rollup_repository).
+
+class DailySalesRollup(Base):
+    """Vouchers per voucher_date, type and status."""
+    __tablename__ = "daily_sales_rollup"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    voucher_type: Mapped[VoucherType] = mapped_column(Enum(VoucherType), primary_key=True)
+    status: Mapped[VoucherStatus] = mapped_column(Enum(VoucherStatus), primary_key=True)
+
+    voucher_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    grand_total: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+class DailyTripRollup(Base):
+    """Trips per start date and status."""
+    __tablename__ = "daily_trip_rollup"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[TripStatus] = mapped_column(Enum(TripStatus), primary_key=True)
+
+    trip_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    freight_income: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    diesel_expense: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    toll_expense: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    driver_allowance: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
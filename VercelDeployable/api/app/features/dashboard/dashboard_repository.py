@@ -1,102 +1,89 @@
 from datetime import datetime, timedelta
-from sqlalchemy import select, func, and_
-from app.core.database import SessionLocal
-from app.features.vouchers.voucher_entity import TradeVoucher, VoucherType, VoucherStatus
+from sqlalchemy import select, func, and_, true
+from app.core.database import get_session
+from app.features.vouchers.voucher_entity import VoucherType, VoucherStatus
 from app.features.transactions.transaction_entity import Transaction, TransactionType
-from app.features.trips.trip_entity import Trip
 from app.features.parties.party_entity import Party
+from app.features.dashboard.dashboard_entity import DailySalesRollup, DailyTripRollup
 from app.core.logger import logger
 
-class DashboardRepository:
-    @staticmethod
-    async def get_sales_stats(start_date: datetime, end_date: datetime):
-        async with SessionLocal() as db:
-            # 1. Total Sales (Issued Invoices)
-            sales_query = select(
-                func.sum(TradeVoucher.grand_total),
-                func.count(TradeVoucher.id),
-                func.avg(TradeVoucher.grand_total)
-            ).where(
-                and_(
-                    TradeVoucher.voucher_type == VoucherType.INVOICE,
-                    TradeVoucher.status == VoucherStatus.ISSUED,
-                    TradeVoucher.voucher_date >= start_date.date(),
-                    TradeVoucher.voucher_date <= end_date.date()
-                )
-            )
-            sales_result = await db.execute(sales_query)
-            total_sales, sales_count, avg_sales = sales_result.one()
+def _voucher_totals(start_date: datetime, end_date: datetime):
+    """Issued sales and purchases in the period, from the daily rollup (one row per day and type)."""
+    is_sale = DailySalesRollup.voucher_type == VoucherType.INVOICE
+    is_purchase = DailySalesRollup.voucher_type == VoucherType.BILL
+    return select(
+        func.sum(DailySalesRollup.grand_total).filter(is_sale).label("total_sales"),
+        func.sum(DailySalesRollup.voucher_count).filter(is_sale).label("sales_count"),
+        func.sum(DailySalesRollup.grand_total).filter(is_purchase).label("total_purchases")
+    ).where(
+        and_(
+            DailySalesRollup.voucher_type.in_([VoucherType.INVOICE, VoucherType.BILL]),
+            DailySalesRollup.status == VoucherStatus.ISSUED,
+            DailySalesRollup.day >= start_date.date(),
+            DailySalesRollup.day <= end_date.date()
+        )
+    )
 
-            # 2. Total Purchases (Issued Bills)
-            purchase_query = select(func.sum(TradeVoucher.grand_total)).where(
-                and_(
-                    TradeVoucher.voucher_type == VoucherType.BILL,
-                    TradeVoucher.status == VoucherStatus.ISSUED,
-                    TradeVoucher.voucher_date >= start_date.date(),
-                    TradeVoucher.voucher_date <= end_date.date()
-                )
-            )
-            purchase_result = await db.execute(purchase_query)
-            total_purchases = purchase_result.scalar() or 0.0
-            
-            return {
-                "total_sales_amount": total_sales or 0.0,
-                "sales_count": sales_count or 0,
-                "average_sales_value": float(avg_sales or 0.0),
-                "total_purchase_amount": total_purchases
-            }
+def _balance_totals():
+    """Sum of all party balances (Positive = Receivable, Negative = Payable)."""
+    return select(
+        func.sum(Party.current_balance).filter(Party.current_balance > 0).label("receivable"),
+        func.sum(Party.current_balance).filter(Party.current_balance < 0).label("payable")
+    )
 
+def _sales_stats(row) -> dict:
+    total_sales = row.total_sales or 0.0
+    sales_count = row.sales_count or 0
+    return {
+        "total_sales_amount": total_sales,
+        "sales_count": sales_count,
+        "average_sales_value": float(total_sales / sales_count) if sales_count else 0.0,
+        "total_purchase_amount": row.total_purchases or 0.0
+    }
+
+def _balance_stats(row) -> dict:
+    return {"total_receivable": row.receivable or 0.0, "total_payable": abs(row.payable or 0.0)}
+
+class DashboardRepository:
     @staticmethod
-    async def get_outstanding_balance():
-        async with SessionLocal() as db:
-            # Sum of all Party Curren Balances (Positive = Receivable, Negative = Payable)
-            # Receivable
-            query_rec = select(func.sum(Party.current_balance)).where(Party.current_balance > 0)
-            result_rec = await db.execute(query_rec)
-            receivable = result_rec.scalar() or 0.0
-            
-            # Payable
-            query_pay = select(func.sum(Party.current_balance)).where(Party.current_balance < 0)
-            result_pay = await db.execute(query_pay)
-            payable = result_pay.scalar() or 0.0
-            
-            return {"total_receivable": receivable, "total_payable": abs(payable)}
+    async def get_financial_summary(start_date: datetime, end_date: datetime):
+        """Sales stats and outstanding balances in a single statement (two one-row CTEs)."""
+        async with get_session(read_only=True) as db:
+            vouchers = _voucher_totals(start_date, end_date).cte("voucher_totals")
+            balances = _balance_totals().cte("balance_totals")
+            query = select(vouchers, balances).select_from(vouchers.join(balances, true()))
+            row = (await db.execute(query)).one()
+            return {**_sales_stats(row), **_balance_stats(row)}
 
     @staticmethod
     async def get_trip_stats(start_date: datetime, end_date: datetime):
-        async with SessionLocal() as db:
-            # Stats by status
-            query_status = select(Trip.status, func.count(Trip.id)).where(
-                and_(Trip.start_date >= start_date, Trip.start_date <= end_date)
-            ).group_by(Trip.status)
-            result_status = await db.execute(query_status)
-            status_distribution = {row[0]: row[1] for row in result_status.all()}
-
-            # Total Metrics
-            query_metrics = select(
-                func.count(Trip.id),
-                func.sum(Trip.freight_income),
-                func.sum(Trip.diesel_expense),
-                func.sum(Trip.toll_expense),
-                func.sum(Trip.driver_allowance)
+        async with get_session(read_only=True) as db:
+            # Per-status counts and sums from the daily rollup; the totals are the sum of the groups
+            trip_count = func.sum(DailyTripRollup.trip_count)
+            query = select(
+                DailyTripRollup.status,
+                trip_count,
+                func.sum(DailyTripRollup.freight_income),
+                func.sum(DailyTripRollup.diesel_expense),
+                func.sum(DailyTripRollup.toll_expense),
+                func.sum(DailyTripRollup.driver_allowance)
             ).where(
-                and_(Trip.start_date >= start_date, Trip.start_date <= end_date)
-            )
-            result_metrics = await db.execute(query_metrics)
-            metrics = result_metrics.one_or_none()
-            
+                and_(DailyTripRollup.day >= start_date.date(), DailyTripRollup.day <= end_date.date())
+            ).group_by(DailyTripRollup.status).having(trip_count > 0)
+            rows = (await db.execute(query)).all()
+
             return {
-                "trip_count": metrics[0] or 0, 
-                "total_freight_revenue": metrics[1] or 0.0,
-                "total_diesel_cost": metrics[2] or 0.0,
-                "total_toll_cost": metrics[3] or 0.0,
-                "total_driver_cost": metrics[4] or 0.0,
-                "status_distribution": status_distribution
+                "trip_count": sum(row[1] for row in rows),
+                "total_freight_revenue": sum((row[2] or 0.0 for row in rows), 0.0),
+                "total_diesel_cost": sum((row[3] or 0.0 for row in rows), 0.0),
+                "total_toll_cost": sum((row[4] or 0.0 for row in rows), 0.0),
+                "total_driver_cost": sum((row[5] or 0.0 for row in rows), 0.0),
+                "status_distribution": {row[0]: row[1] for row in rows}
             }
 
     @staticmethod
     async def get_inventory_alerts():
-        async with SessionLocal() as db:
+        async with get_session(read_only=True) as db:
             from app.features.inventory.inventory_entity import Item
             query = select(Item).where(Item.current_stock <= Item.min_stock_level)
             result = await db.execute(query)
@@ -108,7 +95,7 @@ class DashboardRepository:
 
     @staticmethod
     async def get_fleet_overview():
-        async with SessionLocal() as db:
+        async with get_session(read_only=True) as db:
             from app.features.fleet.fleet_entity import Vehicle, Driver
             # Vehicles by status
             v_query = select(Vehicle.current_status, func.count(Vehicle.id)).group_by(Vehicle.current_status)
@@ -124,7 +111,7 @@ class DashboardRepository:
 
     @staticmethod
     async def get_top_parties(limit: int = 5):
-        async with SessionLocal() as db:
+        async with get_session(read_only=True) as db:
             # Top Customers by Receivable
             query_top_cust = select(Party.name, Party.current_balance).where(Party.current_balance > 0).order_by(Party.current_balance.desc()).limit(limit)
             result_cust = await db.execute(query_top_cust)
@@ -139,19 +126,20 @@ class DashboardRepository:
 
     @staticmethod
     async def get_revenue_trends(days: int = 30):
-        async with SessionLocal() as db:
+        async with get_session(read_only=True) as db:
             start_date = datetime.now() - timedelta(days=days)
-            # Group invoices by date
+            # Issued invoices per day, already grouped by the rollup
             query = select(
-                TradeVoucher.voucher_date,
-                func.sum(TradeVoucher.grand_total)
+                DailySalesRollup.day,
+                DailySalesRollup.grand_total
             ).where(
                 and_(
-                    TradeVoucher.voucher_type == VoucherType.INVOICE,
-                    TradeVoucher.status == VoucherStatus.ISSUED,
-                    TradeVoucher.voucher_date >= start_date.date()
+                    DailySalesRollup.voucher_type == VoucherType.INVOICE,
+                    DailySalesRollup.status == VoucherStatus.ISSUED,
+                    DailySalesRollup.day >= start_date.date(),
+                    DailySalesRollup.voucher_count > 0
                 )
-            ).group_by(TradeVoucher.voucher_date).order_by(TradeVoucher.voucher_date)
+            ).order_by(DailySalesRollup.day)
             
             result = await db.execute(query)
             return [{"date": str(row[0]), "amount": row[1]} for row in result.all()]
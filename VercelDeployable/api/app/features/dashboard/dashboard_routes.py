@@ -1,25 +1,33 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from typing import Optional
+from app.core.snapshot_cache import Snapshot
 from app.features.dashboard.dashboard_service import DashboardService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard & Analytics"])
 
+def _snapshot_response(message: str, data, snapshot: Snapshot) -> APIResponse:
+    age = snapshot.age
+    as_of = snapshot.value.as_of
+    return APIResponse(
+        content={
+            "success": True,
+            "message": message,
+            "data": data,
+            "cache": {"as_of": as_of.isoformat(), "age_seconds": round(age, 1)}
+        },
+        headers={"Cache-Control": "no-cache", "Age": str(int(age))}
+    )
+
 @router.get("/overview")
 async def get_dashboard_overview(period: str = "month"):
     """
     Get high-level business stats.
-    Period options: 'today', 'week', 'month'.
+    Period options: 'today', 'week', 'month', 'month_to_date'.
+    Served from a per-period snapshot; `cache.age_seconds` says how old it is.
     """
-    data = await DashboardService.get_overview_stats(period)
-    return JSONResponse(
-        content={
-            "success": True,
-            "message": "Dashboard data retrieved",
-            "data": data
-        },
-        headers={"Cache-Control": "no-cache"}
-    )
+    snapshot = await DashboardService.get_snapshot(period)
+    return _snapshot_response("Dashboard data retrieved", snapshot.value.overview, snapshot)
 
 @router.get("/charts")
 async def get_dashboard_charts(period: str = "month"):
@@ -27,14 +35,5 @@ async def get_dashboard_charts(period: str = "month"):
     Get structured chart data for frontend visualization.
     Returns data mapped to Chart JS / Recharts compatible structures.
     """
-    charts = await DashboardService.get_analytics_charts(period)
-    # Convert Pydantic models to dict for JSONResponse
-    charts_dump = {k: v.model_dump() for k, v in charts.items()}
-    return JSONResponse(
-        content={
-            "success": True,
-            "message": "Analytics charts retrieved",
-            "data": charts_dump
-        },
-        headers={"Cache-Control": "no-cache"}
-    )
+    snapshot = await DashboardService.get_snapshot(period)
+    return _snapshot_response("Analytics charts retrieved", snapshot.value.charts, snapshot)
@@ -48,7 +48,7 @@ class Driver(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
-    phone: Mapped[str] = mapped_column(String(20), nullable=False)
+    phone: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     address: Mapped[Optional[str]] = mapped_column(String(255))
     license_number: Mapped[Optional[str]] = mapped_column(String(50))
     license_expiry: Mapped[Optional[date]] = mapped_column(Date)
@@ -58,6 +58,6 @@ class Driver(Base):
     notes: Mapped[Optional[str]] = mapped_column(String(500))
     
     # Telegram Integration for Drivers who may not have a User account
-    telegram_chat_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    telegram_chat_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
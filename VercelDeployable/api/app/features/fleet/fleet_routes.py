@@ -1,5 +1,6 @@
+from typing import Optional
 from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from app.features.fleet.fleet_schema import VehicleCreate, DriverCreate
 from app.features.fleet.fleet_service import FleetService
 
@@ -11,19 +12,20 @@ router = APIRouter(prefix="/fleet", tags=["Fleet (Vehicles & Drivers)"])
 async def add_vehicle(vehicle_in: VehicleCreate):
     """Add a new truck/vehicle."""
     veh = await FleetService.create_vehicle(vehicle_in)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
-        content={"success": True, "message": "Vehicle added", "data": veh.model_dump(mode='json')}
+        content={"success": True, "message": "Vehicle added", "data": veh}
     )
 
 @router.get("/vehicles")
-async def list_vehicles(skip: int = 0, limit: int = 100):
-    vehs = await FleetService.get_all_vehicles(skip, limit)
-    return JSONResponse(
+async def list_vehicles(skip: int = 0, limit: int = 100, fields: Optional[str] = None):
+    """List vehicles. `fields=id,vehicle_number,current_status` returns only those fields."""
+    vehs = await FleetService.get_all_vehicles(skip, limit, fields)
+    return APIResponse(
         content={
             "success": True,
             "message": f"Retrieved {len(vehs)} vehicles",
-            "data": [v.model_dump(mode='json') for v in vehs]
+            "data": vehs
         }
     )
 
@@ -33,18 +35,19 @@ async def list_vehicles(skip: int = 0, limit: int = 100):
 async def add_driver(driver_in: DriverCreate):
     """Add a new driver."""
     drv = await FleetService.create_driver(driver_in)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
-        content={"success": True, "message": "Driver added", "data": drv.model_dump(mode='json')}
+        content={"success": True, "message": "Driver added", "data": drv}
     )
 
 @router.get("/drivers")
-async def list_drivers(skip: int = 0, limit: int = 100):
-    drvs = await FleetService.get_all_drivers(skip, limit)
-    return JSONResponse(
+async def list_drivers(skip: int = 0, limit: int = 100, fields: Optional[str] = None):
+    """List drivers. `fields=id,name,phone` returns only those fields."""
+    drvs = await FleetService.get_all_drivers(skip, limit, fields)
+    return APIResponse(
         content={
             "success": True,
             "message": f"Retrieved {len(drvs)} drivers",
-            "data": [d.model_dump(mode='json') for d in drvs]
+            "data": drvs
         }
     )
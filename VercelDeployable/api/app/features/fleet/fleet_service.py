@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status
-from typing import List
+from typing import List, Optional
 from app.features.fleet.fleet_repository import FleetRepository
 from app.features.fleet.fleet_schema import (
     VehicleCreate, VehicleResponse, VehicleUpdate,
@@ -18,9 +18,8 @@ class FleetService:
         return VehicleResponse.model_validate(veh)
 
     @staticmethod
-    async def get_all_vehicles(skip: int, limit: int) -> List[VehicleResponse]:
-        vehs = await FleetRepository.get_all_vehicles(skip, limit)
-        return [VehicleResponse.model_validate(v) for v in vehs]
+    async def get_all_vehicles(skip: int, limit: int, fields: Optional[str] = None) -> List[dict]:
+        return await FleetRepository.get_all_vehicles(skip, limit, fields)
 
     # --- Driver ---
     @staticmethod
@@ -30,6 +29,5 @@ class FleetService:
         return DriverResponse.model_validate(drv)
 
     @staticmethod
-    async def get_all_drivers(skip: int, limit: int) -> List[DriverResponse]:
-        drvs = await FleetRepository.get_all_drivers(skip, limit)
-        return [DriverResponse.model_validate(d) for d in drvs]
+    async def get_all_drivers(skip: int, limit: int, fields: Optional[str] = None) -> List[dict]:
+        return await FleetRepository.get_all_drivers(skip, limit, fields)
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Boolean, DateTime, func, Enum, Float, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, func, Enum, Float, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
@@ -40,6 +40,10 @@ class Item(Base):
 
 class CustomerItemRate(Base):
     __tablename__ = "customer_item_rates"
+    __table_args__ = (
+        # One override per customer, item and location (also serves get_best_price)
+        Index("uq_customer_item_rates_item_party_location", "item_id", "party_id", "location", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     item_id: Mapped[int] = mapped_column(ForeignKey("items.id"), nullable=False)
@@ -1,15 +1,20 @@
-from typing import Optional, Sequence, List
+from typing import Dict, Iterable, Optional, List
 from sqlalchemy import select, delete, update
-from app.core.database import SessionLocal
+from app.core.database import get_session
+from app.core.projection import Fieldset, Summary, schema_columns
 from app.features.inventory.inventory_entity import Item, CustomerItemRate, ItemType
-from app.features.inventory.inventory_schema import ItemCreate, ItemUpdate, PriceOverrideCreate
+from app.features.inventory.inventory_schema import ItemCreate, ItemUpdate, ItemResponse, PriceOverrideCreate
 from app.core.logger import logger
 
+ITEM_FIELDS = Fieldset(schema_columns(Item, ItemResponse))
+# What `?expand=` embeds in records that reference an item
+ITEM_SUMMARY = Summary(Item.id, Item.code, Item.name, Item.unit, Item.hsn_code)
+
 class InventoryRepository:
     # --- Item Operations ---
     @staticmethod
     async def create_item(item_in: ItemCreate) -> Item:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 db_item = Item(**item_in.model_dump())
                 db.add(db_item)
@@ -24,31 +29,57 @@ class InventoryRepository:
 
     @staticmethod
     async def get_item_by_code(code: str) -> Optional[Item]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Item).where(Item.code == code))
             return result.scalar_one_or_none()
 
     @staticmethod
     async def get_item_by_id(item_id: int) -> Optional[Item]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             result = await db.execute(select(Item).where(Item.id == item_id))
             return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_all_items(skip: int = 0, limit: int = 100, item_type: Optional[ItemType] = None, search: Optional[str] = None) -> Sequence[Item]:
-        async with SessionLocal() as db:
-            query = select(Item)
+    async def get_items_by_ids(item_ids: Iterable[int]) -> Dict[int, Item]:
+        """Fetch several items in one query, keyed by id."""
+        ids = set(item_ids)
+        if not ids:
+            return {}
+        async with get_session() as db:
+            result = await db.execute(select(Item).where(Item.id.in_(ids)))
+            return {item.id: item for item in result.scalars().all()}
+
+    @staticmethod
+    async def get_all_items(
+        skip: int = 0,
+        limit: int = 100,
+        item_type: Optional[ItemType] = None,
+        search: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[dict]:
+        """Items by name, as dicts with the requested ITEM_FIELDS (all by default)."""
+        selection = ITEM_FIELDS.select(fields)
+        async with get_session(read_only=True) as db:
+            query = select(*selection.columns)
             if item_type:
                 query = query.where(Item.item_type == item_type)
             if search:
                 query = query.where(Item.name.ilike(f"%{search}%"))
             
             result = await db.execute(query.offset(skip).limit(limit).order_by(Item.name))
-            return result.scalars().all()
+            return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def get_item_fields(item_id: int, fields: Optional[str] = None) -> Optional[dict]:
+        """One item as a dict with the requested ITEM_FIELDS."""
+        selection = ITEM_FIELDS.select(fields)
+        async with get_session(read_only=True) as db:
+            row = (await db.execute(select(*selection.columns).where(Item.id == item_id))).mappings().one_or_none()
+            return dict(row) if row is not None else None
     
     @staticmethod
     async def update_item(item_id: int, item_in: ItemUpdate) -> Optional[Item]:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 result = await db.execute(select(Item).where(Item.id == item_id))
                 db_item = result.scalar_one_or_none()
@@ -71,7 +102,7 @@ class InventoryRepository:
     
     @staticmethod
     async def set_customer_price(price_in: PriceOverrideCreate) -> CustomerItemRate:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 # Check for existing record to define Upsert behavior
                 # (PostgreSQL has on_conflict_do_update, but for generic SQLAlch async we can do check-then-act)
@@ -105,7 +136,7 @@ class InventoryRepository:
         Fetch customer specific price. Use 'default' location if specific location not found?
         Or exact match only. Let's try exact match first.
         """
-        async with SessionLocal() as db:
+        async with get_session() as db:
             stmt = select(CustomerItemRate).where(
                 CustomerItemRate.item_id == item_id,
                 CustomerItemRate.party_id == party_id,
@@ -122,7 +153,7 @@ class InventoryRepository:
         """
         Update item stock level. Positive quantity increases stock, negative decreases.
         """
-        async with SessionLocal() as db:
+        async with get_session() as db:
             try:
                 # Use update statement for atomic increment/decrement
                 stmt = (
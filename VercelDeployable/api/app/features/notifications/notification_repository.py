@@ -1,13 +1,14 @@
 from sqlalchemy import select, update
-from app.core.database import SessionLocal
+from app.core.database import get_session
+from app.core.pagination import Page, fetch_page
 from app.features.notifications.notification_entity import Notification
 from app.features.notifications.notification_schema import NotificationCreate
-from typing import List, Optional
+from typing import Optional
 
 class NotificationRepository:
     @staticmethod
     async def create(noti_in: NotificationCreate) -> Notification:
-        async with SessionLocal() as db:
+        async with get_session() as db:
             db_obj = Notification(
                 user_id=noti_in.user_id,
                 title=noti_in.title,
@@ -21,21 +22,19 @@ class NotificationRepository:
             return db_obj
 
     @staticmethod
-    async def get_for_user(user_id: int, skip: int = 0, limit: int = 50, unread_only: bool = False) -> List[Notification]:
-        async with SessionLocal() as db:
+    async def get_for_user(user_id: int, cursor: Optional[str] = None, limit: int = 50, unread_only: bool = False, with_total: bool = False) -> Page[Notification]:
+        async with get_session(read_only=True) as db:
             query = select(Notification).where(
                 (Notification.user_id == user_id) | (Notification.user_id == None)
             )
             if unread_only:
                 query = query.where(Notification.is_read == False)
             
-            query = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit)
-            result = await db.execute(query)
-            return result.scalars().all()
+            return await fetch_page(db, query, (Notification.created_at, Notification.id), cursor, limit, with_total=with_total)
 
     @staticmethod
     async def mark_as_read(noti_id: int):
-        async with SessionLocal() as db:
+        async with get_session() as db:
             await db.execute(
                 update(Notification)
                 .where(Notification.id == noti_id)
@@ -251,13 +251,13 @@ async def telegram_webhook(request: Request):
                     await TelegramBot.send_message("🔍 <b>Search Party</b>\nUsage: <code>/search &lt;name/code&gt;</code>", chat_id=str(chat_id), parse_mode="HTML")
                 else:
                     from app.features.parties.party_repository import PartyRepository
-                    parties = await PartyRepository.get_all(search=search_term, limit=10)
+                    parties = (await PartyRepository.get_all(search=search_term, limit=10, fields="name,code")).items
                     if not parties:
                         await TelegramBot.send_message(f"❌ No parties found matching '<code>{search_term}</code>'", chat_id=str(chat_id), parse_mode="HTML")
                     else:
                         resp = f"🔍 <b>Results for '{search_term}':</b>\n\n"
                         for p in parties:
-                            resp += f"• {p.name} (<code>{p.code}</code>)\n"
+                            resp += f"• {p['name']} (<code>{p['code']}</code>)\n"
                         resp += "\n<i>Use /ledger &lt;code&gt; to see balance.</i>"
                         await TelegramBot.send_message(resp, chat_id=str(chat_id), parse_mode="HTML")
 
@@ -270,13 +270,13 @@ async def telegram_webhook(request: Request):
                     from app.features.transactions.transaction_repository import TransactionRepository
                     
                     # 1. Find Party
-                    parties = await PartyRepository.get_all(search=search_term, limit=5)
+                    parties = (await PartyRepository.get_all(search=search_term, limit=5, fields="id,name,code,current_balance")).items
                     if not parties:
                         await TelegramBot.send_message(f"❌ Party '<code>{search_term}</code>' not found.", chat_id=str(chat_id), parse_mode="HTML")
-                    elif len(parties) > 1 and not any(p.code.lower() == search_term.lower() for p in parties):
+                    elif len(parties) > 1 and not any(p["code"].lower() == search_term.lower() for p in parties):
                         resp = f"❓ <b>Multiple matches found:</b>\n\n"
                         for p in parties:
-                            resp += f"• {p.name} (<code>{p.code}</code>)\n"
+                            resp += f"• {p['name']} (<code>{p['code']}</code>)\n"
                         resp += "\n<i>Please use the exact code.</i>"
                         await TelegramBot.send_message(resp, chat_id=str(chat_id), parse_mode="HTML")
                     else:
@@ -284,19 +284,19 @@ async def telegram_webhook(request: Request):
                         party = parties[0]
                         if len(parties) > 1:
                             for p in parties:
-                                if p.code.lower() == search_term.lower():
+                                if p["code"].lower() == search_term.lower():
                                     party = p
                                     break
                         
                         # 2. Get Transactions
-                        txns = await TransactionRepository.get_by_party(party.id, limit=5)
+                        txns = (await TransactionRepository.get_by_party(party["id"], limit=5)).items
                         
                         # 3. Build Response
-                        bal_color = "🟢" if party.current_balance >= 0 else "🔴"
-                        resp = f"📒 <b>LEDGER: {party.name}</b>\n"
-                        resp += f"Code: <code>{party.code}</code>\n"
+                        bal_color = "🟢" if party["current_balance"] >= 0 else "🔴"
+                        resp = f"📒 <b>LEDGER: {party['name']}</b>\n"
+                        resp += f"Code: <code>{party['code']}</code>\n"
                         resp += f"━━━━━━━━━━━━━━━\n"
-                        resp += f"{bal_color} <b>Current Balance: ₹{party.current_balance:,.2f}</b>\n"
+                        resp += f"{bal_color} <b>Current Balance: ₹{party['current_balance']:,.2f}</b>\n"
                         resp += f"━━━━━━━━━━━━━━━\n\n"
                         
                         if not txns:
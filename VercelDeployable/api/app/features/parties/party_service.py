@@ -4,6 +4,7 @@ from app.features.parties.party_entity import PartyType, Party
 from app.features.parties.party_repository import PartyRepository
 from app.features.parties.party_schema import PartyCreate, PartyUpdate, PartyResponse
 from app.core.id_generator import IDGenerator
+from app.core.pagination import Page
 
 class PartyService:
     @staticmethod
@@ -28,9 +29,15 @@ class PartyService:
         return PartyResponse.model_validate(new_party)
 
     @staticmethod
-    async def get_all_parties(skip: int = 0, limit: int = 100, type: Optional[PartyType] = None, search: Optional[str] = None):
-        parties = await PartyRepository.get_all(skip=skip, limit=limit, party_type=type, search=search)
-        return [PartyResponse.model_validate(p) for p in parties]
+    async def get_all_parties(
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        type: Optional[PartyType] = None,
+        search: Optional[str] = None,
+        with_total: bool = False,
+        fields: Optional[str] = None,
+    ) -> Page[dict]:
+        return await PartyRepository.get_all(cursor=cursor, limit=limit, party_type=type, search=search, with_total=with_total, fields=fields)
 
     @staticmethod
     async def get_party(party_id: int) -> PartyResponse:
@@ -39,6 +46,13 @@ class PartyService:
             raise HTTPException(status_code=404, detail="Party not found")
         return PartyResponse.model_validate(party)
 
+    @staticmethod
+    async def get_party_fields(party_id: int, fields: str) -> dict:
+        party = await PartyRepository.get_fields(party_id, fields)
+        if not party:
+            raise HTTPException(status_code=404, detail="Party not found")
+        return party
+
     @staticmethod
     async def update_party(party_id: int, party_in: PartyUpdate) -> PartyResponse:
         # If code is being updated, check uniqueness?
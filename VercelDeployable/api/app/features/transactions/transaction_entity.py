@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, func, Enum, Float, ForeignKey, Integer
+from sqlalchemy import String, DateTime, func, Enum, Float, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
@@ -27,6 +27,9 @@ class TransactionStatus(str, enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_party_date", "party_id", "transaction_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     party_id: Mapped[Optional[int]] = mapped_column(ForeignKey("parties.id"), index=True)
@@ -40,7 +43,7 @@ class Transaction(Base):
     description: Mapped[Optional[str]] = mapped_column(String(500))
     description_internal: Mapped[Optional[str]] = mapped_column(String(500))
     
-    transaction_date: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    transaction_date: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
     status: Mapped[TransactionStatus] = mapped_column(Enum(TransactionStatus), default=TransactionStatus.COMPLETED)
     
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
@@ -1,7 +1,11 @@
+from datetime import date
+from typing import Optional
 from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from app.features.transactions.transaction_schema import TransactionCreate, TransactionResponse
 from app.features.transactions.transaction_service import TransactionService
+from app.features.transactions.transaction_repository import TransactionRepository
+from app.core.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/transactions", tags=["Transactions (Ledger)"])
 
@@ -17,34 +21,47 @@ async def create_transaction(txn_in: TransactionCreate, request: Request):
         user_id = request.state.user.get("id")
         
     txn = await TransactionService.create_transaction(txn_in, user_id=user_id)
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "success": True,
             "message": "Transaction recorded successfully",
-            "data": txn.model_dump(mode='json')
+            "data": txn
         }
     )
 
 @router.get("/")
-async def get_all_transactions(skip: int = 0, limit: int = 100):
-    txns = await TransactionService.get_all_transactions(skip, limit)
-    return JSONResponse(
+async def get_all_transactions(cursor: Optional[str] = None, limit: int = 100, with_total: bool = False):
+    """Ledger, newest first. Pass `pagination.next_cursor` back as `cursor` for the next page."""
+    page = await TransactionService.get_all_transactions(cursor, limit, with_total)
+    return APIResponse(
         content={
             "success": True,
-            "message": f"Retrieved {len(txns)} transactions",
-            "data": [t.model_dump(mode='json') for t in txns],
-            "pagination": {"skip": skip, "limit": limit, "count": len(txns)}
+            "message": f"Retrieved {len(page.items)} transactions",
+            "data": page.items,
+            "pagination": page.envelope(limit)
         }
     )
 
+@router.get("/export")
+async def export_transactions(
+    format: ExportFormat = ExportFormat.CSV,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    party_id: Optional[int] = None
+):
+    """Stream the ledger as CSV or NDJSON, filtered by transaction date (inclusive) and party."""
+    query = TransactionRepository.export_query(start_date, end_date, party_id)
+    return export_response(query, format, "transactions")
+
 @router.get("/party/{party_id}")
-async def get_party_transactions(party_id: int, skip: int = 0, limit: int = 100):
-    txns = await TransactionService.get_transactions_by_party(party_id, skip, limit)
-    return JSONResponse(
+async def get_party_transactions(party_id: int, cursor: Optional[str] = None, limit: int = 100, with_total: bool = False):
+    page = await TransactionService.get_transactions_by_party(party_id, cursor, limit, with_total)
+    return APIResponse(
         content={
             "success": True,
-            "message": f"Retrieved {len(txns)} records for party {party_id}",
-            "data": [t.model_dump(mode='json') for t in txns]
+            "message": f"Retrieved {len(page.items)} records for party {party_id}",
+            "data": page.items,
+            "pagination": page.envelope(limit)
         }
     )
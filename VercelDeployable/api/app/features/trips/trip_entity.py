@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Boolean, DateTime, func, Enum, Float, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, func, Enum, Float, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -17,11 +17,21 @@ class TripType(str, enum.Enum):
 
 class Trip(Base):
     __tablename__ = "trips"
+    __table_args__ = (
+        Index("ix_trips_driver_status", "driver_id", "status"),
+        Index("ix_trips_vehicle_start_date", "vehicle_id", "start_date"),
+        # Active-trip lookup for driver tracking; only in-transit rows are indexed
+        Index(
+            "ix_trips_in_transit_driver", "driver_id", "updated_at",
+            postgresql_where=text("status = 'IN_TRANSIT'"),
+            sqlite_where=text("status = 'IN_TRANSIT'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     trip_number: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
     
-    start_date: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    start_date: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
     end_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
     source_location: Mapped[str] = mapped_column(String(100))
@@ -65,7 +75,7 @@ class TripExpense(Base):
     __tablename__ = "trip_expenses"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    trip_id: Mapped[int] = mapped_column(ForeignKey("trips.id"), nullable=False)
+    trip_id: Mapped[int] = mapped_column(ForeignKey("trips.id"), nullable=False, index=True)
     
     expense_type: Mapped[str] = mapped_column(String(50)) # "Diesel", "Toll", "Driver Allowance"
     amount: Mapped[float] = mapped_column(Float, nullable=False)
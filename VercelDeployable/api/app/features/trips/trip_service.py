@@ -1,11 +1,14 @@
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Optional
 from app.features.trips.trip_repository import TripRepository
 from app.features.trips.trip_schema import (
     TripCreate, TripResponse, TripUpdate, TripExpenseCreate, TripExpenseResponse
 )
 from app.features.trips.trip_entity import Trip, TripStatus
 from app.core.id_generator import IDGenerator
+from app.core.database import unit_of_work
+from app.features.dashboard.dashboard_service import DashboardService
+from app.core.pagination import Page
 from app.features.fleet.fleet_repository import FleetRepository
 from app.features.fleet.fleet_entity import VehicleStatus
 from app.core.telegram_utils import TelegramBot
@@ -15,24 +18,26 @@ from app.features.users.user_repository import UserRepository
 class TripService:
     @staticmethod
     async def create_trip(trip_in: TripCreate) -> TripResponse:
-        # Handle Auto-generation of Trip Number
-        if not trip_in.trip_number:
-            trip_in.trip_number = await IDGenerator.generate_transaction_id("T", Trip)
-            
-        # Check vehicle availability?
-        # Ideally yes. A vehicle cannot be on two trips.
-        vehicle = await FleetRepository.get_vehicle_by_number(str(trip_in.vehicle_id)) # This searches by number, but input is ID. Need get_by_id in FleetRepo?
-        # Validation: Check if driver is already IN_TRANSIT
-        # Only relevant if we are creating a trip that starts immediately
-        if trip_in.status == TripStatus.IN_TRANSIT:
-            active_trip = await TripRepository.get_active_trip_by_driver(trip_in.driver_id)
-            if active_trip:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST, 
-                    detail=f"Driver is already on an active trip ({active_trip.trip_number}). Please complete it first."
-                )
+        async with unit_of_work():
+            # Handle Auto-generation of Trip Number
+            if not trip_in.trip_number:
+                trip_in.trip_number = await IDGenerator.generate_transaction_id("T", Trip, "trip_number")
+                
+            # Check vehicle availability?
+            # Ideally yes. A vehicle cannot be on two trips.
+            vehicle = await FleetRepository.get_vehicle_by_number(str(trip_in.vehicle_id)) # This searches by number, but input is ID. Need get_by_id in FleetRepo?
+            # Validation: Check if driver is already IN_TRANSIT
+            # Only relevant if we are creating a trip that starts immediately
+            if trip_in.status == TripStatus.IN_TRANSIT:
+                active_trip = await TripRepository.get_active_trip_by_driver(trip_in.driver_id)
+                if active_trip:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST, 
+                        detail=f"Driver is already on an active trip ({active_trip.trip_number}). Please complete it first."
+                    )
 
-        trip = await TripRepository.create(trip_in)
+            trip = await TripRepository.create(trip_in)
+        DashboardService.invalidate_cache()
         
         # Trigger notification if created directly in IN_TRANSIT status
         if trip.status == TripStatus.IN_TRANSIT:
@@ -49,9 +54,17 @@ class TripService:
         return resp
 
     @staticmethod
-    async def get_all_trips(skip: int, limit: int, vehicle_id: Optional[int]) -> List[TripResponse]:
-        trips = await TripRepository.get_all(skip, limit, vehicle_id)
-        return [await TripService._enrich_response(t) for t in trips]
+    async def get_all_trips(
+        cursor: Optional[str],
+        limit: int,
+        vehicle_id: Optional[int],
+        with_total: bool = False,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Page[dict]:
+        # Rows straight from the projection; totals and profit are computed in SQL
+        return await TripRepository.get_all(cursor, limit, vehicle_id, with_total, fields, include, expand)
 
     @staticmethod
     async def get_trip(trip_id: int) -> TripResponse:
@@ -59,38 +72,53 @@ class TripService:
         if not trip:
              raise HTTPException(status_code=404, detail="Trip not found")
         return await TripService._enrich_response(trip)
+
+    @staticmethod
+    async def get_trip_expanded(trip_id: int, expand: str) -> dict:
+        """The full trip, as get_trip returns it, with the `expand` summaries embedded."""
+        trip = await TripService.get_trip(trip_id)
+        return await TripRepository.expand(trip.model_dump(), expand)
+
+    @staticmethod
+    async def get_trip_fields(trip_id: int, fields: Optional[str], include: Optional[str], expand: Optional[str] = None) -> dict:
+        trip = await TripRepository.get_fields(trip_id, fields, include, expand)
+        if not trip:
+             raise HTTPException(status_code=404, detail="Trip not found")
+        return trip
     
     @staticmethod
     async def update_trip(trip_id: int, trip_in: TripUpdate) -> TripResponse:
-        existing_trip = await TripRepository.get_by_id(trip_id)
-        if not existing_trip:
-            raise HTTPException(status_code=404, detail="Trip not found")
+        async with unit_of_work():
+            existing_trip = await TripRepository.get_by_id(trip_id)
+            if not existing_trip:
+                raise HTTPException(status_code=404, detail="Trip not found")
 
-        should_notify = False
+            should_notify = False
         
-        # Check if status is changing to IN_TRANSIT
-        # OR if we are assigning a new driver to an already IN_TRANSIT trip (edge case)
-        target_status = trip_in.status or existing_trip.status
+            # Check if status is changing to IN_TRANSIT
+            # OR if we are assigning a new driver to an already IN_TRANSIT trip (edge case)
+            target_status = trip_in.status or existing_trip.status
         
-        if target_status == TripStatus.IN_TRANSIT:
-            # Determine effective driver ID (newly assigned or existing)
-            target_driver_id = trip_in.driver_id or existing_trip.driver_id
+            if target_status == TripStatus.IN_TRANSIT:
+                # Determine effective driver ID (newly assigned or existing)
+                target_driver_id = trip_in.driver_id or existing_trip.driver_id
             
-            # Validation: Is this driver busy on ANOTHER active trip?
-            active_trip = await TripRepository.get_active_trip_by_driver(target_driver_id)
-            if active_trip and active_trip.id != trip_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Driver is already on an active trip ({active_trip.trip_number}). Cannot start another."
-                )
+                # Validation: Is this driver busy on ANOTHER active trip?
+                active_trip = await TripRepository.get_active_trip_by_driver(target_driver_id)
+                if active_trip and active_trip.id != trip_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Driver is already on an active trip ({active_trip.trip_number}). Cannot start another."
+                    )
             
-            # Check if this is a NEW start (transition from PLANNED -> IN_TRANSIT)
-            if trip_in.status == TripStatus.IN_TRANSIT and existing_trip.status != TripStatus.IN_TRANSIT:
-                should_notify = True
+                # Check if this is a NEW start (transition from PLANNED -> IN_TRANSIT)
+                if trip_in.status == TripStatus.IN_TRANSIT and existing_trip.status != TripStatus.IN_TRANSIT:
+                    should_notify = True
 
-        trip = await TripRepository.update(trip_id, trip_in)
-        if not trip:
-            raise HTTPException(status_code=404, detail="Trip not found")
+            trip = await TripRepository.update(trip_id, trip_in)
+            if not trip:
+                raise HTTPException(status_code=404, detail="Trip not found")
+        DashboardService.invalidate_cache()
         
         if should_notify:
             await TripService._notify_driver_trip_start(trip)
@@ -149,10 +177,12 @@ class TripService:
 
     @staticmethod
     async def add_expense(trip_id: int, expense_in: TripExpenseCreate) -> TripExpenseResponse:
-        # Check trip existence
-        trip = await TripRepository.get_by_id(trip_id)
-        if not trip:
-            raise HTTPException(status_code=404, detail="Trip not found")
-            
-        exp = await TripRepository.add_expense(trip_id, expense_in)
+        async with unit_of_work():
+            # Check trip existence
+            trip = await TripRepository.get_by_id(trip_id)
+            if not trip:
+                raise HTTPException(status_code=404, detail="Trip not found")
+                
+            exp = await TripRepository.add_expense(trip_id, expense_in)
+        DashboardService.invalidate_cache()
         return TripExpenseResponse.model_validate(exp)
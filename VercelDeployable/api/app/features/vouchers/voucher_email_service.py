@@ -50,9 +50,10 @@ class VoucherEmailService:
 
         # 2. Build Item Rows
         item_rows = ""
+        # Get real item names in one query
+        inv_items = await InventoryRepository.get_items_by_ids(item.item_id for item in voucher.items)
         for item in voucher.items:
-            # Get real item name
-            inv_item = await InventoryRepository.get_item_by_id(item.item_id)
+            inv_item = inv_items.get(item.item_id)
             item_name = inv_item.name if inv_item else f"Item #{item.item_id}"
             
             tax_rate = item.tax_rate or 0
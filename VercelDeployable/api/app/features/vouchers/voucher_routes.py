@@ -1,14 +1,17 @@
 from fastapi import APIRouter, status, Query, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from app.core.responses import APIResponse
 from typing import Optional
+from datetime import date
 from app.features.vouchers.voucher_schema import VoucherCreate, VoucherUpdate, VoucherType
 from app.features.vouchers.voucher_service import VoucherService
+from app.features.vouchers.voucher_repository import VoucherRepository
 from app.features.vouchers.voucher_entity import VoucherStatus
 from app.features.users.user_entity import User, UserRole
 from app.features.auth.auth_dependencies import get_current_active_user
 from app.features.notifications.notification_service import NotificationService
 from app.features.notifications.notification_schema import NotificationCreate
 from app.core.telegram_utils import send_telegram_notification_background
+from app.core.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/vouchers", tags=["Trade Vouchers (Challans & Invoices)"])
 
@@ -49,8 +52,9 @@ async def create_voucher(
         items_table += "<code>"
         items_table += f"{'Item':<15} {'Qty':>4} {'Amount':>10}\n"
         items_table += "─" * 31 + "\n"
+        inv_items = await InventoryRepository.get_items_by_ids(item.item_id for item in voucher.items)
         for item in voucher.items:
-            inv_item = await InventoryRepository.get_item_by_id(item.item_id)
+            inv_item = inv_items.get(item.item_id)
             item_name = inv_item.name[:15] if inv_item else f"Item #{item.item_id}"[:15]
             items_table += f"{item_name:<15} {int(item.quantity):>4} {item.amount:>10.2f}\n"
         items_table += "</code>"
@@ -98,12 +102,12 @@ async def create_voucher(
         parse_mode="HTML"
     )
 
-    return JSONResponse(
+    return APIResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "success": True, 
             "message": f"Voucher {voucher.voucher_number} created successfully", 
-            "data": voucher.model_dump(mode='json')
+            "data": voucher
         }
     )
 
@@ -127,38 +131,73 @@ async def update_voucher(
         voucher_update.approved_by_id = current_user.id
 
     voucher = await VoucherService.update_voucher(voucher_id, voucher_update)
-    return JSONResponse(
+    return APIResponse(
         content={
             "success": True, 
             "message": "Voucher updated", 
-            "data": voucher.model_dump(mode='json')
+            "data": voucher
         }
     )
 
 @router.get("/")
 async def get_vouchers(
-    skip: int = 0, 
+    cursor: Optional[str] = None, 
     limit: int = 100, 
-    type: Optional[VoucherType] = None
+    type: Optional[VoucherType] = None,
+    with_total: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    expand: Optional[str] = None
 ):
-    """List all vouchers."""
-    vouchers = await VoucherService.get_all_vouchers(skip, limit, type)
-    return JSONResponse(
+    """
+    List all vouchers, newest first.
+    Pass `pagination.next_cursor` back as `cursor` for the next page;
+    `with_total` adds a planner-estimated `estimated_total`.
+    `fields=id,voucher_number,grand_total` returns only those fields; `include=items` nests the line items.
+    `expand=party,items.item` embeds party and item summaries (expanding `items.item` includes the items).
+    """
+    page = await VoucherService.get_all_vouchers(cursor, limit, type, with_total, fields, include, expand)
+    return APIResponse(
         content={
             "success": True,
-            "message": f"Retrieved {len(vouchers)} vouchers",
-            "data": [v.model_dump(mode='json') for v in vouchers],
-            "pagination": {"skip": skip, "limit": limit, "count": len(vouchers)}
+            "message": f"Retrieved {len(page.items)} vouchers",
+            "data": page.items,
+            "pagination": page.envelope(limit)
         }
     )
 
+@router.get("/export")
+async def export_vouchers(
+    format: ExportFormat = ExportFormat.CSV,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    party_id: Optional[int] = None,
+    type: Optional[VoucherType] = None,
+    voucher_status: Optional[VoucherStatus] = Query(None, alias="status")
+):
+    """
+    Stream vouchers as CSV or NDJSON, one row per line item.
+    Filters by voucher date (inclusive), party, type and status.
+    """
+    query = VoucherRepository.export_query(start_date, end_date, party_id, type, voucher_status)
+    return export_response(query, format, "vouchers")
+
 @router.get("/{voucher_id}")
-async def get_voucher_detail(voucher_id: int):
-    voucher = await VoucherService.get_voucher(voucher_id)
-    return JSONResponse(
+async def get_voucher_detail(voucher_id: int, fields: Optional[str] = None, include: Optional[str] = None, expand: Optional[str] = None):
+    """
+    The full voucher with its line items; `expand` alone embeds its summaries on top.
+    With `fields` / `include`, only the requested fields and collections (plus any `expand`).
+    """
+    if fields or include:
+        voucher = await VoucherService.get_voucher_fields(voucher_id, fields, include, expand)
+    elif expand:
+        voucher = await VoucherService.get_voucher_expanded(voucher_id, expand)
+    else:
+        voucher = await VoucherService.get_voucher(voucher_id)
+    return APIResponse(
         content={
             "success": True, 
             "message": "Voucher retrieved", 
-            "data": voucher.model_dump(mode='json')
+            "data": voucher
         }
     )
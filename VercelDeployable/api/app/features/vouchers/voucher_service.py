@@ -2,12 +2,15 @@ from fastapi import HTTPException, status
 from typing import List, Optional
 from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
-from app.core.database import SessionLocal
+from app.core.database import get_session, unit_of_work
 from app.features.vouchers.voucher_repository import VoucherRepository
 from app.features.vouchers.voucher_schema import VoucherCreate, VoucherResponse, VoucherUpdate
 from app.features.vouchers.voucher_entity import VoucherType, TradeVoucher, VoucherStatus
 from app.features.inventory.inventory_repository import InventoryRepository 
 from app.core.id_generator import IDGenerator
+from app.core.pagination import Page
+from app.features.dashboard.dashboard_rollup_repository import DailyRollupRepository
+from app.features.dashboard.dashboard_service import DashboardService
 from app.core.logger import logger
 
 from app.features.transactions.transaction_service import TransactionService
@@ -31,7 +34,7 @@ class VoucherService:
             else:
                 prefix = "CHL" # For Challan
             
-            voucher_in.voucher_number = await IDGenerator.generate_transaction_id(prefix, TradeVoucher)
+            voucher_in.voucher_number = await IDGenerator.generate_transaction_id(prefix, TradeVoucher, "voucher_number")
         
         # --- RECALCULATE TOTALS ---
         calculated_total = 0.0
@@ -48,57 +51,74 @@ class VoucherService:
         voucher_in.tax_amount = round(calculated_tax, 2)
         voucher_in.grand_total = round(calculated_total + calculated_tax, 2)
         
-        # 1. Save Voucher
-        voucher = await VoucherRepository.create(voucher_in)
+        async with unit_of_work():
+            # 1. Save Voucher
+            voucher = await VoucherRepository.create(voucher_in)
+            
+            # 2. Impact only if NOT draft
+            if voucher.status != VoucherStatus.DRAFT:
+                await VoucherService._apply_voucher_impact(voucher)
+        DashboardService.invalidate_cache()
         
-        # 2. Impact only if NOT draft
+        # 3. Email only once the voucher is committed
         if voucher.status != VoucherStatus.DRAFT:
-            await VoucherService._apply_voucher_impact(voucher)
+            await VoucherService._schedule_voucher_email(voucher)
         
         return VoucherResponse.model_validate(voucher)
 
     @staticmethod
     async def update_voucher(voucher_id: int, voucher_update: VoucherUpdate) -> VoucherResponse:
-        # 1. Fetch current voucher to check status transition
-        async with SessionLocal() as db:
-            result = await db.execute(
-                select(TradeVoucher)
-                .options(selectinload(TradeVoucher.items))
-                .where(TradeVoucher.id == voucher_id)
+        # Fetch, status change, ledger and stock updates share one transaction
+        async with unit_of_work():
+            # 1. Fetch current voucher to check status transition
+            async with get_session() as db:
+                result = await db.execute(
+                    select(TradeVoucher)
+                    .options(selectinload(TradeVoucher.items))
+                    .where(TradeVoucher.id == voucher_id)
+                )
+                old_voucher = result.scalar_one_or_none()
+                if not old_voucher:
+                    raise HTTPException(status_code=404, detail="Voucher not found")
+                # Same identity map as the update below, so remember the status before it changes
+                old_status = old_voucher.status
+            
+            updated_voucher = await VoucherRepository.update(
+                voucher_id, 
+                status=voucher_update.status, 
+                notes=voucher_update.notes,
+                approved_by_id=voucher_update.approved_by_id
             )
-            old_voucher = result.scalar_one_or_none()
-            if not old_voucher:
-                raise HTTPException(status_code=404, detail="Voucher not found")
-        
-        updated_voucher = await VoucherRepository.update(
-            voucher_id, 
-            status=voucher_update.status, 
-            notes=voucher_update.notes,
-            approved_by_id=voucher_update.approved_by_id
-        )
-        
-        # 3. Apply Impact
-        if old_voucher.status == VoucherStatus.DRAFT and updated_voucher.status != VoucherStatus.DRAFT:
-            # IMPORTANT: Re-calculate totals if they are 0
-            if updated_voucher.grand_total == 0:
-                calc_total = sum(round(i.quantity * i.rate, 2) for i in updated_voucher.items)
-                calc_tax = sum(round((round(i.quantity * i.rate, 2) * i.tax_rate / 100.0), 2) for i in updated_voucher.items)
-                updated_voucher.total_amount = round(calc_total, 2)
-                updated_voucher.tax_amount = round(calc_tax, 2)
-                updated_voucher.grand_total = round(calc_total + calc_tax, 2)
-                async with SessionLocal() as db:
-                    await db.execute(
-                        update(TradeVoucher)
-                        .where(TradeVoucher.id == voucher_id)
-                        .values(
-                            total_amount=updated_voucher.total_amount,
-                            tax_amount=updated_voucher.tax_amount,
-                            grand_total=updated_voucher.grand_total
+            
+            # 3. Apply Impact
+            is_leaving_draft = old_status == VoucherStatus.DRAFT and updated_voucher.status != VoucherStatus.DRAFT
+            if is_leaving_draft:
+                # IMPORTANT: Re-calculate totals if they are 0
+                if updated_voucher.grand_total == 0:
+                    before = DailyRollupRepository.voucher_snapshot(updated_voucher)
+                    calc_total = sum(round(i.quantity * i.rate, 2) for i in updated_voucher.items)
+                    calc_tax = sum(round((round(i.quantity * i.rate, 2) * i.tax_rate / 100.0), 2) for i in updated_voucher.items)
+                    updated_voucher.total_amount = round(calc_total, 2)
+                    updated_voucher.tax_amount = round(calc_tax, 2)
+                    updated_voucher.grand_total = round(calc_total + calc_tax, 2)
+                    async with get_session() as db:
+                        await db.execute(
+                            update(TradeVoucher)
+                            .where(TradeVoucher.id == voucher_id)
+                            .values(
+                                total_amount=updated_voucher.total_amount,
+                                tax_amount=updated_voucher.tax_amount,
+                                grand_total=updated_voucher.grand_total
+                            )
                         )
-                    )
-                    await db.commit()
+                        await DailyRollupRepository.apply_voucher(db, before, DailyRollupRepository.voucher_snapshot(updated_voucher))
+                        await db.commit()
 
-            await VoucherService._apply_voucher_impact(updated_voucher)
+                await VoucherService._apply_voucher_impact(updated_voucher)
+        DashboardService.invalidate_cache()
+        
+        if is_leaving_draft:
+            await VoucherService._schedule_voucher_email(updated_voucher)
             
         return VoucherResponse.model_validate(updated_voucher)
 
@@ -136,14 +156,20 @@ class VoucherService:
         
         logger.info(f"Applied impact for Voucher {voucher.voucher_number} (Status: {voucher.status})")
 
-        # 3. Email Notification (for Invoice, Challan, and Quotation)
+    @staticmethod
+    async def _schedule_voucher_email(voucher: TradeVoucher):
+        """Email Notification (for Invoice, Challan, and Quotation), sent in the background."""
         if voucher.voucher_type in [VoucherType.INVOICE, VoucherType.CHALLAN, VoucherType.QUOTATION]:
-            # Fetch party for email address
-            party = await PartyRepository.get_by_id(voucher.party_id)
-            if party and party.email:
-                # Send email in background to not block the response
-                asyncio.create_task(VoucherEmailService.send_voucher_email(voucher, party, voucher.approved_by_name))
-                logger.info(f"Background email task created for {party.email}")
+            # Send email in background to not block the response
+            asyncio.create_task(VoucherService._send_voucher_email(voucher))
+
+    @staticmethod
+    async def _send_voucher_email(voucher: TradeVoucher):
+        # Fetch party for email address
+        party = await PartyRepository.get_by_id(voucher.party_id)
+        if party and party.email:
+            logger.info(f"Sending voucher email to {party.email}")
+            await VoucherEmailService.send_voucher_email(voucher, party, voucher.approved_by_name)
 
     @staticmethod
     async def get_voucher(voucher_id: int) -> VoucherResponse:
@@ -153,6 +179,27 @@ class VoucherService:
         return VoucherResponse.model_validate(voucher)
 
     @staticmethod
-    async def get_all_vouchers(skip: int, limit: int, voucher_type: Optional[VoucherType]):
-        vouchers = await VoucherRepository.get_all(skip, limit, voucher_type)
-        return [VoucherResponse.model_validate(v) for v in vouchers]
+    async def get_voucher_expanded(voucher_id: int, expand: str) -> dict:
+        """The full voucher, as get_voucher returns it, with the `expand` summaries embedded."""
+        voucher = await VoucherService.get_voucher(voucher_id)
+        return await VoucherRepository.expand(voucher.model_dump(), expand)
+
+    @staticmethod
+    async def get_voucher_fields(voucher_id: int, fields: Optional[str], include: Optional[str], expand: Optional[str] = None) -> dict:
+        voucher = await VoucherRepository.get_fields(voucher_id, fields, include, expand)
+        if not voucher:
+            raise HTTPException(status_code=404, detail="Voucher not found")
+        return voucher
+
+    @staticmethod
+    async def get_all_vouchers(
+        cursor: Optional[str],
+        limit: int,
+        voucher_type: Optional[VoucherType],
+        with_total: bool = False,
+        fields: Optional[str] = None,
+        include: Optional[str] = None,
+        expand: Optional[str] = None,
+    ) -> Page[dict]:
+        # Rows straight from the projection; line items only when included
+        return await VoucherRepository.get_all(cursor, limit, voucher_type, with_total, fields, include, expand)